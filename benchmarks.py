@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Layout Microbenchmarks
+Times the six guides and a synthetic long checklist with each layout
+optimization switched on and off, and the direct canvas renderer against
+platypus
+
+    python benchmarks.py                   all benchmarks
+    python benchmarks.py --items 2000      smaller synthetic checklist
+"""
+
+import argparse
+import io
+import itertools
+import statistics
+import time
+
+import font_metrics
+import generate_lead_magnets
+from generate_lead_magnets import GUIDE_SPECS, build_guide
+
+SYNTHETIC_ITEMS = 10000
+SECTION_SIZE = 25
+
+
+def synthetic_checklist(items=SYNTHETIC_ITEMS):
+    """A checklist spec with `items` entries recombined from the real guides' wording"""
+    phrases = [item for spec in GUIDE_SPECS for _, section_items in spec['sections']
+               for item in section_items if isinstance(item, str)]
+    cycle = itertools.cycle(phrases)
+    entries = [f"{next(cycle)} ({number + 1})" for number in range(items)]
+    return {
+        'key': 'synthetic-checklist',
+        'filename': 'synthetic-checklist.pdf',
+        'title': "Synthetic Checklist",
+        'subtitle': f"{items:,} Items",
+        'intro': "Generated for layout benchmarks.",
+        'sections': [(f"Section {start // SECTION_SIZE + 1}", entries[start:start + SECTION_SIZE])
+                     for start in range(0, items, SECTION_SIZE)],
+        'page_break_after': None,
+        'cta_title': "Done",
+        'cta_text': "End of the synthetic checklist.",
+    }
+
+def time_builds(specs, repeat):
+    """Best and median wall time over `repeat` runs of building every spec"""
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for spec in specs:
+            build_guide(spec, io.BytesIO(), metrics_log=None)
+        runs.append(time.perf_counter() - started)
+    return min(runs), statistics.median(runs)
+
+def compare(name, specs, repeat, variants):
+    print(name)
+    baseline = None
+    for label, setup in variants:
+        setup()
+        time_builds(specs, 1)  # warm the caches that variant keeps
+        best, median = time_builds(specs, repeat)
+        baseline = baseline or best
+        print(f"  {label:<28} best {best * 1000:9.1f} ms   median {median * 1000:9.1f} ms   {baseline / best:5.2f}x")
+
+def font_metric_variants():
+    def without():
+        font_metrics.uninstall()
+
+    def cached():
+        font_metrics.clear()
+        font_metrics.install()
+
+    return [("reportlab stringWidth", without), ("cached width tables", cached)]
+
+def renderer_variants():
+    def use(renderer):
+        return lambda: setattr(generate_lead_magnets, 'DEFAULT_RENDERER', renderer)
+
+    return [("platypus", use('platypus')), ("direct canvas (fast_render)", use('fast'))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layout microbenchmarks")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measurement (default 5)")
+    parser.add_argument('--items', type=int, default=SYNTHETIC_ITEMS, help="synthetic checklist size")
+    args = parser.parse_args(argv)
+
+    try:
+        compare("Six guides", GUIDE_SPECS, args.repeat, font_metric_variants())
+        compare(f"Synthetic {args.items:,}-item checklist", [synthetic_checklist(args.items)],
+                max(1, args.repeat // 5), font_metric_variants())
+        # The insights guide has tables, so fast_render hands it to platypus
+        compare("Six guides, renderer", GUIDE_SPECS, args.repeat, renderer_variants())
+        compare(f"Synthetic {args.items:,}-item checklist, renderer", [synthetic_checklist(args.items)],
+                max(1, args.repeat // 5), renderer_variants())
+    finally:
+        font_metrics.install()
+        generate_lead_magnets.DEFAULT_RENDERER = 'platypus'
+
+if __name__ == "__main__":
+    main()
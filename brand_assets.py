@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Brand Image Assets
+Logo and cover images for the guide specs. Each image is resized to its
+printed size once, encoded as JPEG or as a lossless image (Flate in the
+PDF), whichever suits it, and cached on disk by content hash. ReportLab
+embeds an image file once per PDF however many pages draw it.
+"""
+
+from reportlab.lib.units import inch
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import zlib
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+from build_metrics import count_cache
+
+IMAGE_DPI = 150
+JPEG_QUALITY = 85
+# Lossless encoding is kept unless it is more than this much larger than JPEG
+FLATE_SIZE_ALLOWANCE = 1.25
+IMAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "mindworth-image-cache")
+
+_prepared = {}
+_lock = threading.Lock()
+
+
+class BrandImage:
+    """A prepared image file and the size it is printed at, in points"""
+
+    def __init__(self, path, width, height, filter):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.filter = filter
+
+    def __repr__(self):
+        return f"BrandImage({self.path!r}, {self.width:.1f}x{self.height:.1f}pt, {self.filter})"
+
+
+def _choose_encoding(image):
+    """Encoded bytes and their PDF filter for a resized image"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        # JPEG has no alpha channel
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', optimize=True)
+        return buffer.getvalue(), 'FlateDecode'
+
+    rgb = image.convert('L' if image.mode in ('1', 'L') else 'RGB')
+    jpeg = io.BytesIO()
+    rgb.save(jpeg, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    # ReportLab Flate-compresses the raw pixels, so estimate that directly
+    flate_size = len(zlib.compress(rgb.tobytes(), 6))
+    if flate_size <= jpeg.tell() * FLATE_SIZE_ALLOWANCE:
+        buffer = io.BytesIO()
+        rgb.save(buffer, 'PNG', optimize=True)
+        return buffer.getvalue(), 'FlateDecode'
+    return jpeg.getvalue(), 'DCTDecode'
+
+def _printed_size(image, width, height):
+    if width is None and height is None:
+        width = image.width * 72.0 / IMAGE_DPI
+    if height is None:
+        height = width * image.height / image.width
+    elif width is None:
+        width = height * image.width / image.height
+    return width, height
+
+def prepare_image(path, width=None, height=None, dpi=IMAGE_DPI, cache_dir=IMAGE_CACHE_DIR):
+    """Resize and encode an image for printing at width x height points
+
+    Give one dimension to keep the aspect ratio. Images are never scaled
+    up; identical source bytes at the same size share one cached file.
+    """
+    if PILImage is None:
+        raise RuntimeError("Brand images need Pillow: pip install Pillow")
+
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, width, height, dpi)
+    prepared = _prepared.get(key)
+    count_cache('brand_images', prepared is not None)
+    if prepared is not None:
+        return prepared
+
+    with open(path, 'rb') as f:
+        source = f.read()
+    with PILImage.open(io.BytesIO(source)) as image:
+        image.load()
+        width, height = _printed_size(image, width, height)
+        pixels = (max(1, round(width / 72.0 * dpi)), max(1, round(height / 72.0 * dpi)))
+        digest = hashlib.sha256(source + repr((pixels, JPEG_QUALITY)).encode('ascii')).hexdigest()
+
+        cached = [os.path.join(cache_dir, f"{digest}{ext}") for ext in ('.jpg', '.png')]
+        existing = [candidate for candidate in cached if os.path.exists(candidate)]
+        if existing:
+            path = existing[0]
+        else:
+            if image.width > pixels[0] or image.height > pixels[1]:
+                image = image.resize(pixels, PILImage.LANCZOS)
+            data, filter = _choose_encoding(image)
+            path = cached[0] if filter == 'DCTDecode' else cached[1]
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    prepared = BrandImage(path, width, height, 'DCTDecode' if path.endswith('.jpg') else 'FlateDecode')
+    with _lock:
+        _prepared[key] = prepared
+    return prepared
+
+def spec_image(spec, name, default_width=None):
+    """Prepared BrandImage for a spec's 'logo' or 'cover_image' entry, or None
+
+    The entry is a path, or a dict with 'path' and optional 'width'/'height'
+    in points.
+    """
+    entry = spec.get(name)
+    if not entry:
+        return None
+    if isinstance(entry, str):
+        entry = {'path': entry}
+    width = entry.get('width')
+    if width is None and entry.get('height') is None:
+        width = default_width
+    return prepare_image(entry['path'], width, entry.get('height'))
+
+def draw_logo(canv, logo, page_height, margin=0.75 * inch):
+    """Draw a logo in the top-left page margin; the same file is one XObject in the PDF"""
+    canv.drawImage(logo.path, inch, page_height - margin + (margin - logo.height) / 2,
+                   logo.width, logo.height, mask='auto')
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Build Metrics
+Per-document build records (pages, bytes, flowable counts, timings and
+cache hit rates) written to a JSONL log and exposed in Prometheus text
+format by the serve mode
+"""
+
+from reportlab.platypus import Paragraph
+import json
+import os
+import threading
+import time
+
+_lock = threading.Lock()
+
+# Hit/miss counters for the in-process caches, keyed by cache name
+CACHE_STATS = {}
+
+# Running totals per document for the Prometheus endpoint
+_TOTALS = {}
+_LATEST = {}
+
+# The counters of the build running on this thread; concurrent builds in
+# the server would count each other's lookups in a diff of CACHE_STATS
+_current_build = threading.local()
+
+
+def count_cache(name, hit):
+    """Record a hit or miss for a named cache, for the process and the build in progress"""
+    outcome = 'hits' if hit else 'misses'
+    with _lock:
+        CACHE_STATS.setdefault(name, {'hits': 0, 'misses': 0})[outcome] += 1
+    build = getattr(_current_build, 'caches', None)
+    if build is not None:
+        build.setdefault(name, {'hits': 0, 'misses': 0})[outcome] += 1
+
+def _hit_rates(caches):
+    return {name: dict(stats, hit_rate=round(stats['hits'] / (stats['hits'] + stats['misses']), 4))
+            for name, stats in sorted(caches.items())}
+
+
+class FlowableCounter:
+    """Counts flowables and paragraphs, either up front or as they stream past"""
+
+    def __init__(self, flowables=()):
+        self.flowables = 0
+        self.paragraphs = 0
+        for flowable in flowables:
+            self.count(flowable)
+
+    def count(self, flowable):
+        self.flowables += 1
+        # Cache wrappers such as playbook_assembly.Preflowed keep the paragraph in .flowable
+        if isinstance(getattr(flowable, 'flowable', flowable), Paragraph):
+            self.paragraphs += 1
+
+    def wrap(self, flowables):
+        for flowable in flowables:
+            self.count(flowable)
+            yield flowable
+
+
+def _output_bytes(output):
+    if isinstance(output, str):
+        return os.path.getsize(output)
+    if hasattr(output, 'tell'):
+        return output.tell()
+    return None
+
+def build_with_metrics(document, doc, make_flowables, canvasmaker, output, counter=None, metrics_log=None,
+                       post_process=None, **build_options):
+    """Create the story with make_flowables(), run doc.build(), then record and return the metrics
+
+    post_process(output) runs on the finished PDF (e.g. linearization);
+    build_options (onFirstPage, onLaterPages, ...) are passed on to doc.build().
+    """
+    # Lookups made while this build runs are its own; builds don't share a thread
+    outer_caches = getattr(_current_build, 'caches', None)
+    _current_build.caches = caches = {}
+    try:
+        started = time.perf_counter()
+        flowables = make_flowables()
+        story_seconds = time.perf_counter() - started
+        if counter is None:
+            counter = FlowableCounter(flowables)
+
+        started = time.perf_counter()
+        doc.build(flowables, canvasmaker=canvasmaker, **build_options)
+        build_seconds = time.perf_counter() - started
+
+        post_process_seconds = None
+        if post_process is not None:
+            started = time.perf_counter()
+            post_process(output)
+            post_process_seconds = time.perf_counter() - started
+    finally:
+        _current_build.caches = outer_caches
+
+    canv = doc.canv
+    save_seconds = getattr(canv, 'save_seconds', None)
+    record = {
+        'timestamp': round(time.time(), 3),
+        'document': document,
+        'pages': getattr(canv, 'page_count', None) or doc.page,
+        'bytes': _output_bytes(output),
+        'flowables': counter.flowables,
+        'paragraphs': counter.paragraphs,
+        'story_seconds': round(story_seconds, 6),
+        'build_seconds': round(build_seconds, 6),
+        'layout_seconds': round(build_seconds - save_seconds, 6) if save_seconds is not None else None,
+        'save_seconds': round(save_seconds, 6) if save_seconds is not None else None,
+        'post_process_seconds': round(post_process_seconds, 6) if post_process_seconds is not None else None,
+        'caches': _hit_rates(caches),
+    }
+    record_build(record, metrics_log)
+    return record
+
+def record_build(record, metrics_log=None):
+    """Append a record to the JSONL log and fold it into the running totals"""
+    with _lock:
+        totals = _TOTALS.setdefault(record['document'], {'builds': 0, 'build_seconds': 0.0})
+        totals['builds'] += 1
+        totals['build_seconds'] += record['build_seconds']
+        _LATEST[record['document']] = record
+
+        if metrics_log:
+            os.makedirs(os.path.dirname(metrics_log) or '.', exist_ok=True)
+            with open(metrics_log, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+def read_metrics_log(metrics_log):
+    """Load every record from a JSONL metrics log"""
+    with open(metrics_log) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text():
+    """Current metrics in the Prometheus text exposition format"""
+    with _lock:
+        totals = {document: dict(values) for document, values in _TOTALS.items()}
+        latest = dict(_LATEST)
+        caches = {name: dict(stats) for name, stats in CACHE_STATS.items()}
+
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    metric('mindworth_builds_total', 'counter', "Documents built",
+           [({'document': d}, t['builds']) for d, t in sorted(totals.items())])
+    metric('mindworth_build_seconds_total', 'counter', "Total wall time spent building documents",
+           [({'document': d}, round(t['build_seconds'], 6)) for d, t in sorted(totals.items())])
+    for field, help_text in [
+        ('pages', "Page count of the last build"),
+        ('bytes', "Output size in bytes of the last build"),
+        ('flowables', "Flowables laid out in the last build"),
+        ('paragraphs', "Paragraphs laid out in the last build"),
+        ('build_seconds', "Wall time of the last build"),
+        ('layout_seconds', "Layout time of the last build"),
+    ]:
+        metric(f'mindworth_last_{field}', 'gauge', help_text,
+               [({'document': d}, r[field]) for d, r in sorted(latest.items()) if r.get(field) is not None])
+    metric('mindworth_cache_hits_total', 'counter', "Cache hits, by every build and request in the process",
+           [({'cache': name}, stats['hits']) for name, stats in sorted(caches.items())])
+    metric('mindworth_cache_misses_total', 'counter', "Cache misses, by every build and request in the process",
+           [({'cache': name}, stats['misses']) for name, stats in sorted(caches.items())])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Distributed Build Queue
+Workers on any number of hosts pull (document, lead) render jobs from a
+shared queue and write the PDFs into a content-addressed output store.
+
+Queues: SQLiteJobQueue for local runs and tests, RedisJobQueue for
+production (any client with the redis-py API).
+
+    python build_queue.py enqueue sqlite:///campaign.db leads.jsonl --document email-checklist
+    python build_queue.py worker sqlite:///campaign.db --store /shared/pdfs --processes 4
+    python build_queue.py stats sqlite:///campaign.db
+"""
+
+from multiprocessing import Process
+import argparse
+import hashlib
+import io
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from generate_lead_magnets import GUIDE_SPECS, build_guide, get_guide_spec
+from playbook_assembly import assemble_playbook
+
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 300
+DEFAULT_SHARDS = 8
+
+
+def make_job(document, lead=None):
+    """Create a render job for a guide key (or 'playbook') and an optional lead"""
+    return {'document': document, 'lead': lead or {}}
+
+def shard_for(job, shards):
+    """Stable shard for a job, so one lead's documents land on the same shard"""
+    lead = job.get('lead') or {}
+    key = f"{lead.get('email', '')}|{job['document']}"
+    return int(hashlib.sha1(key.encode('utf8')).hexdigest(), 16) % shards
+
+def lead_display_name(lead):
+    """Name for the "Prepared for" line, or None for anonymous downloads"""
+    name = lead.get('fullName') or lead.get('name')
+    company = lead.get('company')
+    if name and company:
+        return f"{name}, {company}"
+    return name or company
+
+def render_job(job):
+    """Render a job to PDF bytes"""
+    buffer = io.BytesIO()
+    lead = job.get('lead') or {}
+    if job['document'] == 'playbook':
+        assemble_playbook(lead, buffer)
+    else:
+        build_guide(get_guide_spec(job['document']), buffer, prepared_for=lead_display_name(lead))
+    return buffer.getvalue()
+
+
+class ContentStore:
+    """Content-addressed PDF store on a directory shared by all workers"""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.pdf")
+
+    def __contains__(self, digest):
+        return os.path.exists(self.path_for(digest))
+
+    def put(self, data):
+        """Store bytes under their SHA-256 and return the digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write beside the target and rename, so readers on other hosts
+        # never see a partial file and concurrent writers simply race to
+        # install identical content
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest):
+        with open(self.path_for(digest), 'rb') as f:
+            return f.read()
+
+
+class JobQueue:
+    """Interface shared by the queue backends
+
+    reserve() leases a job to a worker. The worker calls ack() with the
+    result once the job is done, or fail() with an error message. Failed
+    jobs and jobs whose lease runs out are retried until they have been
+    attempted max_attempts times, then parked as dead.
+
+    ack() and fail() only act for the worker holding the job's lease and
+    return False when it was lost (the lease expired and the job went back
+    to the queue, possibly to another worker).
+    """
+
+    def put(self, job):
+        raise NotImplementedError
+
+    def reserve(self, worker_id, shards=None):
+        raise NotImplementedError
+
+    def ack(self, job_id, worker_id, result=None):
+        raise NotImplementedError
+
+    def fail(self, job_id, worker_id, error):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a local SQLite file; safe across processes on one host"""
+
+    def __init__(self, path, shards=DEFAULT_SHARDS, max_attempts=MAX_ATTEMPTS, lease_seconds=LEASE_SECONDS):
+        self.shards = shards
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " shard INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " result TEXT,"
+            " error TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, shard, id)")
+
+    def put(self, job):
+        cursor = self.db.execute(
+            "INSERT INTO jobs (shard, payload) VALUES (?, ?)",
+            (shard_for(job, self.shards), json.dumps(job))
+        )
+        return cursor.lastrowid
+
+    def _retry_or_bury(self, job_id, attempts, error):
+        status = 'dead' if attempts >= self.max_attempts else 'pending'
+        self.db.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+            (status, error, job_id)
+        )
+
+    def reserve(self, worker_id, shards=None):
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            expired = self.db.execute(
+                "SELECT id, attempts FROM jobs WHERE status = 'leased' AND lease_expires < ?", (now,)
+            ).fetchall()
+            for job_id, attempts in expired:
+                self._retry_or_bury(job_id, attempts, "lease expired")
+
+            query = "SELECT id, payload FROM jobs WHERE status = 'pending'"
+            params = []
+            if shards is not None:
+                query += f" AND shard IN ({', '.join('?' * len(shards))})"
+                params.extend(shards)
+            row = self.db.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1"
+                    " WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, row[0])
+                )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def ack(self, job_id, worker_id, result=None):
+        cursor = self.db.execute(
+            "UPDATE jobs SET status = 'done', lease_expires = NULL, result = ?"
+            " WHERE id = ? AND worker = ? AND status = 'leased'",
+            (result, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'leased'", (job_id, worker_id)
+            ).fetchone()
+            if row is not None:
+                self._retry_or_bury(job_id, row[0], error)
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    def stats(self):
+        rows = self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def results(self):
+        """(job, digest) pairs for every finished job"""
+        rows = self.db.execute("SELECT payload, result FROM jobs WHERE status = 'done' ORDER BY id")
+        return [(json.loads(payload), digest) for payload, digest in rows]
+
+
+def _text(value):
+    return value.decode('utf8') if isinstance(value, bytes) else value
+
+class RedisJobQueue(JobQueue):
+    """Job queue on Redis (or any server speaking the same commands)
+
+    Each shard is a list of pending job ids; a leased job sits in the
+    processing list with its deadline in a sorted set, so any worker can
+    hand expired leases back to the queue. Leasing a job and releasing a
+    lease run as Lua scripts, so they happen atomically; the scripts touch
+    job hashes they don't declare, which rules out Redis Cluster.
+    """
+
+    # KEYS: pending list, processing list, leases; ARGV: deadline, worker id, job key prefix
+    RESERVE_SCRIPT = """
+local job_id = redis.call('RPOPLPUSH', KEYS[1], KEYS[2])
+if not job_id then
+    return false
+end
+redis.call('ZADD', KEYS[3], ARGV[1], job_id)
+local key = ARGV[3] .. job_id
+redis.call('HSET', key, 'status', 'leased', 'worker', ARGV[2])
+redis.call('HINCRBY', key, 'attempts', 1)
+return {job_id, redis.call('HGET', key, 'payload')}
+"""
+
+    # KEYS: leases, job hash; ARGV: job id, worker id. 1 if the worker held the lease, which is now gone
+    RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'worker') == ARGV[2] and redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    return 1
+end
+return 0
+"""
+
+    def __init__(self, client=None, url="redis://localhost:6379/0", prefix="mindworth:build",
+                 shards=DEFAULT_SHARDS, max_attempts=MAX_ATTEMPTS, lease_seconds=LEASE_SECONDS):
+        if client is None:
+            if redis is None:
+                raise RuntimeError("RedisJobQueue needs the 'redis' package (pip install redis) or a client object")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.shards = shards
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.processing = f"{prefix}:processing"
+        self.leases = f"{prefix}:leases"
+        self.dead = f"{prefix}:dead"
+        self._reserve = client.register_script(self.RESERVE_SCRIPT)
+        self._release = client.register_script(self.RELEASE_SCRIPT)
+
+    def _pending(self, shard):
+        return f"{self.prefix}:pending:{shard}"
+
+    def _job(self, job_id):
+        return f"{self.prefix}:job:{job_id}"
+
+    def put(self, job):
+        job_id = str(self.client.incr(f"{self.prefix}:seq"))
+        shard = shard_for(job, self.shards)
+        pipe = self.client.pipeline()
+        pipe.hset(self._job(job_id), mapping={
+            'payload': json.dumps(job), 'shard': shard, 'status': 'pending', 'attempts': 0,
+        })
+        pipe.lpush(self._pending(shard), job_id)
+        pipe.execute()
+        return job_id
+
+    def _retry_or_bury(self, job_id, error):
+        key = self._job(job_id)
+        attempts = int(self.client.hget(key, 'attempts') or 0)
+        shard = int(self.client.hget(key, 'shard') or 0)
+        pipe = self.client.pipeline()
+        pipe.lrem(self.processing, 0, job_id)
+        pipe.hdel(key, 'worker')
+        if attempts >= self.max_attempts:
+            pipe.hset(key, mapping={'status': 'dead', 'error': error})
+            pipe.rpush(self.dead, job_id)
+        else:
+            pipe.hset(key, mapping={'status': 'pending', 'error': error})
+            pipe.rpush(self._pending(shard), job_id)
+        pipe.execute()
+
+    def reserve(self, worker_id, shards=None):
+        now = time.time()
+        for job_id in self.client.zrangebyscore(self.leases, 0, now):
+            # Whoever removes the lease first owns the requeue
+            if self.client.zrem(self.leases, job_id):
+                self._retry_or_bury(_text(job_id), "lease expired")
+
+        for shard in (range(self.shards) if shards is None else shards):
+            # Moving the job to processing and recording its lease in one step
+            # means a worker dying in between can't strand it without a lease
+            reserved = self._reserve(keys=[self._pending(shard), self.processing, self.leases],
+                                     args=[now + self.lease_seconds, worker_id, self._job('')])
+            if reserved:
+                job_id, payload = reserved
+                return _text(job_id), json.loads(_text(payload))
+        return None
+
+    def _release_lease(self, job_id, worker_id):
+        # Removing the lease makes the caller the job's only owner, as in reserve()
+        return bool(self._release(keys=[self.leases, self._job(job_id)], args=[job_id, worker_id]))
+
+    def ack(self, job_id, worker_id, result=None):
+        if not self._release_lease(job_id, worker_id):
+            return False
+        pipe = self.client.pipeline()
+        pipe.lrem(self.processing, 0, job_id)
+        pipe.hset(self._job(job_id), mapping={'status': 'done', 'result': result or ''})
+        pipe.incr(f"{self.prefix}:done")
+        pipe.execute()
+        return True
+
+    def fail(self, job_id, worker_id, error):
+        if not self._release_lease(job_id, worker_id):
+            return False
+        self._retry_or_bury(job_id, error)
+        return True
+
+    def stats(self):
+        pending = sum(self.client.llen(self._pending(shard)) for shard in range(self.shards))
+        return {
+            'pending': pending,
+            'leased': self.client.llen(self.processing),
+            'dead': self.client.llen(self.dead),
+            'done': int(self.client.get(f"{self.prefix}:done") or 0),
+        }
+
+
+def open_queue(url, **kwargs):
+    """Open a queue from a sqlite:///path or redis:// URL"""
+    if url.startswith("sqlite:///"):
+        return SQLiteJobQueue(url[len("sqlite:///"):], **kwargs)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue(url=url, **kwargs)
+    raise ValueError(f"Unsupported queue URL: {url}")
+
+def run_worker(queue, store, worker_id=None, shards=None, max_jobs=None, exit_when_idle=False, poll_interval=1.0):
+    """Render jobs from the queue until it is drained (or forever); returns jobs done"""
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        reserved = queue.reserve(worker_id, shards)
+        if reserved is None:
+            if exit_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        job_id, job = reserved
+        try:
+            digest = store.put(render_job(job))
+        except Exception as e:
+            queue.fail(job_id, worker_id, f"{type(e).__name__}: {e}")
+            continue
+        # A job whose lease ran out has been handed to another worker, which will finish it
+        if queue.ack(job_id, worker_id, digest):
+            done += 1
+    return done
+
+def _worker_process(queue_url, store_root, shards, exit_when_idle):
+    # Each process opens its own connection; neither backend's handle survives a fork
+    run_worker(open_queue(queue_url), ContentStore(store_root), shards=shards, exit_when_idle=exit_when_idle)
+
+def enqueue_leads(queue, leads, documents):
+    """Queue one job per (lead, document); returns the job ids"""
+    return [queue.put(make_job(document, lead)) for lead in leads for document in documents]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MindWorth AI distributed lead magnet build queue")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="queue render jobs for a JSONL file of leads")
+    enqueue.add_argument('queue')
+    enqueue.add_argument('leads', help="JSONL file, one lead object per line")
+    enqueue.add_argument('--document', action='append',
+                         help="guide key or 'playbook' (repeatable, default: all guides)")
+
+    worker = commands.add_parser('worker', help="render queued jobs into the output store")
+    worker.add_argument('queue')
+    worker.add_argument('--store', required=True, help="shared content-addressed output directory")
+    worker.add_argument('--shards', help="comma-separated shard numbers to serve (default: all)")
+    worker.add_argument('--processes', type=int, default=1)
+    worker.add_argument('--exit-when-idle', action='store_true')
+
+    stats = commands.add_parser('stats', help="print job counts by status")
+    stats.add_argument('queue')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'enqueue':
+        with open(args.leads) as f:
+            leads = [json.loads(line) for line in f if line.strip()]
+        documents = args.document or [spec['key'] for spec in GUIDE_SPECS]
+        job_ids = enqueue_leads(open_queue(args.queue), leads, documents)
+        print(f"Queued {len(job_ids)} jobs")
+
+    elif args.command == 'worker':
+        shards = [int(shard) for shard in args.shards.split(',')] if args.shards else None
+        processes = [
+            Process(target=_worker_process, args=(args.queue, args.store, shards, args.exit_when_idle))
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+    elif args.command == 'stats':
+        print(json.dumps(open_queue(args.queue).stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
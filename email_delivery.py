@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Lead Magnet Email Delivery
+Sends each lead the "copy in your email" promised by the site's success
+message. Every guide's PDF is base64-encoded once and the same encoded
+bytes are streamed into every message that carries it; messages go out
+over a pool of reused (and, where the server allows, pipelined) SMTP
+connections with a send-rate limit and retries for temporary failures.
+
+    python email_delivery.py leads.jsonl --smtp smtp.example.com:587 --starttls --user hello@mindworth.ai
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.mime.application import MIMEApplication
+from email.mime.text import MIMEText
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import formataddr, formatdate, make_msgid, parseaddr
+import argparse
+import io
+import json
+import os
+import queue
+import re
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+
+from generate_lead_magnets import GUIDE_SPECS, OUTPUT_DIR, build_guide
+
+SENDER = formataddr(("MindWorth AI", "hello@mindworth.ai"))
+POOL_SIZE = 4
+# Connections are closed and reopened after this many messages
+MESSAGES_PER_CONNECTION = 100
+SEND_RATE = 10.0
+SEND_BURST = 20
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 2.0
+
+SPECS_BY_KEY = {spec['key']: spec for spec in GUIDE_SPECS}
+
+_LEADING_DOT = re.compile(rb'^\.', re.MULTILINE)
+_CONTROL_CHARS = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _dot_stuff(data):
+    # SMTP DATA ends at a line holding a single dot, so leading dots are doubled
+    return _LEADING_DOT.sub(b'..', data)
+
+
+class SharedAttachment:
+    """A PDF attachment encoded (and dot-stuffed) once, shared by every message that carries it"""
+
+    def __init__(self, filename, data):
+        part = MIMEApplication(data, 'pdf')
+        part.add_header('Content-Disposition', 'attachment', filename=filename)
+        self.filename = filename
+        self.size = len(data)
+        self.encoded = _dot_stuff(part.as_bytes(policy=SMTP_POLICY))
+        boundary = f"=mindworth-{uuid.uuid4().hex}"
+        while boundary.encode('ascii') in self.encoded:
+            boundary = f"=mindworth-{uuid.uuid4().hex}"
+        self.boundary = boundary.encode('ascii')
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls(os.path.basename(path), f.read())
+
+
+def compose_message(attachment, recipient, subject, text, sender=SENDER):
+    """A multipart message as a list of byte chunks; the attachment chunk is the shared one
+
+    Headers are set on an EmailMessage, which rejects values that would
+    start a new header line.
+    """
+    message = EmailMessage(policy=SMTP_POLICY)
+    message['From'] = sender
+    message['To'] = recipient
+    message['Subject'] = subject
+    message['Date'] = formatdate(localtime=True)
+    message['Message-ID'] = make_msgid(domain=parseaddr(sender)[1].rpartition('@')[2] or None)
+    message['MIME-Version'] = '1.0'
+    message['Content-Type'] = f'multipart/mixed; boundary="{attachment.boundary.decode("ascii")}"'
+    head = b''.join(SMTP_POLICY.fold_binary(name, value) for name, value in message.items())
+    body = MIMEText(text, 'plain', 'utf-8').as_bytes(policy=SMTP_POLICY)
+    delimiter = b'\r\n--' + attachment.boundary + b'\r\n'
+    return [
+        _dot_stuff(head + b'\r\n' + delimiter[2:] + body + delimiter),
+        attachment.encoded,
+        b'\r\n--' + attachment.boundary + b'--\r\n',
+    ]
+
+
+class TokenBucket:
+    """Allows `rate` sends per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate=SEND_RATE, burst=SEND_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SMTPConnectionPool:
+    """Reusable SMTP connections, opened on demand up to `size` at a time"""
+
+    def __init__(self, host, port=25, size=POOL_SIZE, username=None, password=None,
+                 starttls=False, use_ssl=False, timeout=30, messages_per_connection=MESSAGES_PER_CONNECTION):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.messages_per_connection = messages_per_connection
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self):
+        if self.use_ssl:
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                    context=ssl.create_default_context())
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        conn.ehlo()
+        if self.starttls:
+            conn.starttls(context=ssl.create_default_context())
+            conn.ehlo()
+        if self.username:
+            conn.login(self.username, self.password or '')
+        conn.sent_messages = 0
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is discarded if the block fails on a network error"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                yield conn
+            except (smtplib.SMTPServerDisconnected, OSError):
+                _close(conn)
+                raise
+            except smtplib.SMTPResponseException as e:
+                # 421: the server is closing the connection
+                if e.smtp_code == 421:
+                    _close(conn)
+                else:
+                    self._idle.put(conn)
+                raise
+            except BaseException:
+                # The connection may be mid-transaction
+                _close(conn)
+                raise
+            if conn.sent_messages >= self.messages_per_connection:
+                _quit(conn)
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                _quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _quit(conn):
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        _close(conn)
+
+def _close(conn):
+    try:
+        conn.close()
+    except OSError:
+        pass
+
+def _check(reply, expected, conn):
+    code, message = reply
+    if code not in expected:
+        if code != 421:
+            # Leave the connection ready for the next message
+            try:
+                conn.rset()
+            except smtplib.SMTPException:
+                pass
+        raise smtplib.SMTPResponseException(code, message)
+
+def send_chunks(conn, sender, recipient, chunks):
+    """Send one message's envelope and data, pipelining the envelope when the server allows it
+
+    Addresses that can't go in an ASCII envelope raise UnicodeEncodeError
+    before anything is sent.
+    """
+    commands = [f"MAIL FROM:<{parseaddr(sender)[1]}>\r\n".encode('ascii'),
+                f"RCPT TO:<{parseaddr(recipient)[1]}>\r\n".encode('ascii'), b"DATA\r\n"]
+    expected = [(250,), (250, 251), (354,)]
+    if conn.has_extn('pipelining'):
+        conn.send(b''.join(commands))
+        replies = [conn.getreply() for _ in commands]
+        for reply, codes in zip(replies, expected):
+            _check(reply, codes, conn)
+    else:
+        for command, codes in zip(commands, expected):
+            conn.send(command)
+            _check(conn.getreply(), codes, conn)
+
+    for chunk in chunks:
+        conn.send(chunk)
+    conn.send(b'.\r\n')
+    _check(conn.getreply(), (250,), conn)
+    conn.sent_messages += 1
+
+def _is_temporary(error):
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+def send_message(pool, limiter, sender, recipient, chunks, max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+    """Send one message, retrying temporary failures with exponential backoff"""
+    attempts = 0
+    while True:
+        attempts += 1
+        limiter.acquire()
+        try:
+            with pool.connection() as conn:
+                send_chunks(conn, sender, recipient, chunks)
+            return {'recipient': recipient, 'status': 'sent', 'attempts': attempts}
+        except UnicodeEncodeError as e:
+            # A non-ASCII address: no server will take it, so don't retry
+            return {'recipient': recipient, 'status': 'failed', 'attempts': attempts, 'error': str(e)}
+        except (smtplib.SMTPException, OSError) as e:
+            if not _is_temporary(e) or attempts >= max_attempts:
+                return {'recipient': recipient, 'status': 'failed', 'attempts': attempts, 'error': str(e)}
+            time.sleep(retry_delay * 2 ** (attempts - 1))
+
+def deliver(messages, pool, limiter=None, sender=SENDER, max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+    """Send (recipient, chunks) pairs over the pool; returns one result per message, in order"""
+    if limiter is None:
+        limiter = TokenBucket()
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        futures = [
+            executor.submit(send_message, pool, limiter, sender, recipient, chunks, max_attempts, retry_delay)
+            for recipient, chunks in messages
+        ]
+        return [future.result() for future in futures]
+
+
+def load_attachment(spec, pdf_dir=OUTPUT_DIR):
+    """The guide's generated PDF, rendered now if it isn't on disk"""
+    path = os.path.join(pdf_dir, spec['filename'])
+    if os.path.exists(path):
+        return SharedAttachment.from_file(path)
+    buffer = io.BytesIO()
+    build_guide(spec, buffer, metrics_log=None)
+    return SharedAttachment(spec['filename'], buffer.getvalue())
+
+def lead_message(lead, spec, attachment, sender=SENDER):
+    """(recipient, chunks) for a lead; raises ValueError for an address that can't be sent to"""
+    # Form input: line breaks and other control characters become spaces
+    name = ' '.join(_CONTROL_CHARS.sub(' ', lead.get('fullName') or lead.get('name') or '').split())
+    address = lead['email'].strip()
+    if _CONTROL_CHARS.search(address) or ' ' in address:
+        raise ValueError(f"invalid email address {address!r}")
+    greeting = f"Hi {name.split()[0]}," if name else "Hi there,"
+    text = (
+        f"{greeting}\n\n"
+        f"Thanks for downloading {spec['title']}. Your copy is attached.\n\n"
+        f"{spec['cta_title']}\n"
+        "Book a free consultation at https://mindworth.ai\n\n"
+        "- The MindWorth AI team\n"
+    )
+    recipient = formataddr((name, address)) if name else address
+    return recipient, compose_message(attachment, recipient, f"Your copy: {spec['title']}", text, sender)
+
+def deliver_leads(leads, pool, limiter=None, pdf_dir=OUTPUT_DIR, sender=SENDER,
+                  max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+    """Email each lead the guide for its form_type; leads without an email or a known guide are skipped"""
+    attachments = {}
+    messages = []
+    skipped = []
+    rejected = []
+    for lead in leads:
+        spec = SPECS_BY_KEY.get(lead.get('form_type'))
+        if spec is None or not lead.get('email'):
+            skipped.append({'recipient': lead.get('email'), 'status': 'skipped',
+                            'error': "no email address" if spec else "no lead magnet for form_type"})
+            continue
+        if spec['key'] not in attachments:
+            attachments[spec['key']] = load_attachment(spec, pdf_dir)
+        try:
+            messages.append(lead_message(lead, spec, attachments[spec['key']], sender))
+        except ValueError as e:
+            rejected.append({'recipient': lead['email'], 'status': 'failed', 'attempts': 0, 'error': str(e)})
+    return deliver(messages, pool, limiter, sender, max_attempts, retry_delay) + rejected + skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Email MindWorth AI lead magnets to leads")
+    parser.add_argument('leads', help="JSONL file, one lead (form submission) per line")
+    parser.add_argument('--smtp', default='localhost:25', help="host:port (default localhost:25)")
+    parser.add_argument('--user')
+    parser.add_argument('--password-env', default='SMTP_PASSWORD',
+                        help="environment variable holding the SMTP password")
+    parser.add_argument('--starttls', action='store_true')
+    parser.add_argument('--ssl', action='store_true', help="connect with implicit TLS")
+    parser.add_argument('--sender', default=SENDER)
+    parser.add_argument('--pool', type=int, default=POOL_SIZE, help="concurrent SMTP connections")
+    parser.add_argument('--rate', type=float, default=SEND_RATE, help="messages per second")
+    parser.add_argument('--pdf-dir', default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    host, _, port = args.smtp.partition(':')
+    with open(args.leads) as f:
+        leads = [json.loads(line) for line in f if line.strip()]
+
+    pool = SMTPConnectionPool(host, int(port or 25), args.pool, args.user,
+                              os.environ.get(args.password_env), args.starttls, args.ssl)
+    try:
+        results = deliver_leads(leads, pool, TokenBucket(args.rate, max(1, int(args.rate * 2))),
+                                args.pdf_dir, args.sender)
+    finally:
+        pool.close()
+
+    for result in results:
+        if result['status'] != 'sent':
+            print(json.dumps(result))
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print(json.dumps(counts))
+
+if __name__ == "__main__":
+    main()
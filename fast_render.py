@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Direct Canvas Renderer
+A SimpleDocTemplate for the guides' restricted layout model: paragraphs
+of plain, bold and italic text, spacers, page breaks and flowables that
+never split (charts, images, variant slots). Lines are broken greedily
+and written to the canvas as PDF text operators, placed with the same
+frame arithmetic as platypus so pages look the same; stories with
+anything else (tables, links, justified text) are built by platypus as
+usual.
+
+Selected per guide with spec['renderer'] = 'fast' (see build_guide).
+"""
+
+from reportlab.lib.colors import CMYKColor, Color
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.rl_accel import escapePDF
+from reportlab.pdfbase.pdfmetrics import getFont, unicode2T1
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Flowable, PageBreak, Paragraph, SimpleDocTemplate
+from reportlab.platypus.doctemplate import ActionFlowable, LayoutError, _doNothing
+from reportlab.platypus.frames import _FUZZ
+from collections import deque
+import re
+
+from font_metrics import string_width
+
+# SimpleDocTemplate's frame padding
+FRAME_PADDING = 6
+
+_PIECES = re.compile(r'\s+|\S+')
+
+
+def _number(value):
+    return ('%.3f' % value).rstrip('0').rstrip('.')
+
+def _simple_font(name):
+    font = getFont(name)
+    return not (font._dynamicFont or font._multiByte)
+
+def _simple_paragraph(paragraph):
+    style = paragraph.style
+    if (style.alignment not in (TA_LEFT, TA_CENTER, TA_RIGHT) or paragraph.bulletText or style.backColor
+            or style.borderWidth or style.wordWrap or getattr(style, 'autoLeading', '') not in ('', 'off')
+            or style.firstLineIndent or style.endDots or getattr(style, 'hyphenationLang', '')):
+        return False
+    for frag in paragraph.frags:
+        if (frag.link or frag.us_lines or frag.rise or getattr(frag, 'backColor', None)
+                or hasattr(frag, 'cbDefn')):
+            return False
+        # Text is written as PDF operators for single-byte fonts in plain RGB
+        color = frag.textColor
+        if (not _simple_font(frag.fontName) or not isinstance(color, Color) or isinstance(color, CMYKColor)
+                or color.alpha != 1):
+            return False
+    return True
+
+def fast_layout_supported(flowables):
+    """True if every flowable fits the direct canvas layout model"""
+    for flowable in flowables:
+        if isinstance(flowable, PageBreak):
+            if flowable.nextTemplate:
+                return False
+        elif isinstance(flowable, Paragraph):
+            if not _simple_paragraph(flowable) or flowable.getKeepWithNext():
+                return False
+        elif isinstance(flowable, ActionFlowable) or getattr(flowable, 'keepWithNext', 0):
+            return False
+        elif type(flowable).split is not Flowable.split:
+            # Tables and other splitting flowables need platypus
+            return False
+    return True
+
+def break_lines(paragraph, width):
+    """Greedy line breaking of a paragraph's fragments; returns [(line width, words)]
+
+    A word is a list of (frag, text) runs, so it can change font mid-word.
+    """
+    style = paragraph.style
+    width -= style.leftIndent + style.rightIndent
+    lines = []
+    words = []
+    line_width = 0
+    space_width = 0
+    word = None
+
+    def end_line():
+        nonlocal words, line_width
+        lines.append((line_width, words))
+        words = []
+        line_width = 0
+
+    def end_word():
+        nonlocal word, line_width, space_width
+        if word is None:
+            return
+        word_width = sum(string_width(text, frag.fontName, frag.fontSize) for frag, text in word)
+        if words and line_width + space_width + word_width > width:
+            end_line()
+        line_width += (space_width if words else 0) + word_width
+        words.append(word)
+        last = word[-1][0]
+        space_width = string_width(' ', last.fontName, last.fontSize)
+        word = None
+
+    for frag in paragraph.frags:
+        if getattr(frag, 'lineBreak', False):
+            end_word()
+            end_line()
+            continue
+        for piece in _PIECES.findall(frag.text):
+            if piece.isspace():
+                end_word()
+            elif word is None:
+                word = [(frag, piece)]
+            else:
+                word.append((frag, piece))
+    end_word()
+    if words:
+        end_line()
+    return lines
+
+
+class _TextBlock:
+    """A paragraph's broken lines, or the part of them still to be placed"""
+
+    def __init__(self, paragraph, lines, first=True):
+        self.paragraph = paragraph
+        self.style = paragraph.style
+        self.lines = lines
+        self.first = first
+
+    def getSpaceBefore(self):
+        return self.paragraph.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.paragraph.getSpaceAfter()
+
+    def height(self):
+        return len(self.lines) * self.style.leading
+
+
+class FastDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate that draws restricted stories directly on the canvas"""
+
+    def build(self, flowables, onFirstPage=_doNothing, onLaterPages=_doNothing, canvasmaker=canvas.Canvas):
+        if not fast_layout_supported(flowables):
+            return SimpleDocTemplate.build(self, flowables, onFirstPage, onLaterPages, canvasmaker)
+
+        self._calc()
+        self.canv = self._makeCanvas(canvasmaker=canvasmaker)
+        self._on_pages = (onFirstPage, onLaterPages)
+        self._font_names = {}
+        self._left = self.leftMargin + FRAME_PADDING
+        self._top = self.bottomMargin + self.height - FRAME_PADDING
+        self._bottom = self.bottomMargin + FRAME_PADDING
+        self._width = self.width - 2 * FRAME_PADDING
+        self.page = 0
+        self._begin_page()
+
+        queue = deque(flowables)
+        while queue:
+            flowable = queue.popleft()
+            if isinstance(flowable, PageBreak):
+                self._end_page()
+                self._begin_page()
+                continue
+            if isinstance(flowable, Paragraph):
+                flowable = _TextBlock(flowable, break_lines(flowable, self._width))
+            rest = self._place(flowable)
+            if rest is not None:
+                if self._y == self._top and rest is flowable:
+                    raise LayoutError(f"{flowable!r} is too large for an empty page")
+                queue.appendleft(rest)
+                self._end_page()
+                self._begin_page()
+
+        self._end_page()
+        self.canv.save()
+
+    def _begin_page(self):
+        self.page += 1
+        self._y = self._top
+        self._at_top = True
+        self._space_after = 0
+        self._on_pages[self.page > 1](self.canv, self)
+
+    def _end_page(self):
+        self.canv.showPage()
+
+    def _place(self, flowable):
+        """Place as much of a flowable as fits; returns what's left for the next page, or None"""
+        space = 0
+        if not self._at_top:
+            space = max(flowable.getSpaceBefore() - self._space_after, 0)
+        available = self._y - self._bottom - space
+        if available <= 0:
+            return flowable
+        text = isinstance(flowable, _TextBlock)
+        if text:
+            height = flowable.height()
+        else:
+            height = flowable.wrapOn(self.canv, self._width, available)[1]
+
+        rest = None
+        if self._y - space - height < self._bottom - _FUZZ:
+            if not text:
+                return flowable
+            # Paragraph.split: keep at least two lines here, or move it all
+            count = int(available / flowable.style.leading)
+            if count <= 1:
+                return flowable
+            rest = _TextBlock(flowable.paragraph, flowable.lines[count:], first=False)
+            flowable = _TextBlock(flowable.paragraph, flowable.lines[:count], first=flowable.first)
+            height = flowable.height()
+
+        y = self._y - space - height
+        if text:
+            self._draw_text(flowable, y + height)
+            if flowable.first:
+                self.afterFlowable(flowable.paragraph)
+        else:
+            flowable.drawOn(self.canv, self._left, y)
+            self.afterFlowable(flowable)
+        space_after = flowable.getSpaceAfter()
+        y -= space_after
+        self._space_after = space_after
+        if y != self._y:
+            self._at_top = False
+        self._y = y
+        return rest
+
+    def _font_resource(self, font):
+        name = self._font_names.get(font.fontName)
+        if name is None:
+            name = self._font_names[font.fontName] = self.canv._doc.getInternalFontName(font.fontName)
+        return name
+
+    def _show(self, ops, font, size, text):
+        # What PDFTextObject._formatText does for single-byte fonts, minus its bookkeeping
+        current = font
+        for segment_font, data in unicode2T1(text, [font] + font.substitutionFonts):
+            if segment_font is not current:
+                ops.append(f'{self._font_resource(segment_font)} {_number(size)} Tf')
+                current = segment_font
+            ops.append(f'({escapePDF(data)}) Tj')
+        if current is not font:
+            ops.append(f'{self._font_resource(font)} {_number(size)} Tf')
+
+    def _draw_text(self, block, top):
+        """Write a block's lines as one text object of PDF operators"""
+        style = block.style
+        left = self._left + style.leftIndent
+        width = self._width - style.leftIndent - style.rightIndent
+        ops = ['q BT']
+        font = size = color = None
+        baseline = top
+        for number, (line_width, words) in enumerate(block.lines):
+            if number == 0:
+                # paraFontSizeHeightOffset: the first baseline sits a font size below the top
+                baseline -= max(frag.fontSize for frag, _ in words[0]) if words else style.fontSize
+            else:
+                baseline -= style.leading
+            x = left
+            if style.alignment == TA_CENTER:
+                x += (width - line_width) / 2
+            elif style.alignment == TA_RIGHT:
+                x += width - line_width
+            ops.append(f'1 0 0 1 {_number(x)} {_number(baseline)} Tm')
+            # Runs of one font and colour go out as a single string
+            run = []
+            for index, word in enumerate(words):
+                if index:
+                    run.append(' ')
+                for frag, piece in word:
+                    if frag.fontName != getattr(font, 'fontName', None) or frag.fontSize != size \
+                            or frag.textColor != color:
+                        if run:
+                            self._show(ops, font, size, ''.join(run))
+                            run = []
+                        if frag.fontName != getattr(font, 'fontName', None) or frag.fontSize != size:
+                            font, size = getFont(frag.fontName), frag.fontSize
+                            ops.append(f'{self._font_resource(font)} {_number(size)} Tf')
+                        if frag.textColor != color:
+                            color = frag.textColor
+                            ops.append('%s %s %s rg' % tuple(_number(value) for value in color.rgb()))
+                    run.append(piece)
+            if run:
+                self._show(ops, font, size, ''.join(run))
+        ops.append('ET Q')
+        self.canv.addLiteral('\n'.join(ops))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Font Metrics Cache
+Width tables and a word-width memo for the paragraph wrap loop, which
+otherwise re-encodes and re-measures every word of every line it tries
+"""
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import paragraph
+import threading
+
+# Words remembered per font and size before the memo starts over
+MAX_WORDS = 50000
+
+_reportlab_string_width = pdfmetrics.stringWidth
+_tables = {}
+_lock = threading.Lock()
+
+
+class WidthTable:
+    """Glyph widths for one font at one size, plus the widths of words seen so far
+
+    Characters the font can encode as a single byte are measured from its
+    own widths table; anything else (substitution fonts, TrueType, odd
+    encodings) falls back to ReportLab's stringWidth, and is memoized too.
+    """
+
+    def __init__(self, font_name, font_size):
+        self.font_name = font_name
+        self.font_size = font_size
+        font = pdfmetrics.getFont(font_name)
+        if isinstance(font, pdfmetrics.Font) and not getattr(font, '_dynamicFont', 0):
+            self._glyph_widths = font.widths
+            self._encoding = 'UTF16' if 'UCS-2' in font.encName else font.encName
+        else:
+            self._glyph_widths = None
+        self.units = {}
+        self.words = {}
+
+    def char_units(self, char):
+        """Width of one character in 1/1000 em, or None if the font can't draw it itself"""
+        units = self.units.get(char)
+        if units is None and char not in self.units:
+            try:
+                code = char.encode(self._encoding)
+                units = self._glyph_widths[code[0]] if len(code) == 1 else None
+            except UnicodeEncodeError:
+                units = None
+            self.units[char] = units
+        return units
+
+    def measure(self, text, encoding='utf8'):
+        if self._glyph_widths is not None:
+            if isinstance(text, bytes):
+                text = text.decode(encoding)
+            total = 0
+            for char in text:
+                units = self.char_units(char)
+                if units is None:
+                    break
+                total += units
+            else:
+                # Same arithmetic as ReportLab, so layouts come out identical
+                return total * 0.001 * self.font_size
+        return _reportlab_string_width(text, self.font_name, self.font_size, encoding)
+
+    def width(self, text, encoding='utf8'):
+        try:
+            return self.words[text]
+        except KeyError:
+            pass
+        if len(self.words) >= MAX_WORDS:
+            self.words.clear()
+        width = self.words[text] = self.measure(text, encoding)
+        return width
+
+
+def width_table(font_name, font_size):
+    """Shared WidthTable for a font and size"""
+    key = (font_name, font_size)
+    table = _tables.get(key)
+    if table is None:
+        with _lock:
+            table = _tables.get(key)
+            if table is None:
+                table = _tables[key] = WidthTable(font_name, font_size)
+    return table
+
+def string_width(text, font_name, font_size, encoding='utf8'):
+    """Drop-in replacement for pdfmetrics.stringWidth backed by the width tables"""
+    try:
+        return _tables[(font_name, font_size)].width(text, encoding)
+    except KeyError:
+        return width_table(font_name, font_size).width(text, encoding)
+
+def install():
+    """Route the paragraph wrap loop's width lookups through the cached tables"""
+    paragraph.stringWidth = string_width
+
+def uninstall():
+    paragraph.stringWidth = _reportlab_string_width
+
+def clear():
+    with _lock:
+        _tables.clear()
@@ -7,11 +7,32 @@ Creates professional, branded PDF checklists for each service
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak, Flowable, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfgen import canvas
+from reportlab.graphics import renderPDF
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from xml.sax.saxutils import escape
+import argparse
+import hashlib
+import json
 import os
+import threading
+import time
+
+from brand_assets import draw_logo, spec_image
+from build_metrics import build_with_metrics, count_cache
+from fast_render import FastDocTemplate
+from pdf_linearize import linearize_output
+from paragraph_cache import cached_paragraph
+from search_index import PageRecorder, SearchIndex
+import font_metrics
+
+# Paragraph wrapping measures words through the cached width tables
+font_metrics.install()
 
 # Brand colors
 ELECTRIC_PURPLE = colors.HexColor('#8B5CF6')
@@ -19,6 +40,31 @@ NEON_CYAN = colors.HexColor('#06D6A0')
 DEEP_SPACE = colors.HexColor('#0F0F23')
 PEARL_WHITE = colors.HexColor('#FEFEFE')
 
+SOFT_LAVENDER = colors.HexColor('#F3EEFF')
+
+OUTPUT_DIR = "/mnt/user-data/outputs/lead-magnets"
+METRICS_LOG = os.path.join(OUTPUT_DIR, "build-metrics.jsonl")
+# Client-side search index (see search_index and js/guide-search.js)
+SEARCH_INDEX_DIR = os.path.join(OUTPUT_DIR, "search")
+
+# Usable frame width with SimpleDocTemplate's default margins and padding
+FRAME_WIDTH = letter[0] - 2 * inch - 12
+
+# Tables longer than this are laid out as LongTable, which splits in one pass
+LONG_TABLE_ROWS = 40
+
+# Printed logo width when a spec's 'logo' doesn't give a size
+LOGO_WIDTH = 1.25 * inch
+
+# Rewrite finished PDFs for fast web view (needs pikepdf or qpdf)
+LINEARIZE_OUTPUT = False
+
+# Layout engine for guides without a 'renderer' key: 'platypus', or 'fast' for
+# the direct canvas renderer (fast_render), which falls back to platypus itself
+# for stories it can't lay out
+DEFAULT_RENDERER = 'platypus'
+RENDERERS = {'platypus': SimpleDocTemplate, 'fast': FastDocTemplate}
+
 class NumberedCanvas(canvas.Canvas):
     def __init__(self, *args, **kwargs):
         canvas.Canvas.__init__(self, *args, **kwargs)
@@ -29,29 +75,37 @@ class NumberedCanvas(canvas.Canvas):
         self._startPage()
 
     def save(self):
+        started = time.perf_counter()
         num_pages = len(self._saved_page_states)
         for state in self._saved_page_states:
             self.__dict__.update(state)
             self.draw_page_number(num_pages)
             canvas.Canvas.showPage(self)
         canvas.Canvas.save(self)
+        # Read back by build_metrics
+        self.page_count = num_pages
+        self.save_seconds = time.perf_counter() - started
 
     def draw_page_number(self, page_count):
-        self.setFont("Helvetica", 9)
-        self.setFillColor(colors.grey)
-        self.drawRightString(
-            7.5 * inch, 0.5 * inch,
-            f"Page {self._pageNumber} of {page_count}"
-        )
-        # Footer branding
-        self.setFillColor(NEON_CYAN)
-        self.drawString(1 * inch, 0.5 * inch, "MindWorth AI | mindworth.ai")
+        draw_footer(self, self._pageNumber, page_count)
+
+def draw_footer(canv, page_number, page_count):
+    """Draw the page number and footer branding"""
+    canv.setFont("Helvetica", 9)
+    canv.setFillColor(colors.grey)
+    canv.drawRightString(
+        7.5 * inch, 0.5 * inch,
+        f"Page {page_number} of {page_count}"
+    )
+    # Footer branding
+    canv.setFillColor(NEON_CYAN)
+    canv.drawString(1 * inch, 0.5 * inch, "MindWorth AI | mindworth.ai")
 
-def create_header(title, subtitle):
-    """Create branded header"""
+def create_brand_styles():
+    """Build the shared paragraph style registry used by every document"""
     styles = getSampleStyleSheet()
     
-    title_style = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
         fontSize=24,
@@ -59,9 +113,9 @@ def create_header(title, subtitle):
         spaceAfter=12,
         alignment=TA_CENTER,
         fontName='Helvetica-Bold'
-    )
+    ))
     
-    subtitle_style = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'CustomSubtitle',
         parent=styles['Normal'],
         fontSize=14,
@@ -69,20 +123,18 @@ def create_header(title, subtitle):
         spaceAfter=30,
         alignment=TA_CENTER,
         fontName='Helvetica'
-    )
-    
-    elements = []
-    elements.append(Paragraph(title, title_style))
-    elements.append(Paragraph(subtitle, subtitle_style))
-    elements.append(Spacer(1, 0.3 * inch))
+    ))
     
-    return elements
-
-def create_section(section_title, items, styles):
-    """Create a section with checklist items"""
-    elements = []
+    styles.add(ParagraphStyle(
+        'PreparedFor',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=DEEP_SPACE,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Oblique'
+    ))
     
-    section_style = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'SectionTitle',
         parent=styles['Heading2'],
         fontSize=16,
@@ -90,9 +142,9 @@ def create_section(section_title, items, styles):
         spaceAfter=12,
         spaceBefore=12,
         fontName='Helvetica-Bold'
-    )
+    ))
     
-    item_style = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'ItemStyle',
         parent=styles['Normal'],
         fontSize=11,
@@ -100,954 +152,807 @@ def create_section(section_title, items, styles):
         leftIndent=20,
         spaceAfter=8,
         fontName='Helvetica'
-    )
+    ))
+    
+    styles.add(ParagraphStyle(
+        'GuideTitle',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=NEON_CYAN,
+        spaceBefore=18,
+        fontName='Helvetica-Bold'
+    ))
+    
+    styles.add(ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20))
+    
+    styles.add(ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
+                              textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
+                              spaceAfter=10, fontName='Helvetica-Bold'))
+    styles.add(ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER))
+    
+    styles.add(ParagraphStyle(
+        'TableCell',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=11,
+        textColor=DEEP_SPACE,
+        fontName='Helvetica'
+    ))
+    styles.add(ParagraphStyle(
+        'TableHeader',
+        parent=styles['TableCell'],
+        textColor=PEARL_WHITE,
+        fontName='Helvetica-Bold'
+    ))
     
-    elements.append(Paragraph(section_title, section_style))
+    return styles
+
+# Built once and shared, so identical markup in the same style hits the parse cache
+BRAND_STYLES = create_brand_styles()
+
+def create_header(title, subtitle, prepared_for=None):
+    """Create branded header, optionally personalized for a lead"""
+    styles = BRAND_STYLES
+    
+    elements = []
+    elements.append(cached_paragraph(title, styles['CustomTitle']))
+    elements.append(cached_paragraph(subtitle, styles['CustomSubtitle']))
+    if prepared_for:
+        # Unique per lead, so not worth a parse cache slot
+        elements.append(Paragraph(f"Prepared for {escape(prepared_for)}", styles['PreparedFor']))
+    elements.append(Spacer(1, 0.3 * inch))
+    
+    return elements
+
+def create_section(section_title, items, styles=BRAND_STYLES):
+    """Create a section with checklist items"""
+    elements = []
+    
+    elements.append(cached_paragraph(section_title, styles['SectionTitle']))
     
     for item in items:
+        if isinstance(item, dict):
+            elements.extend(create_block(item, styles))
+            continue
         checkbox = "☐"
-        elements.append(Paragraph(f"{checkbox} {item}", item_style))
+        elements.append(cached_paragraph(f"{checkbox} {item}", styles['ItemStyle']))
     
     elements.append(Spacer(1, 0.2 * inch))
     return elements
 
-# Lead Magnet 1: Email & Admin Automation Checklist
-def create_email_automation_checklist():
-    filename = "/mnt/user-data/outputs/lead-magnets/email-admin-automation-checklist.pdf"
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
+def create_block(block, styles=BRAND_STYLES):
+    """Create a table or chart block from a section item spec"""
+    if block['type'] == 'table':
+        flowable = create_table(block, styles)
+    elif block['type'] in ('bar_chart', 'line_chart'):
+        flowable = create_chart(block)
+    else:
+        raise ValueError(f"Unknown block type: {block['type']}")
+    # Read back by the HTML and EPUB writers in multi_format
+    flowable.block = block
+    return [flowable, Spacer(1, 0.15 * inch)]
+
+def create_table(block, styles=BRAND_STYLES):
+    """Create a branded data table; the first row is the header"""
+    cell_style = styles['TableCell']
+    header_style = styles['TableHeader']
+    
+    rows = block['rows']
+    data = [[cached_paragraph(str(cell), header_style) for cell in rows[0]]]
+    data.extend([cached_paragraph(str(cell), cell_style) for cell in row] for row in rows[1:])
+    
+    # Fixed column widths keep wrap() from measuring every cell to size columns
+    fractions = block.get('col_widths') or [1.0 / len(rows[0])] * len(rows[0])
+    col_widths = [FRAME_WIDTH * fraction for fraction in fractions]
+    
+    table_class = LongTable if len(rows) > LONG_TABLE_ROWS else Table
+    table = table_class(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), ELECTRIC_PURPLE),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [PEARL_WHITE, SOFT_LAVENDER]),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ]))
+    return table
+
+# Charts expanded to plain shapes, shared by every document in the process
+_CHART_DRAWINGS = {}
+# renderPDF sets and deletes attributes on a drawing while drawing it, so
+# server threads draw the shared drawings one at a time
+_CHART_DRAW_LOCK = threading.Lock()
+
+def chart_key(block):
+    """Stable key for a chart spec"""
+    return hashlib.sha1(json.dumps(block, sort_keys=True).encode('utf8')).hexdigest()[:16]
+
+def chart_drawing(block):
+    """Build (or fetch from cache) the vector drawing for a chart spec"""
+    key = chart_key(block)
+    drawing = _CHART_DRAWINGS.get(key)
+    count_cache('chart_drawings', drawing is not None)
+    if drawing is not None:
+        return drawing
+    
+    width = block.get('width', 5.5 * inch)
+    height = block.get('height', 2.2 * inch)
+    drawing = Drawing(width, height)
+    
+    if block['type'] == 'bar_chart':
+        chart = VerticalBarChart()
+        chart.barSpacing = 2
+        chart.groupSpacing = 10
+    else:
+        chart = HorizontalLineChart()
+        chart.joinedLines = 1
+    
+    chart.x = 40
+    chart.y = 30
+    chart.width = width - 60
+    chart.height = height - 60
+    chart.data = block['series']
+    chart.categoryAxis.categoryNames = block['categories']
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.fillColor = DEEP_SPACE
+    chart.valueAxis.valueMin = block.get('value_min', 0)
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    chart.valueAxis.gridStrokeWidth = 0.25
+    
+    series_colors = [ELECTRIC_PURPLE, NEON_CYAN, DEEP_SPACE]
+    for index in range(len(block['series'])):
+        color = series_colors[index % len(series_colors)]
+        if block['type'] == 'bar_chart':
+            chart.bars[index].fillColor = color
+            chart.bars[index].strokeColor = None
+        else:
+            chart.lines[index].strokeColor = color
+            chart.lines[index].strokeWidth = 2
+    
+    drawing.add(chart)
+    drawing.add(String(
+        width / 2, height - 14, block.get('title', ''),
+        fontName='Helvetica-Bold', fontSize=10, fillColor=ELECTRIC_PURPLE, textAnchor='middle'
+    ))
+    
+    # Expanding resolves axes, labels and bars into primitives once, so
+    # later documents only replay shapes
+    drawing = drawing.expandUserNodes()
+    _CHART_DRAWINGS[key] = drawing
+    return drawing
+
+class CachedDrawing(Flowable):
+    """Drawing emitted once per PDF as a form XObject and reused wherever it appears"""
+    
+    def __init__(self, key, drawing):
+        Flowable.__init__(self)
+        self.key = key
+        self.drawing = drawing
+        self.width = drawing.width
+        self.height = drawing.height
+        self.hAlign = 'CENTER'
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def draw(self):
+        name = f"chart{self.key}"
+        if not self.canv.hasForm(name):
+            self.canv.beginForm(name, 0, 0, self.width, self.height)
+            with _CHART_DRAW_LOCK:
+                renderPDF.draw(self.drawing, self.canv, 0, 0)
+            self.canv.endForm()
+        self.canv.doForm(name)
+
+def stack_height(flowables, width):
+    """Height of flowables stacked top to bottom, as VariantSlot draws them"""
+    height = 0
+    for index, flowable in enumerate(flowables):
+        if index:
+            height += flowable.getSpaceBefore()
+        height += flowable.wrap(width, 1e6)[1]
+        if index < len(flowables) - 1:
+            height += flowable.getSpaceAfter()
+    return height
+
+def draw_stack(canv, flowables, width, height):
+    """Draw flowables top to bottom inside a width x height box at the origin"""
+    y = height
+    for index, flowable in enumerate(flowables):
+        if index:
+            y -= flowable.getSpaceBefore()
+        y -= flowable.wrap(width, 1e6)[1]
+        flowable.drawOn(canv, 0, y)
+        y -= flowable.getSpaceAfter()
+
+class VariantSlot(Flowable):
+    """Copy drawn as a named form XObject of fixed height, so variants can swap the form alone"""
+    
+    def __init__(self, name, flowables, height):
+        Flowable.__init__(self)
+        self.name = name
+        self.flowables = flowables
+        self.height = height
+    
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        return self.width, self.height
+    
+    def draw(self):
+        name = f"slot{self.name}"
+        self.canv.beginForm(name, 0, 0, self.width, self.height)
+        draw_stack(self.canv, self.flowables, self.width, self.height)
+        self.canv.endForm()
+        self.canv.doForm(name)
+
+def create_chart(block):
+    """Create a cached bar or line chart flowable"""
+    return CachedDrawing(chart_key(block), chart_drawing(block))
+
+def create_intro(text, styles=BRAND_STYLES):
+    """Create the intro paragraph below the header"""
+    return [cached_paragraph(text, styles['Intro'])]
+
+def create_cta(cta_title, cta_text, styles=BRAND_STYLES):
+    """Create the closing call-to-action block"""
     elements = []
+    elements.append(Spacer(1, 0.3 * inch))
     
-    # Header
-    elements.extend(create_header(
-        "10 Admin Tasks You Can Automate Today",
-        "Free Checklist from MindWorth AI"
-    ))
-    
-    # Intro
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+    elements.append(cached_paragraph(cta_title, styles['CTA']))
+    elements.append(cached_paragraph(cta_text, styles['CTAText']))
+    return elements
+
+# Lead Magnet 1: Email & Admin Automation Checklist
+EMAIL_AUTOMATION_CHECKLIST = {
+    'key': 'email-checklist',
+    'filename': "email-admin-automation-checklist.pdf",
+    'title': "10 Admin Tasks You Can Automate Today",
+    'subtitle': "Free Checklist from MindWorth AI",
+    'intro': (
         "Use this checklist to identify which time-consuming tasks in your business can be automated. "
-        "Check off each item as you implement automation. Even automating 2-3 of these will save you 5+ hours per week.",
-        intro_style
-    ))
-    
-    # Section 1: Email Management
-    elements.extend(create_section(
-        "1. Email Management (Save 2-4 hours/week)",
-        [
+        "Check off each item as you implement automation. Even automating 2-3 of these will save you 5+ hours per week."
+    ),
+    'sections': [
+        ("1. Email Management (Save 2-4 hours/week)", [
             "Auto-sort incoming emails by sender, topic, or priority into folders",
             "Set up automatic forwarding rules for specific email types to team members",
             "Create email templates for common responses (reduce typing by 80%)",
             "Use scheduling tools to send emails at optimal times automatically",
-            "Set up vacation/out-of-office auto-responders with smart routing"
-        ],
-        styles
-    ))
-    
-    # Section 2: Data Entry
-    elements.extend(create_section(
-        "2. Data Entry & Processing (Save 3-5 hours/week)",
-        [
+            "Set up vacation/out-of-office auto-responders with smart routing",
+        ]),
+        ("2. Data Entry & Processing (Save 3-5 hours/week)", [
             "Extract data from emails automatically into spreadsheets or CRM",
             "Auto-populate customer information when they fill out forms",
             "Parse invoices and receipts to extract key data (amount, date, vendor)",
             "Automatically update databases when specific triggers occur",
-            "Sync data between multiple platforms (CRM, accounting, spreadsheets)"
-        ],
-        styles
-    ))
-    
-    # Section 3: Scheduling
-    elements.extend(create_section(
-        "3. Scheduling & Calendar (Save 1-3 hours/week)",
-        [
+            "Sync data between multiple platforms (CRM, accounting, spreadsheets)",
+        ]),
+        ("3. Scheduling & Calendar (Save 1-3 hours/week)", [
             "Enable self-service booking so customers can schedule without emails",
             "Send automatic meeting reminders 24 hours and 1 hour before appointments",
             "Auto-sync multiple calendars to prevent double-bookings",
             "Block buffer time between meetings automatically",
-            "Send follow-up emails after meetings with action items"
-        ],
-        styles
-    ))
-    
-    # Section 4: Follow-ups
-    elements.extend(create_section(
-        "4. Follow-Up Communications (Save 2-4 hours/week)",
-        [
+            "Send follow-up emails after meetings with action items",
+        ]),
+        ("4. Follow-Up Communications (Save 2-4 hours/week)", [
             "Create drip email campaigns that send automatically over time",
             "Set up lead nurturing sequences for new prospects",
             "Automate customer onboarding emails (welcome series)",
             "Send automatic reminders for pending tasks or overdue items",
-            "Create triggered emails based on customer actions (clicked link, viewed page)"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    # Section 5: Social Media
-    elements.extend(create_section(
-        "5. Social Media Management (Save 2-3 hours/week)",
-        [
+            "Create triggered emails based on customer actions (clicked link, viewed page)",
+        ]),
+        ("5. Social Media Management (Save 2-3 hours/week)", [
             "Schedule posts in advance for all platforms simultaneously",
             "Auto-post blog content to social channels when published",
             "Set up automatic responses to common comments or messages",
             "Create content calendars that populate automatically",
-            "Monitor mentions and get alerts for important conversations"
-        ],
-        styles
-    ))
-    
-    # Section 6: Reporting
-    elements.extend(create_section(
-        "6. Reporting & Analytics (Save 1-2 hours/week)",
-        [
+            "Monitor mentions and get alerts for important conversations",
+        ]),
+        ("6. Reporting & Analytics (Save 1-2 hours/week)", [
             "Generate weekly/monthly reports automatically from your data",
             "Create dashboards that update in real-time",
             "Send automated report emails to stakeholders on schedule",
             "Track key metrics automatically without manual spreadsheet work",
-            "Set up alerts when metrics hit certain thresholds"
-        ],
-        styles
-    ))
-    
-    # Section 7: Document Management
-    elements.extend(create_section(
-        "7. Document Management (Save 1-2 hours/week)",
-        [
+            "Set up alerts when metrics hit certain thresholds",
+        ]),
+        ("7. Document Management (Save 1-2 hours/week)", [
             "Auto-file documents to correct folders based on rules",
             "Extract text from PDFs and images automatically (OCR)",
             "Generate contracts or proposals from templates with auto-fill",
             "Create automatic backup systems for important files",
-            "Set expiration reminders for contracts or certifications"
-        ],
-        styles
-    ))
-    
-    # Section 8: Customer Support
-    elements.extend(create_section(
-        "8. Customer Support (Save 2-4 hours/week)",
-        [
+            "Set expiration reminders for contracts or certifications",
+        ]),
+        ("8. Customer Support (Save 2-4 hours/week)", [
             "Set up chatbot for common questions (24/7 availability)",
             "Auto-categorize support tickets by urgency or topic",
             "Send automatic acknowledgment emails when tickets are received",
             "Route tickets to appropriate team members automatically",
-            "Create knowledge base articles that answer FAQs automatically"
-        ],
-        styles
-    ))
-    
-    # Section 9: Financial Tasks
-    elements.extend(create_section(
-        "9. Financial Tasks (Save 1-3 hours/week)",
-        [
+            "Create knowledge base articles that answer FAQs automatically",
+        ]),
+        ("9. Financial Tasks (Save 1-3 hours/week)", [
             "Auto-generate and send invoices when work is completed",
             "Send payment reminders for overdue invoices automatically",
             "Reconcile bank transactions with accounting software",
             "Track expenses and categorize automatically",
-            "Generate financial reports on a schedule"
-        ],
-        styles
-    ))
-    
-    # Section 10: Team Coordination
-    elements.extend(create_section(
-        "10. Team Coordination (Save 1-2 hours/week)",
-        [
+            "Generate financial reports on a schedule",
+        ]),
+        ("10. Team Coordination (Save 1-2 hours/week)", [
             "Auto-assign tasks based on workload or specialty",
             "Send daily/weekly digest emails with team updates",
             "Create recurring meeting invites automatically",
             "Share project updates to Slack/Teams channels automatically",
-            "Track time and generate timesheets without manual entry"
-        ],
-        styles
-    ))
-    
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # CTA
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
-    
-    elements.append(Paragraph("Ready to Automate Your Business?", cta_style))
-    elements.append(Paragraph(
+            "Track time and generate timesheets without manual entry",
+        ]),
+    ],
+    'page_break_after': 4,
+    'cta_title': "Ready to Automate Your Business?",
+    'cta_text': (
         "Schedule a free 45-minute audit at <b>mindworth.ai</b><br/>"
-        "We'll identify your biggest time-wasters and show you exactly what we can automate.",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
-    
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
+        "We'll identify your biggest time-wasters and show you exactly what we can automate."
+    ),
+}
 
 # Lead Magnet 2: Customer Insights Guide
-def create_customer_insights_guide():
-    filename = "/mnt/user-data/outputs/lead-magnets/customer-insights-analysis-guide.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.extend(create_header(
-        "Customer Feedback Analysis Framework",
-        "Turn Reviews & Feedback into Actionable Insights"
-    ))
-    
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+CUSTOMER_INSIGHTS_GUIDE = {
+    'key': 'insights-guide',
+    'filename': "customer-insights-analysis-guide.pdf",
+    'title': "Customer Feedback Analysis Framework",
+    'subtitle': "Turn Reviews & Feedback into Actionable Insights",
+    'intro': (
         "This framework helps you systematically analyze customer feedback to uncover patterns, "
-        "identify problems, and make data-driven decisions. Use this whether analyzing manually or setting up automation.",
-        intro_style
-    ))
-    
-    elements.extend(create_section(
-        "Step 1: Collect Feedback from All Sources",
-        [
+        "identify problems, and make data-driven decisions. Use this whether analyzing manually or setting up automation."
+    ),
+    'sections': [
+        ("Step 1: Collect Feedback from All Sources", [
             "Google Reviews, Yelp, Facebook, and industry-specific review sites",
             "Support tickets and email conversations with customers",
             "Survey responses (NPS, CSAT, post-purchase surveys)",
             "Social media mentions and comments",
             "Sales call notes and lost opportunity reasons",
             "Live chat transcripts and chatbot conversations",
-            "Product return/refund request reasons"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 2: Categorize by Topic",
-        [
+            "Product return/refund request reasons",
+        ]),
+        ("Step 2: Categorize by Topic", [
             "Product/service quality issues",
             "Pricing and value perception",
             "Customer service experiences",
             "Shipping/delivery problems",
             "Website/app usability",
             "Feature requests and missing functionality",
-            "Competitor comparisons"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 3: Score Sentiment",
-        [
+            "Competitor comparisons",
+        ]),
+        ("Step 3: Score Sentiment", [
             "Rate each piece of feedback: Positive (1), Neutral (0), Negative (-1)",
             "Calculate overall sentiment score by category",
             "Track sentiment trends over time (weekly/monthly)",
             "Flag urgent negative feedback requiring immediate response",
-            "Identify your biggest fans for testimonials and case studies"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    elements.extend(create_section(
-        "Step 4: Identify Patterns & Trends",
-        [
+            "Identify your biggest fans for testimonials and case studies",
+        ]),
+        ("Step 4: Identify Patterns & Trends", [
             "Count frequency of each topic mention",
             "Look for issues mentioned across multiple channels",
             "Compare this month vs. last month for changes",
             "Segment by customer type (new vs. repeat, small vs. large)",
             "Identify seasonal patterns or campaign-related feedback",
-            "Spot emerging problems before they become major issues"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 5: Prioritize Actions",
-        [
+            "Spot emerging problems before they become major issues",
+            {
+                'type': 'bar_chart',
+                'title': "Example: Monthly Mentions by Topic",
+                'categories': ["Quality", "Pricing", "Service", "Delivery", "Usability", "Features"],
+                'series': [[42, 35, 28, 19, 14, 23], [31, 38, 22, 12, 17, 29]],
+            },
+        ]),
+        ("Step 5: Prioritize Actions", [
             "High frequency + negative sentiment = urgent priority",
             "Quick wins: easy fixes with high impact",
             "Long-term improvements: strategic initiatives",
             "Customer requests vs. internal priorities alignment",
-            "ROI calculation: cost of fix vs. customer retention value"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 6: Create Feedback Reports",
-        [
+            "ROI calculation: cost of fix vs. customer retention value",
+        ]),
+        ("Step 6: Create Feedback Reports", [
             "Weekly: Top 3 urgent issues, new patterns emerging",
             "Monthly: Sentiment trends, top topics, feature requests leaderboard",
             "Quarterly: Customer satisfaction changes, major improvements implemented",
             "Share insights with product, marketing, and leadership teams",
-            "Track action items and measure impact of changes"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Key Metrics to Track",
-        [
+            "Track action items and measure impact of changes",
+            {
+                'type': 'line_chart',
+                'title': "Example: Sentiment Score Trend (Monthly)",
+                'categories': ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+                'series': [[12, 18, 15, 24, 31, 36]],
+            },
+        ]),
+        ("Key Metrics to Track", [
             "Overall sentiment score (track monthly)",
             "Net Promoter Score (NPS) if using surveys",
             "Response time to negative reviews",
             "% of feedback actioned vs. ignored",
             "Customer churn rate correlation with feedback themes",
-            "Feature request popularity rankings"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Tools You Can Use",
-        [
+            "Feature request popularity rankings",
+            {
+                'type': 'table',
+                'col_widths': [0.34, 0.26, 0.2, 0.2],
+                'rows': [
+                    ["Metric", "Healthy Range", "Review", "Owner"],
+                    ["Overall sentiment score", "+20 or higher", "Monthly", "Marketing"],
+                    ["Net Promoter Score", "30+", "Quarterly", "Leadership"],
+                    ["Negative review response time", "Under 24 hours", "Weekly", "Support"],
+                    ["Feedback actioned", "60%+", "Monthly", "Product"],
+                    ["Churn linked to feedback themes", "Trending down", "Quarterly", "Leadership"],
+                ],
+            },
+        ]),
+        ("Tools You Can Use", [
             "Spreadsheets: Free but manual (Google Sheets templates)",
             "Review aggregators: Trustpilot, Podium, Birdeye",
             "Survey platforms: Typeform, SurveyMonkey, Google Forms",
             "AI analysis: ChatGPT, sentiment analysis APIs",
-            "Professional automation: Custom dashboards (what we build)"
-        ],
-        styles
-    ))
-    
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
-    
-    elements.append(Paragraph("Want This Automated?", cta_style))
-    elements.append(Paragraph(
+            "Professional automation: Custom dashboards (what we build)",
+        ]),
+    ],
+    'page_break_after': 3,
+    'cta_title': "Want This Automated?",
+    'cta_text': (
         "We build custom sentiment analysis dashboards that do all this automatically.<br/>"
-        "Schedule a free demo at <b>mindworth.ai</b>",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
-    
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
+        "Schedule a free demo at <b>mindworth.ai</b>"
+    ),
+}
 
 # Lead Magnet 3: Smart Scheduling Guide
-def create_scheduling_guide():
-    filename = "/mnt/user-data/outputs/lead-magnets/smart-scheduling-implementation-guide.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.extend(create_header(
-        "Smart Scheduling Implementation Guide",
-        "Eliminate Double-Bookings & No-Shows Forever"
-    ))
-    
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+SCHEDULING_GUIDE = {
+    'key': 'scheduling-guide',
+    'filename': "smart-scheduling-implementation-guide.pdf",
+    'title': "Smart Scheduling Implementation Guide",
+    'subtitle': "Eliminate Double-Bookings & No-Shows Forever",
+    'intro': (
         "Follow this step-by-step guide to implement automated scheduling in your business. "
-        "Reduce no-shows by 60%, save 5-8 hours weekly, and never miss a booking opportunity again.",
-        intro_style
-    ))
-    
-    elements.extend(create_section(
-        "Phase 1: Preparation (30 minutes)",
-        [
+        "Reduce no-shows by 60%, save 5-8 hours weekly, and never miss a booking opportunity again."
+    ),
+    'sections': [
+        ("Phase 1: Preparation (30 minutes)", [
             "List all appointment types you offer (consultations, services, meetings)",
             "Define duration for each appointment type (15min, 30min, 1hr, etc.)",
             "Identify your available hours (M-F 9am-5pm, evenings, weekends)",
             "Determine buffer time needed between appointments (5-15 minutes)",
             "Note any blackout dates or recurring unavailable times",
-            "Decide: one calendar for team or individual calendars per person"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Phase 2: Choose Your Tools (1 hour research)",
-        [
+            "Decide: one calendar for team or individual calendars per person",
+        ]),
+        ("Phase 2: Choose Your Tools (1 hour research)", [
             "Calendly: Best for simple scheduling, free plan available",
             "Acuity Scheduling: More features, $16+/month, great for service businesses",
             "Cal.com: Open-source alternative, free self-hosted option",
             "Square Appointments: Best if you also take payments",
             "SimplyBook.me: Good for teams, many integrations",
-            "Check which integrates with your current calendar (Google/Outlook)"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Phase 3: Basic Setup (2 hours)",
-        [
+            "Check which integrates with your current calendar (Google/Outlook)",
+        ]),
+        ("Phase 3: Basic Setup (2 hours)", [
             "Create account and connect to your calendar",
             "Set up each appointment type with correct duration",
             "Configure your weekly availability hours",
             "Set buffer times between appointments",
             "Add your business information and branding",
             "Create custom booking page URL (yourbusiness.calendly.com)",
-            "Test by booking a test appointment yourself"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    elements.extend(create_section(
-        "Phase 4: Customize Booking Experience (1 hour)",
-        [
+            "Test by booking a test appointment yourself",
+        ]),
+        ("Phase 4: Customize Booking Experience (1 hour)", [
             "Add intake questions customers answer when booking",
             "Customize confirmation email with your branding",
             "Set up custom booking confirmation page",
             "Add your cancellation/rescheduling policy",
             "Enable timezone detection for remote clients",
-            "Configure minimum notice period (e.g., 24 hours in advance)"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Phase 5: Implement Reminders (30 minutes)",
-        [
+            "Configure minimum notice period (e.g., 24 hours in advance)",
+        ]),
+        ("Phase 5: Implement Reminders (30 minutes)", [
             "Enable email reminders: 24 hours before appointment",
             "Set up second reminder: 1 hour before appointment",
             "Consider SMS reminders for critical appointments (reduce no-shows 30%)",
             "Customize reminder message with location/preparation instructions",
             "Include easy reschedule/cancel links in reminders",
-            "Test all reminders by booking another test appointment"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Phase 6: Distribution & Promotion (1 hour)",
-        [
+            "Test all reminders by booking another test appointment",
+        ]),
+        ("Phase 6: Distribution & Promotion (1 hour)", [
             "Add booking button to your website homepage",
             "Include booking link in email signature",
             "Add to social media bios (Instagram, Facebook, LinkedIn)",
             "Create QR code for physical locations/business cards",
             "Update Google Business Profile with booking link",
-            "Train team on how to share booking link with customers"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Phase 7: Advanced Features (Optional)",
-        [
+            "Train team on how to share booking link with customers",
+        ]),
+        ("Phase 7: Advanced Features (Optional)", [
             "Payment collection: Require deposit or full payment when booking",
             "Team scheduling: Round-robin or priority-based assignment",
             "Waitlist: Auto-fill cancellations from waitlist",
             "Group bookings: Classes or multi-person appointments",
             "Package deals: Series of appointments or bundles",
-            "Zapier integration: Connect to CRM, send to Slack, etc."
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Common Mistakes to Avoid",
-        [
+            "Zapier integration: Connect to CRM, send to Slack, etc.",
+        ]),
+        ("Common Mistakes to Avoid", [
             "Making booking process too long (keep to 3 steps max)",
             "Asking too many questions during booking (get details later)",
             "Not testing on mobile devices (50%+ of bookings are mobile)",
             "Forgetting to block personal time/vacations",
             "Setting availability too far in future (30-60 days is optimal)",
-            "No cancellation policy = lots of last-minute cancellations"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Measure Success: Track These Metrics",
-        [
+            "No cancellation policy = lots of last-minute cancellations",
+        ]),
+        ("Measure Success: Track These Metrics", [
             "% of appointments booked online vs. phone/email",
             "No-show rate before and after reminders",
             "Time saved on scheduling coordination weekly",
             "After-hours bookings captured",
-            "Average time from inquiry to scheduled appointment"
-        ],
-        styles
-    ))
-    
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
-    
-    elements.append(Paragraph("Need Help Setting This Up?", cta_style))
-    elements.append(Paragraph(
+            "Average time from inquiry to scheduled appointment",
+        ]),
+    ],
+    'page_break_after': 3,
+    'cta_title': "Need Help Setting This Up?",
+    'cta_text': (
         "We handle the entire implementation for you—from setup to training.<br/>"
-        "Schedule a free assessment at <b>mindworth.ai</b>",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
-    
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
-
-# Generate all PDFs
-def generate_all_lead_magnets():
-    print("Generating MindWorth AI Lead Magnets...")
-    
-    pdfs = []
-    
-    print("1/6 Creating Email & Admin Automation Checklist...")
-    pdfs.append(create_email_automation_checklist())
-    
-    print("2/6 Creating Customer Insights Analysis Guide...")
-    pdfs.append(create_customer_insights_guide())
-    
-    print("3/6 Creating Smart Scheduling Implementation Guide...")
-    pdfs.append(create_scheduling_guide())
-    
-    # Create simple versions for remaining 3 services
-    print("4/6 Creating Sales Follow-Up Playbook...")
-    pdfs.append(create_sales_followup_playbook())
-    
-    print("5/6 Creating Document Processing Blueprint...")
-    pdfs.append(create_document_processing_blueprint())
-    
-    print("6/6 Creating AI Content Creation Playbook...")
-    pdfs.append(create_content_creation_playbook())
-    
-    print("\n✅ All lead magnets created successfully!")
-    print("\nFiles generated:")
-    for pdf in pdfs:
-        print(f"  - {pdf}")
-    
-    return pdfs
+        "Schedule a free assessment at <b>mindworth.ai</b>"
+    ),
+}
 
 # Lead Magnet 4: Sales Follow-Up Playbook
-def create_sales_followup_playbook():
-    filename = "/mnt/user-data/outputs/lead-magnets/sales-follow-up-playbook.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.extend(create_header(
-        "Sales Follow-Up Playbook",
-        "Never Lose a Lead Again: 7-Touch Email Sequence Template"
-    ))
-    
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+SALES_FOLLOWUP_PLAYBOOK = {
+    'key': 'sales-playbook',
+    'filename': "sales-follow-up-playbook.pdf",
+    'title': "Sales Follow-Up Playbook",
+    'subtitle': "Never Lose a Lead Again: 7-Touch Email Sequence Template",
+    'intro': (
         "80% of sales require 5+ follow-ups, but most businesses stop after 2. "
-        "Use this proven 7-email sequence to nurture leads systematically and increase conversion by 20-30%.",
-        intro_style
-    ))
-    
-    elements.extend(create_section(
-        "Email 1: Immediate Auto-Response (0 minutes after inquiry)",
-        [
+        "Use this proven 7-email sequence to nurture leads systematically and increase conversion by 20-30%."
+    ),
+    'sections': [
+        ("Email 1: Immediate Auto-Response (0 minutes after inquiry)", [
             "Subject: Thanks for your interest, [Name]",
             "Confirm you received their inquiry",
             "Set expectations for next steps",
             "Provide immediate value (relevant resource or guide)",
             "Include your calendar link to book a call",
-            "Keep it short (3-4 sentences max)"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email 2: Case Study/Social Proof (Day 2)",
-        [
+            "Keep it short (3-4 sentences max)",
+        ]),
+        ("Email 2: Case Study/Social Proof (Day 2)", [
             "Subject: How [Similar Company] solved [Their Problem]",
             "Share a relevant customer success story",
             "Focus on results, not features",
             "Match their industry or use case if possible",
             "Soft CTA: 'Curious if we can do the same for you?'",
-            "No hard sell—just demonstrate capability"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email 3: Value Question (Day 5)",
-        [
+            "No hard sell—just demonstrate capability",
+        ]),
+        ("Email 3: Value Question (Day 5)", [
             "Subject: Quick question about [Their Goal]",
             "Ask about their timeline or specific needs",
             "Reference something from their initial inquiry",
             "Offer to answer any questions",
             "Position yourself as a consultant, not salesperson",
-            "Open-ended question to start conversation"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email 4: Educational Content (Day 9)",
-        [
+            "Open-ended question to start conversation",
+        ]),
+        ("Email 4: Educational Content (Day 9)", [
             "Subject: [Video] See how it works in 90 seconds",
             "Share demo video, tutorial, or product walkthrough",
             "Explain one key feature or benefit clearly",
             "Make it easy to understand without jargon",
             "CTA: Schedule a personalized demo",
-            "Alternative: Share helpful blog post or guide"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    elements.extend(create_section(
-        "Email 5: Limited Offer/Urgency (Day 14)",
-        [
+            "Alternative: Share helpful blog post or guide",
+        ]),
+        ("Email 5: Limited Offer/Urgency (Day 14)", [
             "Subject: [Month] only: [Special offer]",
             "Create legitimate urgency (discount, bonus, limited slots)",
             "Highlight the benefit of acting now",
             "Include clear pricing or package details",
             "Strong CTA with deadline",
-            "Option: Feature a specific customer pain point you solve"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email 6: Final Value Add (Day 18)",
-        [
+            "Option: Feature a specific customer pain point you solve",
+        ]),
+        ("Email 6: Final Value Add (Day 18)", [
             "Subject: One more thing that might help...",
             "Share your best resource (checklist, template, tool)",
             "No strings attached—genuinely helpful",
             "Soft reminder you're available to help",
             "CTA: 'Reply if you have questions'",
-            "Position as helpful expert, not pushy salesperson"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email 7: Breakup Email (Day 21)",
-        [
+            "Position as helpful expert, not pushy salesperson",
+        ]),
+        ("Email 7: Breakup Email (Day 21)", [
             "Subject: Should I close your file?",
             "Acknowledge they might not be ready",
             "Give permission to say 'not now'",
             "Offer to check back in 3-6 months",
             "Final CTA: 'Reply if you'd like to stay in touch'",
-            "This often triggers a response from fence-sitters"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Pro Tips for Maximum Effectiveness",
-        [
+            "This often triggers a response from fence-sitters",
+        ]),
+        ("Pro Tips for Maximum Effectiveness", [
             "Personalize with their name, company, and specific pain points",
             "Sequence pauses automatically if they reply",
             "A/B test subject lines to improve open rates",
             "Send emails during business hours (9am-5pm their timezone)",
             "Track opens and clicks to identify hot leads",
             "Move engaged leads to sales call faster",
-            "Move unengaged leads to long-term nurture list"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "After the Sequence: Long-Term Nurture",
-        [
+            "Move unengaged leads to long-term nurture list",
+        ]),
+        ("After the Sequence: Long-Term Nurture", [
             "Don't delete non-responders—add to monthly newsletter",
             "Share valuable content once per month",
             "Announce new features, case studies, offers",
             "Re-engage campaign after 3-6 months",
             "Some leads need 6-12 months before they're ready",
-            "Stay top-of-mind without being annoying"
-        ],
-        styles
-    ))
-    
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
-    
-    elements.append(Paragraph("Want This Automated?", cta_style))
-    elements.append(Paragraph(
+            "Stay top-of-mind without being annoying",
+        ]),
+    ],
+    'page_break_after': 4,
+    'cta_title': "Want This Automated?",
+    'cta_text': (
         "We write, design, and automate the entire follow-up sequence for you.<br/>"
-        "Schedule a free sales audit at <b>mindworth.ai</b>",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
-    
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
+        "Schedule a free sales audit at <b>mindworth.ai</b>"
+    ),
+}
 
 # Lead Magnet 5: Document Processing Blueprint
-def create_document_processing_blueprint():
-    filename = "/mnt/user-data/outputs/lead-magnets/document-processing-blueprint.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.extend(create_header(
-        "Document Automation Blueprint",
-        "Stop Manual Data Entry: Implementation Guide + ROI Calculator"
-    ))
-    
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+DOCUMENT_PROCESSING_BLUEPRINT = {
+    'key': 'document-blueprint',
+    'filename': "document-processing-blueprint.pdf",
+    'title': "Document Automation Blueprint",
+    'subtitle': "Stop Manual Data Entry: Implementation Guide + ROI Calculator",
+    'intro': (
         "Manual data entry from invoices, receipts, and forms wastes 10-20 hours weekly for most businesses. "
-        "This guide shows you how to automate document processing with 95%+ accuracy.",
-        intro_style
-    ))
-    
-    elements.extend(create_section(
-        "Step 1: Audit Your Document Types",
-        [
+        "This guide shows you how to automate document processing with 95%+ accuracy."
+    ),
+    'sections': [
+        ("Step 1: Audit Your Document Types", [
             "List all documents you manually process (invoices, receipts, forms, contracts)",
             "Estimate volume per month for each type",
             "Calculate time spent per document (avg 5-10 minutes)",
             "Identify which data fields you extract (vendor, date, amount, line items)",
             "Note which software you enter data into (QuickBooks, Excel, CRM)",
-            "Prioritize by volume × time = biggest time sink first"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 2: Calculate Your ROI",
-        [
+            "Prioritize by volume × time = biggest time sink first",
+        ]),
+        ("Step 2: Calculate Your ROI", [
             "Documents per month: _______",
             "Minutes per document: _______",
             "Total hours monthly: _______ (multiply above)",
             "Hourly cost (salary/rate): $_______",
             "Monthly cost of manual entry: $_______ ",
             "Annual cost: $_______ (monthly × 12)",
-            "Automation ROI payback: 2-6 months typically"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 3: Choose Your Processing Method",
-        [
+            "Automation ROI payback: 2-6 months typically",
+        ]),
+        ("Step 3: Choose Your Processing Method", [
             "Basic OCR: Google Cloud Vision, AWS Textract ($1-3 per 1000 docs)",
             "Smart extraction: GPT-4 API for complex documents ($5-10 per 1000)",
             "Pre-built tools: Rossum, Docsumo, Nanonets (subscription-based)",
             "Full automation: Custom solution (what we build) ($3K-6K setup)",
             "Hybrid: Manual review queue for uncertain extractions",
-            "Consider volume, accuracy needs, and integration requirements"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    elements.extend(create_section(
-        "Step 4: Prepare Your Documents",
-        [
+            "Consider volume, accuracy needs, and integration requirements",
+        ]),
+        ("Step 4: Prepare Your Documents", [
             "Scan quality: 300+ DPI for best OCR accuracy",
             "File format: PDF preferred, JPG/PNG acceptable",
             "Organize samples: Collect 20-50 examples of each document type",
             "Note variations: Different layouts, formats, languages",
             "Clean scans: Remove shadows, straighten images, ensure legibility",
-            "Consistent naming: invoice_vendor_date.pdf for easy identification"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 5: Set Up Processing Workflow",
-        [
+            "Consistent naming: invoice_vendor_date.pdf for easy identification",
+        ]),
+        ("Step 5: Set Up Processing Workflow", [
             "Upload method: Email forwarding, Dropbox folder, or mobile scan app",
             "Processing trigger: Automatic when document arrives",
             "Extraction: AI reads document and pulls data fields",
             "Validation: Check for completeness and data quality",
             "Human review: Flag uncertain extractions (confidence <90%)",
             "Integration: Push data to destination (QuickBooks, Excel, database)",
-            "Archive: Store original document securely"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Step 6: Train & Validate",
-        [
+            "Archive: Store original document securely",
+        ]),
+        ("Step 6: Train & Validate", [
             "Test with 50-100 real documents from your business",
             "Measure accuracy: Target 95%+ for standard fields",
             "Identify problem areas: Handwriting, poor quality, unusual formats",
             "Refine extraction rules based on test results",
             "Create validation rules (amounts must be >0, dates logical, etc.)",
-            "Set up quality checks and error alerts"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Common Document Types & Accuracy Rates",
-        [
+            "Set up quality checks and error alerts",
+        ]),
+        ("Common Document Types & Accuracy Rates", [
             "Invoices (printed): 95-98% accuracy on key fields",
             "Receipts (printed): 90-95% accuracy (varies by format)",
             "Forms (typed): 98%+ accuracy on checkboxes and text",
             "Forms (handwritten): 60-85% depending on legibility",
             "Contracts (PDF): 95%+ for standard clauses and dates",
             "Business cards: 90-95% for contact information",
-            "IDs/Licenses: 95%+ when properly scanned"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Data Fields You Can Extract",
-        [
+            "IDs/Licenses: 95%+ when properly scanned",
+        ]),
+        ("Data Fields You Can Extract", [
             "Invoice: Vendor, invoice #, date, due date, line items, subtotal, tax, total",
             "Receipt: Merchant, date, time, items, amounts, payment method",
             "Form: All text fields, checkboxes, signatures (as images)",
             "Contract: Parties, dates, terms, renewal clauses, payment terms",
             "W-9/Tax Forms: Name, EIN/SSN, address, business type",
-            "Purchase Order: PO#, vendor, items, quantities, prices"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Integration Destinations",
-        [
+            "Purchase Order: PO#, vendor, items, quantities, prices",
+        ]),
+        ("Integration Destinations", [
             "Accounting: QuickBooks, Xero, FreshBooks, Sage",
             "Spreadsheets: Excel, Google Sheets, Airtable",
             "Databases: MySQL, PostgreSQL, MongoDB",
             "CRM: Salesforce, HubSpot, Pipedrive",
             "ERP: NetSuite, Odoo, SAP",
-            "Custom: API connections to proprietary systems"
-        ],
-        styles
-    ))
-    
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
-    
-    elements.append(Paragraph("Ready to Eliminate Data Entry?", cta_style))
-    elements.append(Paragraph(
+            "Custom: API connections to proprietary systems",
+        ]),
+    ],
+    'page_break_after': 3,
+    'cta_title': "Ready to Eliminate Data Entry?",
+    'cta_text': (
         "Send us your documents and we'll show you exactly what we can extract.<br/>"
-        "Schedule a free assessment at <b>mindworth.ai</b>",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
-    
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
+        "Schedule a free assessment at <b>mindworth.ai</b>"
+    ),
+}
 
 # Lead Magnet 6: Content Creation Playbook
-def create_content_creation_playbook():
-    filename = "/mnt/user-data/outputs/lead-magnets/content-creation-playbook.pdf"
-    
-    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    elements.extend(create_header(
-        "AI Content Creation Playbook",
-        "50+ Prompts & Templates for Marketing Content"
-    ))
-    
-    intro_style = ParagraphStyle('Intro', parent=styles['Normal'], fontSize=11, spaceAfter=20)
-    elements.append(Paragraph(
+CONTENT_CREATION_PLAYBOOK = {
+    'key': 'checklist',
+    'filename': "content-creation-playbook.pdf",
+    'title': "AI Content Creation Playbook",
+    'subtitle': "50+ Prompts & Templates for Marketing Content",
+    'intro': (
         "Stop staring at blank pages. Use these AI prompts to generate marketing content 10x faster. "
-        "Each prompt produces professional first drafts you can edit in minutes instead of writing for hours.",
-        intro_style
-    ))
-    
-    elements.extend(create_section(
-        "How to Use These Prompts Effectively",
-        [
+        "Each prompt produces professional first drafts you can edit in minutes instead of writing for hours."
+    ),
+    'sections': [
+        ("How to Use These Prompts Effectively", [
             "Replace [BRACKETS] with your specific information",
             "Add context about your brand voice (professional, casual, technical)",
             "Include examples of your best past content",
             "Request multiple variations (ask for 5 options)",
             "Always edit AI output—treat it as a first draft",
             "Test different prompts to see what works best",
-            "Save successful prompts as templates for reuse"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Social Media Post Prompts",
-        [
+            "Save successful prompts as templates for reuse",
+        ]),
+        ("Social Media Post Prompts", [
             "LinkedIn thought leadership: 'Write a LinkedIn post about [TOPIC] that positions me as an expert. Include a hook, 3 key points, and a question to drive engagement.'",
             "Problem-solution post: 'Create a social post about how [YOUR SERVICE] solves [CUSTOMER PAIN POINT]. Start with the problem, then introduce the solution.'",
             "Behind-the-scenes: 'Write a casual post showing [BEHIND SCENES MOMENT] that humanizes my brand and connects with audience.'",
             "Carousel content: 'Create an 8-slide carousel about [TOPIC]. Each slide should have a headline and 2-3 bullet points.'",
-            "Engagement post: 'Write a short post that asks my audience about [QUESTION]. Make it conversational and encourage comments.'"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Email Marketing Prompts",
-        [
+            "Engagement post: 'Write a short post that asks my audience about [QUESTION]. Make it conversational and encourage comments.'",
+        ]),
+        ("Email Marketing Prompts", [
             "Newsletter: 'Write a weekly newsletter for [AUDIENCE]. Include: 1) Hook about [TOPIC], 2) Main insight, 3) Practical tip, 4) CTA to [ACTION].'",
             "Promotional campaign: 'Create a 3-email sequence promoting [PRODUCT/SERVICE]. Email 1: Problem awareness, Email 2: Solution benefits, Email 3: Limited offer.'",
             "Subject lines: 'Generate 10 email subject lines for [CONTENT/OFFER]. Focus on curiosity, urgency, and benefit. Keep under 50 characters.'",
             "Re-engagement: 'Write an email to win back inactive subscribers. Acknowledge absence, offer value, give option to unsubscribe gracefully.'",
-            "Welcome series: 'Create email #2 of a welcome series. Introduce [KEY BENEFIT], share customer story, guide to getting started.'"
-        ],
-        styles
-    ))
-    
-    elements.append(PageBreak())
-    
-    elements.extend(create_section(
-        "Blog Post & Long-Form Prompts",
-        [
+            "Welcome series: 'Create email #2 of a welcome series. Introduce [KEY BENEFIT], share customer story, guide to getting started.'",
+        ]),
+        ("Blog Post & Long-Form Prompts", [
             "Outline first: 'Create a detailed outline for a blog post about [TOPIC]. Include introduction, 5 main sections with subpoints, and conclusion.'",
             "Introduction: 'Write an engaging introduction for a blog post about [TOPIC]. Hook the reader, state the problem, preview the solution.'",
             "Expand sections: 'Write 300 words expanding on this point: [COPY OUTLINE POINT]. Include examples and actionable advice.'",
             "How-to guide: 'Write a step-by-step guide on [PROCESS]. Make it beginner-friendly with clear instructions for each step.'",
-            "Listicle: 'Create a list-based article: \"[NUMBER] Ways to [ACHIEVE GOAL]\". Each item should have a headline, description, and example.'"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Ad Copy & Sales Prompts",
-        [
+            "Listicle: 'Create a list-based article: \"[NUMBER] Ways to [ACHIEVE GOAL]\". Each item should have a headline, description, and example.'",
+        ]),
+        ("Ad Copy & Sales Prompts", [
             "Google Ads: 'Write 5 Google ad headlines (30 chars max) and 3 descriptions (90 chars max) for [PRODUCT/SERVICE]. Focus on benefits.'",
             "Facebook Ads: 'Create Facebook ad primary text, headline, and description for [OFFER]. Target audience: [DEMOGRAPHIC]. Address their pain point: [PROBLEM].'",
             "Landing page hero: 'Write a compelling headline and subheadline for a landing page selling [PRODUCT]. Focus on the main benefit and outcome.'",
             "Sales email: 'Write a sales email to [TARGET PERSON] introducing [SOLUTION]. Use the AIDA framework: Attention, Interest, Desire, Action.'",
-            "Product description: 'Write a product description for [PRODUCT]. Include features, benefits, who it's for, and what problem it solves.'"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Video Script & Multimedia Prompts",
-        [
+            "Product description: 'Write a product description for [PRODUCT]. Include features, benefits, who it's for, and what problem it solves.'",
+        ]),
+        ("Video Script & Multimedia Prompts", [
             "YouTube intro: 'Write a 30-second video intro hook for a video about [TOPIC]. Grab attention and explain what viewers will learn.'",
             "Explainer script: 'Create a 90-second explainer video script for [PRODUCT/SERVICE]. Problem → Solution → How It Works → CTA.'",
             "Short-form video: 'Write a 15-second TikTok/Reel script about [TOPIC]. Start with a hook, deliver value quickly, end with engagement question.'",
             "Podcast outline: 'Create an outline for a 30-minute podcast episode about [TOPIC]. Include intro, 3 main segments with talking points, outro.'",
-            "Webinar slides: 'Outline 15 slides for a webinar on [TOPIC]. Each slide should have a headline and 3-5 bullet points.'"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Content Repurposing Prompts",
-        [
+            "Webinar slides: 'Outline 15 slides for a webinar on [TOPIC]. Each slide should have a headline and 3-5 bullet points.'",
+        ]),
+        ("Content Repurposing Prompts", [
             "Blog to social: 'Take this blog post [PASTE TEXT] and create 5 social media posts highlighting different key points.'",
             "Long to short: 'Summarize this article [PASTE] into a 3-sentence LinkedIn post with a hook.'",
             "Transcript to article: 'Convert this video transcript [PASTE] into a structured blog post with headers and sections.'",
             "Email to thread: 'Turn this email newsletter [PASTE] into a Twitter/X thread with 8-10 tweets.'",
-            "Case study to carousel: 'Transform this case study [PASTE] into a 10-slide carousel format for Instagram/LinkedIn.'"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Brand Voice Training Prompt",
-        [
+            "Case study to carousel: 'Transform this case study [PASTE] into a 10-slide carousel format for Instagram/LinkedIn.'",
+        ]),
+        ("Brand Voice Training Prompt", [
             "Use this prompt first to teach AI your voice:",
             "'Here are 3 examples of my best content: [PASTE EXAMPLES]",
             "Analyze the writing style, tone, and voice. Then rewrite the following content to match that same style: [NEW CONTENT]'",
             "This trains the AI on YOUR specific voice patterns",
             "Save this as a custom instruction in ChatGPT",
-            "Reference it at start of future content creation sessions"
-        ],
-        styles
-    ))
-    
-    elements.extend(create_section(
-        "Quality Control Checklist",
-        [
+            "Reference it at start of future content creation sessions",
+        ]),
+        ("Quality Control Checklist", [
             "Read AI output carefully—it may include false facts or generic statements",
             "Fact-check any statistics, dates, or specific claims",
             "Remove buzzwords and corporate jargon (leverage, synergy, paradigm)",
@@ -1055,26 +960,162 @@ def create_content_creation_playbook():
             "Ensure brand voice consistency across all content",
             "Check tone matches platform (LinkedIn ≠ TikTok)",
             "Verify CTAs are clear and aligned with business goals",
-            "Run through grammar/spell checker before publishing"
-        ],
-        styles
-    ))
+            "Run through grammar/spell checker before publishing",
+        ]),
+    ],
+    'page_break_after': 3,
+    'cta_title': "Want Custom Content Templates?",
+    'cta_text': (
+        "We build custom GPT models trained on YOUR brand voice with personalized templates.<br/>"
+        "Schedule a free content audit at <b>mindworth.ai</b>"
+    ),
+}
+
+GUIDE_SPECS = [
+    EMAIL_AUTOMATION_CHECKLIST,
+    CUSTOMER_INSIGHTS_GUIDE,
+    SCHEDULING_GUIDE,
+    SALES_FOLLOWUP_PLAYBOOK,
+    DOCUMENT_PROCESSING_BLUEPRINT,
+    CONTENT_CREATION_PLAYBOOK,
+]
+
+def get_guide_spec(key):
+    """Look up a guide spec by its PDF_DOWNLOADS key"""
+    for spec in GUIDE_SPECS:
+        if spec['key'] == key:
+            return spec
+    raise KeyError(f"Unknown lead magnet: {key}")
+
+def iter_guide_elements(spec, styles=BRAND_STYLES, prepared_for=None, slot_heights=None):
+    """Yield the flowables for a guide spec one section at a time
+
+    slot_heights maps 'intro' and/or 'cta' to a reserved height; those
+    blocks are then drawn as VariantSlot forms (see pdf_variants).
+    """
+    slot_heights = slot_heights or {}
+    yield from create_header(spec['title'], spec['subtitle'], prepared_for)
+    cover = spec_image(spec, 'cover_image', FRAME_WIDTH)
+    if cover:
+        yield Image(cover.path, cover.width, cover.height)
+        yield Spacer(1, 0.3 * inch)
+    intro = create_intro(spec['intro'], styles)
+    if 'intro' in slot_heights:
+        intro = [VariantSlot('intro', intro, slot_heights['intro'])]
+    yield from intro
+    
+    for index, (section_title, items) in enumerate(spec['sections']):
+        if index == spec.get('page_break_after'):
+            yield PageBreak()
+        yield from create_section(section_title, items, styles)
+    
+    cta = create_cta(spec['cta_title'], spec['cta_text'], styles)
+    if 'cta' in slot_heights:
+        cta = [VariantSlot('cta', cta, slot_heights['cta'])]
+    yield from cta
+
+def create_guide_elements(spec, styles=BRAND_STYLES, prepared_for=None, slot_heights=None):
+    """Create the flowables for a guide spec"""
+    return list(iter_guide_elements(spec, styles, prepared_for, slot_heights))
+
+def build_guide(spec, filename=None, prepared_for=None, metrics_log=METRICS_LOG, linearize=LINEARIZE_OUTPUT,
+                slot_heights=None, flowables=None, search_index=None):
+    """Build a guide spec into a branded PDF (a path or file-like object)
+
+    flowables is an already created story for the spec (see multi_format);
+    the build consumes it. search_index is a SearchIndex whose record of
+    the guide is refreshed from the pages this build lays entries out on.
+    """
+    if filename is None:
+        filename = os.path.join(OUTPUT_DIR, spec['filename'])
+    if isinstance(filename, str):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    doc_template = RENDERERS[spec.get('renderer', DEFAULT_RENDERER)]
+    doc = doc_template(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
+    build_options = {}
+    logo = spec_image(spec, 'logo', LOGO_WIDTH)
+    if logo:
+        def draw_page_logo(canv, doc):
+            draw_logo(canv, logo, doc.pagesize[1], doc.topMargin)
+        build_options = {'onFirstPage': draw_page_logo, 'onLaterPages': draw_page_logo}
+    if flowables is None:
+        make_flowables = lambda: create_guide_elements(spec, prepared_for=prepared_for, slot_heights=slot_heights)
+    else:
+        make_flowables = lambda: flowables
+    if search_index is not None:
+        recorder = PageRecorder()
+        doc.afterFlowable = lambda flowable: recorder(flowable, doc.page)
+    build_with_metrics(spec['key'], doc, make_flowables, NumberedCanvas, filename, metrics_log=metrics_log,
+                       post_process=linearize_output if linearize else None, **build_options)
+    if search_index is not None:
+        search_index.update(spec, recorder.placed)
+    return filename
+
+def create_email_automation_checklist(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = EMAIL_AUTOMATION_CHECKLIST
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+def create_customer_insights_guide(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = CUSTOMER_INSIGHTS_GUIDE
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+def create_scheduling_guide(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = SCHEDULING_GUIDE
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+def create_sales_followup_playbook(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = SALES_FOLLOWUP_PLAYBOOK
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+def create_document_processing_blueprint(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = DOCUMENT_PROCESSING_BLUEPRINT
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+def create_content_creation_playbook(linearize=LINEARIZE_OUTPUT, search_index=None, output_dir=OUTPUT_DIR):
+    spec = CONTENT_CREATION_PLAYBOOK
+    return build_guide(spec, os.path.join(output_dir, spec['filename']), linearize=linearize, search_index=search_index)
+
+# Generate all PDFs
+def generate_all_lead_magnets(linearize=LINEARIZE_OUTPUT, search_index_dir=SEARCH_INDEX_DIR, output_dir=OUTPUT_DIR):
+    print("Generating MindWorth AI Lead Magnets...")
     
-    elements.append(Spacer(1, 0.3 * inch))
+    pdfs = []
+    search_index = SearchIndex(search_index_dir) if search_index_dir else None
     
-    cta_style = ParagraphStyle('CTA', parent=styles['Normal'], fontSize=12, 
-                               textColor=ELECTRIC_PURPLE, alignment=TA_CENTER,
-                               spaceAfter=10, fontName='Helvetica-Bold')
+    print("1/6 Creating Email & Admin Automation Checklist...")
+    pdfs.append(create_email_automation_checklist(linearize, search_index, output_dir))
     
-    elements.append(Paragraph("Want Custom Content Templates?", cta_style))
-    elements.append(Paragraph(
-        "We build custom GPT models trained on YOUR brand voice with personalized templates.<br/>"
-        "Schedule a free content audit at <b>mindworth.ai</b>",
-        ParagraphStyle('CTAText', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)
-    ))
+    print("2/6 Creating Customer Insights Analysis Guide...")
+    pdfs.append(create_customer_insights_guide(linearize, search_index, output_dir))
     
-    doc.build(elements, canvasmaker=NumberedCanvas)
-    return filename
+    print("3/6 Creating Smart Scheduling Implementation Guide...")
+    pdfs.append(create_scheduling_guide(linearize, search_index, output_dir))
+    
+    # Create simple versions for remaining 3 services
+    print("4/6 Creating Sales Follow-Up Playbook...")
+    pdfs.append(create_sales_followup_playbook(linearize, search_index, output_dir))
+    
+    print("5/6 Creating Document Processing Blueprint...")
+    pdfs.append(create_document_processing_blueprint(linearize, search_index, output_dir))
+    
+    print("6/6 Creating AI Content Creation Playbook...")
+    pdfs.append(create_content_creation_playbook(linearize, search_index, output_dir))
+    if search_index is not None:
+        search_index.save()
+    
+    print("\n✅ All lead magnets created successfully!")
+    print("\nFiles generated:")
+    for pdf in pdfs:
+        print(f"  - {pdf}")
+    
+    return pdfs
 
 if __name__ == "__main__":
-    generate_all_lead_magnets()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the MindWorth AI lead magnet PDFs")
+    parser.add_argument('--linearize', action='store_true', help="write linearized (fast web view) PDFs")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help="where to write the PDFs, with the search index in its search/ directory "
+                             "(the site serves lead-magnets/)")
+    args = parser.parse_args()
+    generate_all_lead_magnets(args.linearize, os.path.join(args.output_dir, "search"), args.output_dir)
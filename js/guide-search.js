@@ -0,0 +1,234 @@
+/* MindWorth Solutions - Guide Search */
+/* Searches the lead magnet guides from the prebuilt index written by
+   search_index.py (lead-magnets/search/). The small manifest is fetched when
+   the search box gets focus; after that a query fetches only the term shards
+   for the first two letters of its words, and queries run in the browser
+   with no server.
+
+   Markup:
+     <input type="search" data-guide-search="guideSearchResults" placeholder="Search the guides">
+     <ol id="guideSearchResults"></ol>
+*/
+
+// ============================================================================
+// CONFIGURATION
+// ============================================================================
+const GUIDE_SEARCH_CONFIG = {
+    indexDir: 'search',
+    maxResults: 12,
+    minQueryLength: 2,
+    // Must match PREFIX_LENGTH in search_index.py
+    prefixLength: 2
+};
+
+// Must match STOP_WORDS and tokenize() in search_index.py
+const GUIDE_SEARCH_STOP_WORDS = new Set(
+    'a an and are as at be by can for from how in into is it its of on or that the this to with you your'.split(' ')
+);
+
+const GUIDE_SEARCH_SECTION = 0;
+
+function guideSearchBaseDir() {
+    return window.location.pathname.includes('/pages/') ? '../lead-magnets' : 'lead-magnets';
+}
+
+function guideSearchTokens(text) {
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(token => !GUIDE_SEARCH_STOP_WORDS.has(token));
+}
+
+function guideSearchIndexUrl() {
+    return `${guideSearchBaseDir()}/${GUIDE_SEARCH_CONFIG.indexDir}`;
+}
+
+// ============================================================================
+// Lazy Index Loading
+// ============================================================================
+let guideSearchManifest = null;
+const guideSearchShards = new Map();
+
+function loadGuideSearchManifest() {
+    if (!guideSearchManifest) {
+        guideSearchManifest = fetch(`${guideSearchIndexUrl()}/manifest.json`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Search index unavailable (${response.status})`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                // Let the next keystroke try again
+                guideSearchManifest = null;
+                throw error;
+            });
+    }
+    return guideSearchManifest;
+}
+
+function loadGuideSearchShard(manifest, prefix) {
+    const hash = manifest.shards[prefix];
+    if (!hash) {
+        // No indexed word starts with these letters
+        return Promise.resolve(null);
+    }
+    if (!guideSearchShards.has(prefix)) {
+        // The content hash busts stale cached shards after a rebuild
+        const shard = fetch(`${guideSearchIndexUrl()}/terms/${prefix}.json?v=${hash}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Search shard unavailable (${response.status})`);
+                }
+                return response.json();
+            })
+            .then(data => Object.assign(data, { termList: Object.keys(data.terms) }))
+            .catch(error => {
+                guideSearchShards.delete(prefix);
+                throw error;
+            });
+        guideSearchShards.set(prefix, shard);
+    }
+    return guideSearchShards.get(prefix);
+}
+
+// ============================================================================
+// Query
+// ============================================================================
+function parseGuideQuery(query) {
+    const tokens = guideSearchTokens(query);
+    // The last word is still being typed, so it matches as a prefix
+    const prefixAt = /[a-z0-9]$/i.test(query) ? tokens.length - 1 : -1;
+    // Until it is long enough to pick its shard, it is left out
+    if (prefixAt >= 0 && tokens[prefixAt].length < GUIDE_SEARCH_CONFIG.prefixLength) {
+        return { tokens: tokens.slice(0, prefixAt), prefixAt: -1 };
+    }
+    return { tokens: tokens, prefixAt: prefixAt };
+}
+
+function loadShardsForQuery(parsed) {
+    return loadGuideSearchManifest().then(manifest => {
+        const prefixes = Array.from(new Set(
+            parsed.tokens.map(token => token.slice(0, GUIDE_SEARCH_CONFIG.prefixLength))
+        ));
+        return Promise.all(prefixes.map(prefix => loadGuideSearchShard(manifest, prefix)))
+            .then(shards => ({
+                manifest: manifest,
+                shards: new Map(prefixes.map((prefix, index) => [prefix, shards[index]]))
+            }));
+    });
+}
+
+function matchingEntries(shard, token, prefix) {
+    if (!shard) {
+        return [];
+    }
+    if (!prefix) {
+        return shard.terms[token] || [];
+    }
+    const matches = new Set();
+    shard.termList.forEach(term => {
+        if (term.startsWith(token)) {
+            shard.terms[term].forEach(entry => matches.add(entry));
+        }
+    });
+    return Array.from(matches);
+}
+
+function searchGuides(index, parsed) {
+    const { tokens, prefixAt } = parsed;
+    if (!tokens.length) {
+        return [];
+    }
+    const shardFor = token => index.shards.get(token.slice(0, GUIDE_SEARCH_CONFIG.prefixLength));
+
+    let hits = null;
+    tokens.forEach((token, position) => {
+        const entries = new Set(matchingEntries(shardFor(token), token, position === prefixAt));
+        hits = hits === null ? entries : new Set([...hits].filter(entry => entries.has(entry)));
+    });
+
+    if (!hits.size) {
+        return [];
+    }
+    // Every hit is in the first word's shard, which carries the entries its terms point to
+    const entries = shardFor(tokens[0]).entries;
+    const results = [...hits].map(entryId => {
+        const [kind, section, page, text] = entries[entryId];
+        const guide = index.manifest.guides[entryId.split(':')[0]];
+        return {
+            guide: guide.title,
+            pdf: guide.pdf,
+            text: text,
+            page: page,
+            section: section,
+            // Section titles first, then items in reading order
+            rank: (kind === GUIDE_SEARCH_SECTION ? 0 : 1)
+        };
+    });
+    results.sort((a, b) => a.rank - b.rank);
+    return results.slice(0, GUIDE_SEARCH_CONFIG.maxResults);
+}
+
+// ============================================================================
+// Search Box
+// ============================================================================
+function renderGuideResults(list, results, query) {
+    list.innerHTML = '';
+    if (!results.length) {
+        const empty = document.createElement('li');
+        empty.className = 'guide-search-empty';
+        empty.textContent = `No guide sections match "${query}"`;
+        list.appendChild(empty);
+        return;
+    }
+    results.forEach(result => {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+        // PDF viewers open at the page given in the fragment
+        link.href = `${guideSearchBaseDir()}/${result.pdf}` + (result.page ? `#page=${result.page}` : '');
+        link.target = '_blank';
+        link.rel = 'noopener';
+        link.textContent = result.text;
+
+        const source = document.createElement('span');
+        source.className = 'guide-search-source';
+        source.textContent = result.page ? ` ${result.guide}, p. ${result.page}` : ` ${result.guide}`;
+
+        item.appendChild(link);
+        item.appendChild(source);
+        list.appendChild(item);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-guide-search]').forEach(input => {
+        const list = document.getElementById(input.dataset.guideSearch);
+        if (!list) {
+            return;
+        }
+        list.setAttribute('aria-live', 'polite');
+
+        // Fetch the manifest as soon as the visitor heads for the box
+        input.addEventListener('focus', () => loadGuideSearchManifest().catch(() => {}), { once: true });
+
+        input.addEventListener('input', function() {
+            const query = input.value.trim();
+            if (query.length < GUIDE_SEARCH_CONFIG.minQueryLength) {
+                list.innerHTML = '';
+                return;
+            }
+            const parsed = parseGuideQuery(query);
+            if (!parsed.tokens.length) {
+                // Only stop words (or a word too short to search yet): nothing to show
+                list.innerHTML = '';
+                return;
+            }
+            loadShardsForQuery(parsed)
+                .then(index => {
+                    // Ignore answers to queries the visitor has already typed past
+                    if (input.value.trim() === query) {
+                        renderGuideResults(list, searchGuides(index, parsed), query);
+                    }
+                })
+                .catch(error => console.error('Guide search error:', error));
+        });
+    });
+});
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Layout Check
+Dry run of a guide's page layout: flowables are wrapped and split into
+frames exactly as a build places them, but nothing is drawn or written.
+Reports the page count, the pages each section spans, widows, headings
+stranded at the bottom of a page and manual page breaks that no longer do
+anything.
+
+    python layout_check.py                     every guide
+    python layout_check.py sales-playbook --json
+    python layout_check.py --quiz answers.json the playbook for quiz answers
+"""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import Frame, KeepTogether, PageBreak, Paragraph, SimpleDocTemplate, Spacer
+from reportlab.platypus.doctemplate import ActionFlowable, BaseDocTemplate, LayoutError
+import argparse
+import json
+import time
+
+from generate_lead_magnets import GUIDE_SPECS, VariantSlot, create_guide_elements, get_guide_spec
+
+# Paragraph roles that open a section of the report
+SECTION_ROLES = ('SectionTitle', 'GuideTitle', 'CTA')
+CTA_SECTION = "Call to action"
+
+
+def _skip_draw(*args, **kwargs):
+    pass
+
+
+class MeasuringFrame(Frame):
+    """Frame that places flowables without drawing them"""
+
+    def measure(self, flowable, trySplit=0):
+        # Frame._add does the placement arithmetic, then draws; the draw is skipped
+        flowable.drawOn = _skip_draw
+        try:
+            return Frame._add(self, flowable, None, trySplit)
+        finally:
+            del flowable.drawOn
+
+    def remaining(self):
+        return self._y - self._y1p
+
+
+def flowable_role(flowable):
+    """Paragraph style name (or slot name) that says what part of a guide a flowable is"""
+    flowable = getattr(flowable, 'flowable', flowable)  # playbook Preflowed wrappers
+    if isinstance(flowable, VariantSlot):
+        return 'CTA' if flowable.name == 'cta' else flowable.name
+    if isinstance(flowable, Paragraph):
+        return flowable.style.name
+    return None
+
+def _line_count(flowable):
+    flowable = getattr(flowable, 'flowable', flowable)
+    bl_para = getattr(flowable, 'blPara', None)
+    return len(bl_para.lines) if bl_para is not None else None
+
+def _label(flowable):
+    flowable = getattr(flowable, 'flowable', flowable)
+    if isinstance(flowable, Paragraph):
+        text = flowable.getPlainText().strip()
+        return text if len(text) <= 50 else text[:47] + '...'
+    return type(flowable).__name__
+
+
+class LayoutChecker:
+    """Lays a story out page by page the way BaseDocTemplate.handle_flowable does"""
+
+    # Reuses the document template's keepWithNext grouping as is
+    keepTogetherClass = KeepTogether
+    handle_keepWithNext = BaseDocTemplate.handle_keepWithNext
+
+    def __init__(self, on_flowable=None):
+        # on_flowable(flowable, page) is called for each placed flowable, like afterFlowable
+        self.on_flowable = on_flowable
+        # Same page geometry as build_guide and assemble_playbook
+        doc = SimpleDocTemplate(None, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
+        self.frame = MeasuringFrame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+
+    def _new_page(self):
+        self.page += 1
+        self.page_flowables = 0
+        self.frame._reset()
+
+    def _placed(self, flowable, split_from=None):
+        self.page_flowables += 1
+        if self.on_flowable is not None:
+            self.on_flowable(flowable, self.page)
+        role = flowable_role(flowable)
+        if role in SECTION_ROLES:
+            title = CTA_SECTION if role == 'CTA' else _label(flowable)
+            self.sections.append({'title': title, 'first_page': self.page, 'last_page': self.page})
+            self.heading = (title, self.page) if role != 'CTA' else None
+        else:
+            if self.sections:
+                self.sections[-1]['last_page'] = self.page
+            if self.heading and not isinstance(flowable, Spacer):
+                title, page = self.heading
+                if page != self.page:
+                    self.warnings.append(f"heading '{title}' is alone at the bottom of page {page}")
+                self.heading = None
+
+        if split_from is not None:
+            self.split_pending = split_from
+        elif self.split_pending is not None:
+            if _line_count(flowable) == 1:
+                self.warnings.append(f"widow: one line of '{_label(self.split_pending)}' at the top of page {self.page}")
+            self.split_pending = None
+
+    def _page_break(self, flowables):
+        frame = self.frame
+        entry = {'page': self.page, 'space_left': round(frame.remaining(), 1), 'pointless': False}
+        if not self.page_flowables:
+            entry['pointless'] = True
+            self.warnings.append(f"page break on an empty page leaves page {self.page} blank")
+        elif flowables:
+            # Without the break, would the next flowable have started a new page anyway?
+            following = flowables[0]
+            space = frame.remaining() - max(following.getSpaceBefore() - frame._prevASpace, 0)
+            height = following.wrap(frame._getAvailableWidth(), space)[1] if space > 0 else float('inf')
+            if height > space and not frame.split(following, None):
+                entry['pointless'] = True
+                self.warnings.append(f"page break after page {self.page} is pointless: "
+                                     f"'{_label(following)}' would not fit on it anyway")
+        self.page_breaks.append(entry)
+        self._new_page()
+
+    def check(self, flowables):
+        """Lay out a story; returns the report dict"""
+        flowables = list(flowables)
+        self.page = 0
+        self.sections = []
+        self.warnings = []
+        self.page_breaks = []
+        self.heading = None
+        self.split_pending = None
+        self._new_page()
+        frame = self.frame
+
+        while flowables:
+            self.handle_keepWithNext(flowables)
+            flowable = flowables.pop(0)
+            if isinstance(flowable, PageBreak):
+                self._page_break(flowables)
+            elif isinstance(flowable, ActionFlowable):
+                continue
+            elif frame.measure(flowable, trySplit=1):
+                self._placed(flowable)
+            else:
+                parts = frame.split(flowable, None)
+                if parts:
+                    if not frame.measure(parts[0]):
+                        raise LayoutError(f"splitting error on page {self.page}: {_label(flowable)}")
+                    self._placed(parts[0], split_from=flowable)
+                    flowables[0:0] = parts[1:]
+                elif not self.page_flowables:
+                    raise LayoutError(f"'{_label(flowable)}' is too large for an empty page")
+                else:
+                    flowables.insert(0, flowable)
+                    self._new_page()
+
+        if self.heading:
+            self.warnings.append(f"heading '{self.heading[0]}' ends the document with nothing under it")
+        return {'pages': self.page, 'sections': self.sections, 'page_breaks': self.page_breaks,
+                'warnings': self.warnings}
+
+
+def check_story(name, flowables):
+    started = time.perf_counter()
+    report = LayoutChecker().check(flowables)
+    report['seconds'] = round(time.perf_counter() - started, 4)
+    return dict({'document': name}, **report)
+
+def check_guide(spec, prepared_for=None, slot_heights=None):
+    """Layout report for a guide spec"""
+    return check_story(spec['key'], create_guide_elements(spec, prepared_for=prepared_for, slot_heights=slot_heights))
+
+def check_playbook(answers):
+    """Layout report for the personalized playbook built from quiz answers"""
+    from playbook_assembly import FRAME_PADDING, create_playbook_elements
+    checker = LayoutChecker()
+    width = checker.frame._width - 2 * FRAME_PADDING
+    return check_story('playbook', create_playbook_elements(answers, width))
+
+def format_report(report):
+    lines = [f"{report['document']}: {report['pages']} pages ({report['seconds'] * 1000:.0f} ms)"]
+    for section in report['sections']:
+        first, last = section['first_page'], section['last_page']
+        pages = f"p{first}" if first == last else f"p{first}-{last}"
+        lines.append(f"  {pages:<8}{section['title']}")
+    for warning in report['warnings']:
+        lines.append(f"  ! {warning}")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the lead magnets' page layout without building PDFs")
+    parser.add_argument('guides', nargs='*', help="guide keys (default: all)")
+    parser.add_argument('--quiz', help="JSON file of AI Fit Quiz answers; checks the personalized playbook")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON")
+    args = parser.parse_args(argv)
+
+    if args.quiz:
+        with open(args.quiz) as f:
+            reports = [check_playbook(json.load(f))]
+    else:
+        specs = [get_guide_spec(key) for key in args.guides] if args.guides else GUIDE_SPECS
+        reports = [check_guide(spec) for spec in specs]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print('\n'.join(format_report(report) for report in reports))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Lead Magnet Server (serve mode)
+Renders the lead magnet PDFs on demand. Anonymous downloads are built once
+and served from memory; ?name=...&company=... adds a "Prepared for" line.
+PDFs answer single byte-range requests, which lets viewers fetch
+linearized (--linearize) documents page by page.
+
+With --workers N the parent renders every anonymous guide and pre-flows
+the playbook sections once, then forks N workers that share that warm
+state copy-on-write and accept on the same socket; each worker is
+replaced after --max-renders renders. /metrics then reports the counters
+of whichever worker answers.
+
+    GET  /lead-magnets/<file>.pdf   one of the PDF_DOWNLOADS files
+    POST /playbook                  quiz answers (JSON) -> personalized playbook
+    GET  /metrics                   Prometheus text format (with --metrics)
+    GET  /healthz
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import argparse
+import gc
+import io
+import json
+import os
+import re
+import signal
+import sys
+import threading
+import traceback
+
+from build_metrics import count_cache, prometheus_text
+from build_queue import lead_display_name
+from generate_lead_magnets import FRAME_WIDTH, GUIDE_SPECS, LINEARIZE_OUTPUT, METRICS_LOG, build_guide
+from playbook_assembly import SECTION_CACHE, assemble_playbook
+
+SPECS_BY_FILENAME = {spec['filename']: spec for spec in GUIDE_SPECS}
+
+# Playbook requests larger than this are rejected
+MAX_BODY_BYTES = 64 * 1024
+
+# Renders a pre-forked worker serves before the parent replaces it
+MAX_WORKER_RENDERS = 500
+
+_BYTE_RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class PDFCache:
+    """Anonymous renders, built once per process"""
+
+    def __init__(self):
+        self._pdfs = {}
+        self._lock = threading.Lock()
+
+    def get(self, spec, render):
+        pdf = self._pdfs.get(spec['filename'])
+        count_cache('rendered_pdfs', pdf is not None)
+        if pdf is None:
+            with self._lock:
+                pdf = self._pdfs.get(spec['filename'])
+                if pdf is None:
+                    pdf = self._pdfs[spec['filename']] = render(spec)
+        return pdf
+
+
+class LeadMagnetServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, expose_metrics=False, metrics_log=METRICS_LOG, linearize=LINEARIZE_OUTPUT):
+        ThreadingHTTPServer.__init__(self, address, LeadMagnetHandler)
+        self.expose_metrics = expose_metrics
+        self.metrics_log = metrics_log
+        self.linearize = linearize
+        self.pdf_cache = PDFCache()
+        self.max_renders = None
+        self.renders = 0
+        self._renders_lock = threading.Lock()
+
+    def render(self, spec, prepared_for=None):
+        buffer = io.BytesIO()
+        build_guide(spec, buffer, prepared_for=prepared_for, metrics_log=self.metrics_log, linearize=self.linearize)
+        self._count_render()
+        return buffer.getvalue()
+
+    def render_playbook(self, answers):
+        buffer = io.BytesIO()
+        assemble_playbook(answers, buffer, metrics_log=self.metrics_log, linearize=self.linearize)
+        self._count_render()
+        return buffer.getvalue()
+
+    def _count_render(self):
+        with self._renders_lock:
+            self.renders += 1
+            recycle = self.max_renders is not None and self.renders == self.max_renders
+        if recycle:
+            # Stop accepting; the worker finishes what's in flight and exits
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def warm(self):
+        """Render the anonymous guides and pre-flow the playbook sections ahead of the first request"""
+        for spec in GUIDE_SPECS:
+            self.pdf_cache.get(spec, self.render)
+        SECTION_CACHE.warm(FRAME_WIDTH)
+        self.render_playbook({})
+        self.renders = 0
+
+
+def parse_byte_range(header, size):
+    """(start, end) for a single "Range: bytes=..." header, None to send everything, False if unsatisfiable
+
+    Multi-range requests get the whole document, which HTTP allows.
+    """
+    match = _BYTE_RANGE.match((header or '').strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+class LeadMagnetHandler(BaseHTTPRequestHandler):
+    server_version = "MindWorthLeadMagnets/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type='text/plain; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_pdf(self, pdf, filename):
+        headers = {
+            'Content-Disposition': f'inline; filename="{filename}"',
+            'Accept-Ranges': 'bytes',
+        }
+        byte_range = parse_byte_range(self.headers.get('Range'), len(pdf))
+        if byte_range is None:
+            self._send(200, pdf, 'application/pdf', headers)
+        elif byte_range is False:
+            self._send(416, b'', 'application/pdf', {'Content-Range': f'bytes */{len(pdf)}'})
+        else:
+            start, end = byte_range
+            headers['Content-Range'] = f'bytes {start}-{end}/{len(pdf)}'
+            self._send(206, pdf[start:end + 1], 'application/pdf', headers)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+
+        if url.path == '/healthz':
+            self._send(200, b'ok\n')
+        elif url.path == '/metrics' and self.server.expose_metrics:
+            self._send(200, prometheus_text().encode('utf8'), 'text/plain; version=0.0.4; charset=utf-8')
+        elif url.path.startswith('/lead-magnets/'):
+            spec = SPECS_BY_FILENAME.get(url.path[len('/lead-magnets/'):])
+            if spec is None:
+                self._send(404, b'unknown lead magnet\n')
+                return
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            prepared_for = lead_display_name({'name': query.get('name'), 'company': query.get('company')})
+            if prepared_for:
+                pdf = self.server.render(spec, prepared_for)
+            else:
+                pdf = self.server.pdf_cache.get(spec, self.server.render)
+            self._send_pdf(pdf, spec['filename'])
+        else:
+            self._send(404, b'not found\n')
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/playbook':
+            self._send(404, b'not found\n')
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, b'request too large\n')
+            return
+        try:
+            answers = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, b'invalid JSON\n')
+            return
+        if not isinstance(answers, dict):
+            self._send(400, b'expected a JSON object\n')
+            return
+        self._send_pdf(self.server.render_playbook(answers), "personalized-ai-playbook.pdf")
+
+
+def serve(host='127.0.0.1', port=8000, expose_metrics=False, metrics_log=METRICS_LOG, linearize=LINEARIZE_OUTPUT):
+    server = LeadMagnetServer((host, port), expose_metrics, metrics_log, linearize)
+    print(f"Serving lead magnets on http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _run_worker(server):
+    """Serve in a forked worker until recycled or told to stop; never returns"""
+    status = 0
+    try:
+        gc.enable()
+        # ^C reaches the whole process group; the parent stops the workers
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+        # Every worker is woken for each connection; the ones that lose the
+        # accept get EAGAIN rather than blocking
+        server.socket.setblocking(False)
+        # Let requests in flight finish before the worker exits
+        server.daemon_threads = False
+        server.serve_forever()
+        server.server_close()
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        os._exit(status)
+
+def serve_prefork(host='127.0.0.1', port=8000, workers=4, max_renders=MAX_WORKER_RENDERS, expose_metrics=False,
+                  metrics_log=METRICS_LOG, linearize=LINEARIZE_OUTPUT):
+    """Warm one server, then fork workers that share its socket and caches"""
+    # Objects the parent frees while warming would leave holes in pages the
+    # workers then share; collect nothing until the warm state is frozen
+    gc.disable()
+    server = LeadMagnetServer((host, port), expose_metrics, metrics_log, linearize)
+    server.warm()
+    server.max_renders = max_renders
+    # Move everything built so far out of the collector's reach, so workers'
+    # collections don't write to (and so copy) the shared pages
+    gc.freeze()
+    print(f"Serving lead magnets on http://{host}:{server.server_port}/ with {workers} workers")
+
+    children = set()
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(server)
+        children.add(pid)
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for _ in range(workers):
+            spawn()
+        while True:
+            pid, status = os.wait()
+            children.discard(pid)
+            if os.waitstatus_to_exitcode(status):
+                print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}", file=sys.stderr)
+            spawn()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+        for pid in children:
+            os.waitpid(pid, 0)
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MindWorth AI lead magnets on demand")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--metrics', action='store_true', help="expose /metrics in Prometheus text format")
+    parser.add_argument('--metrics-log', default=METRICS_LOG, help="JSONL build metrics log ('' to disable)")
+    parser.add_argument('--linearize', action='store_true', help="serve linearized (fast web view) PDFs")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="pre-fork this many warm worker processes (default: serve from one process)")
+    parser.add_argument('--max-renders', type=int, default=MAX_WORKER_RENDERS,
+                        help=f"renders per worker before it is replaced (default {MAX_WORKER_RENDERS})")
+    args = parser.parse_args(argv)
+    if args.workers:
+        serve_prefork(args.host, args.port, args.workers, args.max_renders, args.metrics, args.metrics_log or None,
+                      args.linearize)
+    else:
+        serve(args.host, args.port, args.metrics, args.metrics_log or None, args.linearize)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Load Test
+Replays lead magnet download traffic against lead_magnet_server: a weighted
+mix of the six PDF_DOWNLOADS guides, a share of personalized
+(?name=...&company=...) renders among cached anonymous downloads, and a
+burst profile of arrival rates. Arrivals are open loop, so latency runs
+from each request's scheduled time and includes queueing once the server
+falls behind.
+
+Prints one JSON report (throughput, p50/p95/p99 latency, error rate and the
+server's CPU time and RSS, summed over its worker processes) that runs can
+be compared with.
+
+    python load_test.py                                   start a server, spike profile
+    python load_test.py --url http://127.0.0.1:8000 --pid 1234
+    python load_test.py --profile waves --rate 10 --personalized 0.5 -o run.json
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from generate_lead_magnets import GUIDE_SPECS
+
+# (share of the run, multiple of the base rate, name) for each phase
+PROFILES = {
+    'steady': [(1.0, 1, 'steady')],
+    # A campaign email lands: quiet, then a sharp spike that tails off
+    'spike': [(0.3, 1, 'before'), (0.2, 8, 'spike'), (0.2, 3, 'tail'), (0.3, 1, 'after')],
+    # Social posts: short bursts over a steady background
+    'waves': [(0.15, 1, 'calm'), (0.1, 5, 'burst')] * 4,
+}
+
+FIRST_NAMES = ["Ana", "Ben", "Chloe", "Dev", "Elena", "Femi", "Grace", "Hiro", "Imani", "Jonas", "Kira", "Luis"]
+COMPANIES = ["Acme Dental", "Brightside Realty", "Cedar & Co", "Delta Logistics", "Evergreen Law",
+             "Fable Studio", "Granite Accounting", "Harbor Fitness", ""]
+
+SAMPLE_INTERVAL = 0.25
+HEALTH_TIMEOUT = 30
+
+
+def parse_mix(text):
+    """{filename: weight} from 'key=weight,...'; every guide weighs 1 when text is empty"""
+    filenames = {spec['key']: spec['filename'] for spec in GUIDE_SPECS}
+    if not text:
+        return {filename: 1.0 for filename in filenames.values()}
+    mix = {}
+    for part in text.split(','):
+        key, _, weight = part.partition('=')
+        if key.strip() not in filenames:
+            raise ValueError(f"unknown guide: {key.strip()}")
+        mix[filenames[key.strip()]] = float(weight or 1)
+    return mix
+
+def schedule(profile, duration, rate, mix, personalized, seed=0):
+    """[(offset seconds, phase number, kind, filename, path)] of Poisson arrivals over the profile's phases"""
+    rng = random.Random(seed)
+    filenames, weights = list(mix), list(mix.values())
+    arrivals = []
+    start = 0
+    for number, (share, multiple, _) in enumerate(PROFILES[profile]):
+        end = start + share * duration
+        offset = start
+        while True:
+            offset += rng.expovariate(rate * multiple)
+            if offset >= end:
+                break
+            filename = rng.choices(filenames, weights)[0]
+            path = f"/lead-magnets/{filename}"
+            if rng.random() < personalized:
+                query = {'name': rng.choice(FIRST_NAMES), 'company': rng.choice(COMPANIES)}
+                arrivals.append((offset, number, 'personalized', filename, f"{path}?{urlencode(query)}"))
+            else:
+                arrivals.append((offset, number, 'cached', filename, path))
+        start = end
+    return arrivals
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return None
+    # The rank is rounded first so float error (0.07 * 100 == 7.000000000000001) can't push it up one
+    rank = math.ceil(round(fraction * len(ordered), 9))
+    return ordered[min(len(ordered) - 1, max(0, rank - 1))]
+
+def summarize(results, seconds=None):
+    """Request count, error rate and latency percentiles (ms) of a list of results"""
+    latencies = sorted(result['latency'] * 1000 for result in results if result['error'] is None)
+    errors = len(results) - len(latencies)
+    summary = {
+        'requests': len(results),
+        'errors': errors,
+        'error_rate': round(errors / len(results), 4) if results else 0.0,
+    }
+    if seconds:
+        summary['throughput_rps'] = round(len(latencies) / seconds, 2)
+    for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+        value = percentile(latencies, fraction)
+        summary[f'{name}_ms'] = round(value, 1) if value is not None else None
+    summary['max_ms'] = round(latencies[-1], 1) if latencies else None
+    summary['mean_ms'] = round(sum(latencies) / len(latencies), 1) if latencies else None
+    return summary
+
+
+class ProcessSampler:
+    """Samples CPU time and memory of a process and its descendants from /proc (Linux)
+
+    Workers that already exited count through the parent's reaped-children
+    CPU times. RSS counts pages that forked workers share once per worker;
+    PSS splits them between the processes sharing them.
+    """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.available = os.path.exists(f'/proc/{pid}/stat')
+        self._ticks = os.sysconf('SC_CLK_TCK') if self.available else 1
+        self._page = os.sysconf('SC_PAGE_SIZE') if self.available else 1
+        self.rss_peak = 0
+        self.pss_peak = 0
+        self.processes_peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _stat(pid):
+        with open(f'/proc/{pid}/stat') as f:
+            # Fields after the parenthesized command name, which may contain spaces
+            return f.read().rpartition(')')[2].split()
+
+    @staticmethod
+    def _pss(pid):
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def _tree(self):
+        children = {}
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                try:
+                    children.setdefault(int(self._stat(entry)[1]), []).append(int(entry))
+                except (OSError, IndexError):
+                    continue
+        pids, pending = [], [self.pid]
+        while pending:
+            pid = pending.pop()
+            pids.append(pid)
+            pending.extend(children.get(pid, []))
+        return pids
+
+    def sample(self):
+        """(cpu seconds, rss bytes, pss bytes, processes) for the process tree now"""
+        cpu = rss = pss = count = 0
+        for pid in self._tree():
+            try:
+                fields = self._stat(pid)
+                with open(f'/proc/{pid}/statm') as f:
+                    pages = int(f.read().split()[1])
+                pss += self._pss(pid)
+            except (OSError, IndexError):
+                continue
+            # utime, stime, and for the root also cutime, cstime
+            cpu += sum(int(value) for value in fields[11:15 if pid == self.pid else 13])
+            rss += pages * self._page
+            count += 1
+        self.rss_peak = max(self.rss_peak, rss)
+        self.pss_peak = max(self.pss_peak, pss)
+        self.processes_peak = max(self.processes_peak, count)
+        return cpu / self._ticks, rss, pss, count
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def start(self):
+        if self.available:
+            self.cpu_start = self.sample()[0]
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, seconds):
+        """Stop sampling; returns the report's server section"""
+        if not self.available:
+            return {'pid': self.pid, 'available': False}
+        self._stop.set()
+        self._thread.join()
+        cpu, rss, pss, count = self.sample()
+        return {
+            'pid': self.pid,
+            'cpu_seconds': round(cpu - self.cpu_start, 2),
+            'cpu_percent': round((cpu - self.cpu_start) / seconds * 100, 1),
+            'rss_end_bytes': rss,
+            'rss_peak_bytes': self.rss_peak,
+            'pss_end_bytes': pss,
+            'pss_peak_bytes': self.pss_peak,
+            'processes': count,
+            'processes_peak': self.processes_peak,
+        }
+
+
+def fetch(host, port, path, timeout):
+    """GET a path; returns (status, body length) or raises"""
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, len(response.read())
+    finally:
+        connection.close()
+
+def run_load(url, arrivals, concurrency=32, timeout=60):
+    """Replay the arrivals against a server; returns one result dict per request"""
+    target = urlsplit(url)
+    host, port = target.hostname, target.port or 80
+    results = []
+    lock = threading.Lock()
+
+    def request(scheduled, arrival):
+        _, phase, kind, filename, path = arrival
+        result = {'offset': arrival[0], 'phase': phase, 'kind': kind, 'filename': filename, 'error': None, 'bytes': 0}
+        try:
+            status, length = fetch(host, port, path, timeout)
+            result['bytes'] = length
+            if status != 200:
+                result['error'] = f"HTTP {status}"
+        except socket.timeout:
+            result['error'] = "timeout"
+        except (OSError, http.client.HTTPException) as exc:
+            result['error'] = type(exc).__name__
+        result['finished'] = time.perf_counter()
+        result['latency'] = result['finished'] - scheduled
+        with lock:
+            results.append(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for arrival in arrivals:
+            scheduled = started + arrival[0]
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(request, scheduled, arrival)
+    for result in results:
+        result['finished'] -= started
+    return results
+
+def _wait_healthy(url, process, timeout=HEALTH_TIMEOUT):
+    target = urlsplit(url)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            if fetch(target.hostname, target.port, '/healthz', 1)[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"server not healthy after {timeout}s")
+
+def start_server(options=()):
+    """Start lead_magnet_server on a free local port; returns (process, url, seconds until healthy)"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lead_magnet_server.py')
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script, '--port', str(port), '--metrics-log', '', *options],
+                               stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_healthy(url, process)
+    except RuntimeError:
+        process.kill()
+        process.wait()
+        raise
+    return process, url, time.perf_counter() - started
+
+def build_report(results, arrivals, config, mix, server):
+    """The JSON report: overall, per request kind, per guide and per phase"""
+    seconds = max([result['finished'] for result in results] + [config['duration_s']])
+    errors = {}
+    for result in results:
+        if result['error'] is not None:
+            errors[result['error']] = errors.get(result['error'], 0) + 1
+    keys = {spec['filename']: spec['key'] for spec in GUIDE_SPECS}
+    # The first request meets a cold server
+    first = min(results, key=lambda result: result['offset'], default=None)
+
+    phases = []
+    start = 0
+    for number, (share, multiple, name) in enumerate(PROFILES[config['profile']]):
+        length = share * config['duration_s']
+        phase = {'phase': name, 'start_s': round(start, 2), 'seconds': round(length, 2),
+                 'offered_rps': config['rate'] * multiple}
+        phase.update(summarize([result for result in results if result['phase'] == number], length))
+        phases.append(phase)
+        start += length
+
+    report = dict(config)
+    report.update(summarize(results, seconds))
+    report.update({
+        'seconds': round(seconds, 2),
+        'scheduled': len(arrivals),
+        'megabytes': round(sum(result['bytes'] for result in results) / 1e6, 2),
+        'first_request_ms': round(first['latency'] * 1000, 1) if first and first['error'] is None else None,
+        'errors_by_type': errors,
+        'by_kind': {kind: summarize([result for result in results if result['kind'] == kind])
+                    for kind in ('cached', 'personalized')},
+        'by_guide': {keys[filename]: summarize([result for result in results if result['filename'] == filename])
+                     for filename in mix},
+        'phases': phases,
+        'server': server,
+    })
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the on-demand lead magnet server")
+    parser.add_argument('--url', help="server to test (default: start lead_magnet_server locally)")
+    parser.add_argument('--pid', type=int, help="server process to sample CPU and RSS of, with --url")
+    parser.add_argument('--server-option', action='append', default=[],
+                        help="extra lead_magnet_server option for a started server, e.g. --server-option=--linearize")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='spike')
+    parser.add_argument('--duration', type=float, default=30, help="seconds of traffic (default 30)")
+    parser.add_argument('--rate', type=float, default=5, help="base requests per second (default 5)")
+    parser.add_argument('--personalized', type=float, default=0.2, help="share of personalized downloads (default 0.2)")
+    parser.add_argument('--mix', default='', help="guide weights, e.g. checklist=3,sales-playbook=1 (default: equal)")
+    parser.add_argument('--concurrency', type=int, default=32, help="client connections in flight (default 32)")
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as exc:
+        parser.error(str(exc))
+    arrivals = schedule(args.profile, args.duration, args.rate, mix, args.personalized, args.seed)
+
+    started = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    process = None
+    startup = None
+    url = args.url
+    if url is None:
+        process, url, startup = start_server(args.server_option)
+    pid = process.pid if process else args.pid
+    sampler = ProcessSampler(pid) if pid else None
+    try:
+        if sampler:
+            sampler.start()
+        results = run_load(url, arrivals, args.concurrency, args.timeout)
+        seconds = max([result['finished'] for result in results] + [args.duration])
+        server = sampler.stop(seconds) if sampler else {}
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    server['startup_seconds'] = round(startup, 2) if startup is not None else None
+
+    keys = {spec['filename']: spec['key'] for spec in GUIDE_SPECS}
+    config = {
+        'target': url, 'profile': args.profile, 'duration_s': args.duration, 'rate': args.rate,
+        'personalized_share': args.personalized, 'concurrency': args.concurrency, 'seed': args.seed,
+        'mix': {keys[filename]: weight for filename, weight in mix.items()}, 'started': started,
+    }
+    report = json.dumps(build_report(results, arrivals, config, mix, server), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+if __name__ == "__main__":
+    main()
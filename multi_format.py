@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Multi-Format Output
+Creates each guide's story once and writes it as a PDF, an accessible
+HTML fragment for the service pages and an EPUB edition. The HTML and
+EPUB writers walk the same flowables the PDF is laid out from, reading
+the already parsed paragraph fragments, so markup is parsed once for
+all three formats.
+
+    python multi_format.py                      every guide, every format
+    python multi_format.py --formats html,epub
+"""
+
+from html import escape
+from reportlab.lib.fonts import ps2tt
+from reportlab.platypus import Image, Paragraph, Table
+import argparse
+import os
+import re
+import time
+import uuid
+import zipfile
+
+from generate_lead_magnets import (
+    GUIDE_SPECS, METRICS_LOG, OUTPUT_DIR, CachedDrawing, VariantSlot,
+    build_guide, create_guide_elements,
+)
+
+FORMATS = ('pdf', 'html', 'epub')
+
+EPUB_CSS = """\
+body { font-family: Helvetica, Arial, sans-serif; color: #0F0F23; }
+h1, h2 { color: #8B5CF6; }
+.subtitle { color: #06D6A0; }
+.checklist li { margin-bottom: 0.4em; }
+table { border-collapse: collapse; width: 100%; }
+th { background: #8B5CF6; color: #FEFEFE; text-align: left; }
+th, td { padding: 0.25em 0.5em; border-bottom: 1px solid #ddd; }
+.cta { text-align: center; margin-top: 2em; }
+"""
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def inline_html(paragraph):
+    """HTML for a paragraph's parsed fragments; emphasis the style already implies is left out"""
+    _, style_bold, style_italic = ps2tt(paragraph.style.fontName)
+    parts = []
+    for frag in paragraph.frags:
+        if getattr(frag, 'lineBreak', False):
+            parts.append('<br />')
+            continue
+        text = escape(frag.text, quote=False)
+        if not text:
+            continue
+        if frag.italic and not style_italic:
+            text = f'<em>{text}</em>'
+        if frag.bold and not style_bold:
+            text = f'<strong>{text}</strong>'
+        if frag.link:
+            text = f'<a href="{escape(frag.link[0][1])}">{text}</a>'
+        parts.append(text)
+    return ''.join(parts)
+
+def _flatten(story):
+    for flowable in story:
+        if isinstance(flowable, VariantSlot):
+            yield from _flatten(flowable.flowables)
+        else:
+            yield flowable
+
+def _table_html(table):
+    rows = table._cellvalues
+    header = ''.join(f'<th scope="col">{inline_html(cell)}</th>' for cell in rows[0])
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{inline_html(cell)}</td>' for cell in row) + '</tr>'
+        for row in rows[1:]
+    )
+    return f'<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
+
+def _chart_html(block):
+    # Charts are described by their data, which screen readers can navigate
+    names = block.get('series_names') or [f"Series {number + 1}" for number in range(len(block['series']))]
+    header = '<th scope="col">Category</th>' + ''.join(f'<th scope="col">{escape(name)}</th>' for name in names)
+    body = ''.join(
+        f'<tr><th scope="row">{escape(str(category))}</th>'
+        + ''.join(f'<td>{series[index]}</td>' for series in block['series']) + '</tr>'
+        for index, category in enumerate(block['categories'])
+    )
+    return (f'<figure><figcaption>{escape(block.get("title", ""))}</figcaption>'
+            f'<table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table></figure>')
+
+def story_html(spec, story, heading_level=2, checkboxes=True):
+    """Accessible HTML (also well-formed XHTML) for a guide's story; returns (html, [(section_id, title)])"""
+    key = spec['key']
+    title_tag, section_tag = f'h{heading_level}', f'h{heading_level + 1}'
+    out = [f'<section class="lead-magnet" id="{key}" aria-labelledby="{key}-title">']
+    sections = []
+    open_list = False
+    open_cta = False
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            out.append('</ul>')
+            open_list = False
+
+    for flowable in _flatten(story):
+        block = getattr(flowable, 'block', None)
+        if isinstance(flowable, Paragraph):
+            role = flowable.style.name
+            text = inline_html(flowable)
+            if role == 'ItemStyle':
+                text = re.sub(r'^☐\s*', '', text)
+                if not open_list:
+                    out.append('<ul class="checklist">')
+                    open_list = True
+                if checkboxes:
+                    out.append(f'<li><label><input type="checkbox" /> {text}</label></li>')
+                else:
+                    out.append(f'<li>{text}</li>')
+                continue
+            close_list()
+            if role == 'CustomTitle':
+                out.append(f'<{title_tag} id="{key}-title">{text}</{title_tag}>')
+            elif role in ('SectionTitle', 'GuideTitle'):
+                section_id = f"{key}-{slugify(flowable.getPlainText())}"
+                sections.append((section_id, flowable.getPlainText()))
+                out.append(f'<{section_tag} id="{section_id}">{text}</{section_tag}>')
+            elif role == 'CTA':
+                out.append(f'<aside class="cta" aria-label="Next step"><{section_tag}>{text}</{section_tag}>')
+                open_cta = True
+            else:
+                css_class = {'CustomSubtitle': 'subtitle', 'PreparedFor': 'prepared-for',
+                             'Intro': 'intro', 'CTAText': 'cta-text'}.get(role)
+                out.append(f'<p class="{css_class}">{text}</p>' if css_class else f'<p>{text}</p>')
+        elif isinstance(flowable, Table) and block is not None:
+            close_list()
+            out.append(_table_html(flowable))
+        elif isinstance(flowable, CachedDrawing) and block is not None:
+            close_list()
+            out.append(_chart_html(block))
+        elif isinstance(flowable, Image):
+            # Cover art is decorative and its cached file isn't published with the page
+            continue
+
+    close_list()
+    if open_cta:
+        out.append('</aside>')
+    out.append('</section>')
+    return '\n'.join(out) + '\n', sections
+
+def write_epub(spec, body, sections, path):
+    """Write a single-chapter EPUB 3 edition of a guide"""
+    title = escape(spec['title'])
+    identifier = uuid.uuid5(uuid.NAMESPACE_URL, f"https://mindworth.ai/lead-magnets/{spec['filename']}")
+    modified = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    toc = ''.join(f'<li><a href="guide.xhtml#{section_id}">{escape(name)}</a></li>' for section_id, name in sections)
+
+    files = {
+        'META-INF/container.xml': (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+            '</rootfiles></container>\n'
+        ),
+        'OEBPS/content.opf': (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id" xml:lang="en">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<dc:identifier id="id">urn:uuid:{identifier}</dc:identifier>'
+            f'<dc:title>{title}</dc:title><dc:language>en</dc:language><dc:creator>MindWorth AI</dc:creator>'
+            f'<meta property="dcterms:modified">{modified}</meta></metadata>'
+            '<manifest>'
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+            '<item id="guide" href="guide.xhtml" media-type="application/xhtml+xml"/>'
+            '<item id="css" href="style.css" media-type="text/css"/>'
+            '</manifest><spine><itemref idref="guide"/></spine></package>\n'
+        ),
+        'OEBPS/nav.xhtml': _xhtml(title, f'<nav epub:type="toc" id="toc"><h1>Contents</h1><ol>{toc}</ol></nav>'),
+        'OEBPS/guide.xhtml': _xhtml(title, body),
+        'OEBPS/style.css': EPUB_CSS,
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as epub:
+        # The mimetype entry must come first and be stored uncompressed
+        epub.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        for name, content in files.items():
+            epub.writestr(name, content)
+    return path
+
+def _xhtml(title, body):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE html>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" xml:lang="en" lang="en">'
+        f'<head><meta charset="UTF-8"/><title>{title}</title>'
+        '<link rel="stylesheet" type="text/css" href="style.css"/></head>'
+        f'<body>\n{body}</body></html>\n'
+    )
+
+def build_formats(spec, output_dir=OUTPUT_DIR, formats=FORMATS, metrics_log=METRICS_LOG):
+    """Write the requested formats of one guide from a single story; returns {format: path}"""
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(spec['filename'])[0]
+    story = create_guide_elements(spec)
+    outputs = {}
+
+    # The PDF build consumes the story, so the text formats are written first
+    if 'html' in formats:
+        html, _ = story_html(spec, story)
+        outputs['html'] = os.path.join(output_dir, f"{stem}.html")
+        with open(outputs['html'], 'w', encoding='utf8') as f:
+            f.write(html)
+    if 'epub' in formats:
+        body, sections = story_html(spec, story, heading_level=1, checkboxes=False)
+        outputs['epub'] = write_epub(spec, body, sections, os.path.join(output_dir, f"{stem}.epub"))
+    if 'pdf' in formats:
+        outputs['pdf'] = build_guide(spec, os.path.join(output_dir, spec['filename']), metrics_log=metrics_log,
+                                     flowables=story)
+    return outputs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the lead magnets as PDF, HTML fragments and EPUB")
+    parser.add_argument('--formats', default=','.join(FORMATS), help="comma-separated subset of pdf,html,epub")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+    for spec in GUIDE_SPECS:
+        for path in build_formats(spec, args.output_dir, formats).values():
+            print(f"  - {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Paragraph Markup Cache
+Parses each (text, style) pair's mini-XML markup once and hands the
+fragment list to every later Paragraph built from the same pair, across
+guides, variants and batch renders
+"""
+
+from collections import OrderedDict
+from reportlab.platypus import Paragraph
+import threading
+
+from build_metrics import count_cache
+
+MAX_ENTRIES = 4096
+
+
+class ParseCache:
+    """LRU of parsed paragraph fragments keyed by (text, style)
+
+    Styles are keyed by identity, so callers should pass shared style
+    objects (see BRAND_STYLES) rather than building a new one per call.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def paragraph(self, text, style):
+        key = (text, style)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+        count_cache('paragraph_markup', parsed is not None)
+
+        if parsed is None:
+            paragraph = Paragraph(text, style)
+            parsed = (paragraph.text, paragraph.style, paragraph.frags, paragraph.bulletText)
+            with self._lock:
+                self._entries[key] = parsed
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return paragraph
+
+        # Fragments are only read during layout (apart from a cached
+        # fragment-kind marker), so paragraphs can share them; the list
+        # itself is copied because Paragraph owns it
+        cleaned_text, parsed_style, frags, bullet_text = parsed
+        return Paragraph(cleaned_text, parsed_style, bulletText=bullet_text, frags=list(frags))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+PARSE_CACHE = ParseCache()
+
+
+def cached_paragraph(text, style):
+    """Paragraph whose markup is parsed at most once per (text, style)"""
+    return PARSE_CACHE.paragraph(text, style)
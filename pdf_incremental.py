@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - PDF Incremental Updates
+Reads just enough of a finished ReportLab PDF (trailer, xref table, page
+tree) to append an incremental update: replacement and new objects, a
+new xref section and a trailer pointing back at the original. The
+original bytes are never re-serialized.
+"""
+
+import re
+import zlib
+
+_STARTXREF = re.compile(rb'startxref\s+(\d+)\s+%%EOF\s*$')
+_XREF_SUBSECTION = re.compile(rb'\s*(\d+) (\d+)[ \t]*\r?\n')
+_REF = rb'(\d+) 0 R'
+
+
+def pdf_string(text):
+    """A PDF literal string for text in the standard fonts' WinAnsi encoding"""
+    data = text.encode('cp1252', 'replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def stream_object(dictionary, data, compress=True):
+    """Serialize a stream object; dictionary holds the entries besides /Length and /Filter"""
+    if compress:
+        data = zlib.compress(data)
+        dictionary = dictionary + b' /Filter /FlateDecode'
+    return b'<< ' + dictionary + b' /Length %d >>\nstream\n' % len(data) + data + b'\nendstream'
+
+def standard_font_object(base_font, internal_name):
+    """Font dictionary for one of the standard 14 Type 1 fonts"""
+    entries = b'/BaseFont /' + base_font.encode('ascii') + b' /Name /' + internal_name.encode('ascii')
+    if base_font not in ('Symbol', 'ZapfDingbats'):
+        entries += b' /Encoding /WinAnsiEncoding'
+    return b'<< ' + entries + b' /Subtype /Type1 /Type /Font >>'
+
+
+class PDFBase:
+    """A finished PDF with a classic xref table, ready to take incremental updates"""
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        match = _STARTXREF.search(self.data[-64:])
+        if match is None:
+            raise ValueError("not a complete PDF: no startxref at the end")
+        self.startxref = int(match.group(1))
+        self.offsets = {}
+        trailer = self._read_xref(self.startxref)
+        self.size = int(re.search(rb'/Size (\d+)', trailer).group(1))
+        self.root = int(re.search(rb'/Root ' + _REF, trailer).group(1))
+        info = re.search(rb'/Info ' + _REF, trailer)
+        self.info = int(info.group(1)) if info else None
+        ids = re.search(rb'/ID\s*(\[[^\]]*\])', trailer)
+        self.id = ids.group(1) if ids else None
+        self._pages = None
+
+    def _read_xref(self, offset):
+        # Newest section first; older sections (earlier updates) never override it
+        while True:
+            if self.data[offset:offset + 4] != b'xref':
+                raise ValueError("only PDFs with classic xref tables can be updated incrementally")
+            position = offset + 4
+            trailer_at = self.data.index(b'trailer', position)
+            while True:
+                match = _XREF_SUBSECTION.match(self.data, position, trailer_at)
+                if match is None:
+                    break
+                first, count = int(match.group(1)), int(match.group(2))
+                position = match.end()
+                for number in range(first, first + count):
+                    entry = self.data[position:position + 20]
+                    position += 20
+                    if entry[17:18] == b'n':
+                        self.offsets.setdefault(number, int(entry[:10]))
+            trailer = self.data[trailer_at:self.data.index(b'startxref', trailer_at)]
+            if offset == self.startxref:
+                newest = trailer
+            previous = re.search(rb'/Prev (\d+)', trailer)
+            if previous is None:
+                return newest
+            offset = int(previous.group(1))
+
+    def object(self, number):
+        """The source of an object, between 'N 0 obj' and 'endobj'"""
+        start = self.data.index(b'obj', self.offsets[number]) + 3
+        return self.data[start:self.data.index(b'endobj', start)].strip()
+
+    def pages(self):
+        """Page object numbers in document order"""
+        if self._pages is None:
+            pages_root = int(re.search(rb'/Pages ' + _REF, self.object(self.root)).group(1))
+            self._pages = []
+            self._collect_pages(pages_root)
+        return self._pages
+
+    def _collect_pages(self, number):
+        node = self.object(number)
+        kids = re.search(rb'/Kids\s*\[([^\]]*)\]', node)
+        if kids is None:
+            self._pages.append(number)
+            return
+        for kid in re.findall(_REF, kids.group(1)):
+            self._collect_pages(int(kid))
+
+    def xobject(self, name):
+        """Object number of a named XObject (e.g. a ReportLab form) used by any page"""
+        match = re.search(rb'/' + re.escape(name.encode('ascii')) + rb'\s+' + _REF, self.data)
+        if match is None:
+            raise KeyError(name)
+        return int(match.group(1))
+
+    def fonts(self):
+        """Font object numbers by BaseFont, from the font dictionaries the pages share"""
+        fonts = {}
+        for page in self.pages():
+            resources = self.object(page)
+            font_ref = re.search(rb'/Font ' + _REF, resources)
+            if font_ref is not None:
+                resources = self.object(int(font_ref.group(1)))
+            for number in re.findall(rb'/\S+ ' + _REF, resources):
+                font = self.object(int(number))
+                base_font = re.search(rb'/BaseFont /([^\s/>]+)', font)
+                if base_font and b'/Type /Font' in font:
+                    fonts.setdefault(base_font.group(1).decode('ascii'), int(number))
+        return fonts
+
+
+class IncrementalUpdate:
+    """New and replacement objects to append to a PDFBase"""
+
+    def __init__(self, base):
+        self.base = base
+        self.next_number = base.size
+        self.objects = {}
+
+    def add(self, source):
+        """Add a new object; returns its number"""
+        number = self.next_number
+        self.next_number += 1
+        self.objects[number] = source
+        return number
+
+    def replace(self, number, source):
+        self.objects[number] = source
+
+    def to_bytes(self):
+        base = self.base
+        parts = [base.data]
+        if not base.data.endswith(b'\n'):
+            parts.append(b'\n')
+        position = sum(len(part) for part in parts)
+        offsets = {}
+        for number in sorted(self.objects):
+            chunk = b'%d 0 obj\n' % number + self.objects[number] + b'\nendobj\n'
+            offsets[number] = position
+            parts.append(chunk)
+            position += len(chunk)
+
+        # Every section starts with the head of the free list, object 0; readers
+        # such as strict pypdf take a section that doesn't as a broken table
+        entries = {0: b'0000000000 65535 f\r\n'}
+        entries.update((number, b'%010d 00000 n\r\n' % offset) for number, offset in offsets.items())
+        xref = [b'xref\n']
+        numbers = sorted(entries)
+        start = 0
+        while start < len(numbers):
+            end = start
+            while end + 1 < len(numbers) and numbers[end + 1] == numbers[end] + 1:
+                end += 1
+            xref.append(b'%d %d\n' % (numbers[start], end - start + 1))
+            xref.extend(entries[number] for number in numbers[start:end + 1])
+            start = end + 1
+
+        trailer = b'trailer\n<< /Size %d /Root %d 0 R' % (self.next_number, base.root)
+        if base.info is not None:
+            trailer += b' /Info %d 0 R' % base.info
+        if base.id is not None:
+            trailer += b' /ID ' + base.id
+        trailer += b' /Prev %d >>\nstartxref\n%d\n%%%%EOF\n' % (base.startxref, position)
+        parts.extend(xref)
+        parts.append(trailer)
+        return b''.join(parts)
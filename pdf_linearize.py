@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Linearized PDF Output
+Optional post-layout stage that rewrites a finished PDF for "fast web
+view": first-page objects and hint tables come first, so a browser can
+show page 1 before the download finishes and fetch the rest with range
+requests. Uses pikepdf when installed, otherwise the qpdf command line.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+
+def linearization_available():
+    return pikepdf is not None or shutil.which('qpdf') is not None
+
+def linearize_pdf(data):
+    """Linearized copy of a PDF given as bytes"""
+    if pikepdf is not None:
+        out = io.BytesIO()
+        with pikepdf.open(io.BytesIO(data)) as pdf:
+            pdf.save(out, linearize=True)
+        return out.getvalue()
+
+    qpdf = shutil.which('qpdf')
+    if qpdf is None:
+        raise RuntimeError("Linearized output needs pikepdf (pip install pikepdf) or the qpdf command")
+    # qpdf --linearize reads and writes files; '-' is only allowed for output
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as source:
+        source.write(data)
+        source.flush()
+        result = subprocess.run([qpdf, '--linearize', source.name, '-'], capture_output=True)
+    # Exit status 3 means qpdf succeeded with warnings
+    if result.returncode not in (0, 3):
+        raise RuntimeError(f"qpdf --linearize failed: {result.stderr.decode('utf8', 'replace').strip()}")
+    return result.stdout
+
+def linearize_output(output):
+    """Linearize a finished PDF in place (a path or a seekable file-like object)"""
+    if isinstance(output, str):
+        with open(output, 'rb') as f:
+            data = linearize_pdf(f.read())
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(output) or '.', suffix='.pdf')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, output)
+    else:
+        output.seek(0)
+        data = linearize_pdf(output.read())
+        output.seek(0)
+        output.truncate()
+        output.write(data)
+
+def is_linearized(data):
+    """True if the PDF starts with a linearization parameter dictionary"""
+    return b'/Linearized' in data[:1024]
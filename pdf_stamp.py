@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Per-Lead PDF Stamping
+Adds a lead's name or ID to a finished lead magnet without re-layout:
+each stamp is an incremental update with one small overlay content
+stream. The replacement page objects, the font and the xref entries are
+worked out once per base PDF, so a stamp only formats a few lines of
+text and appends them.
+
+    python pdf_stamp.py lead-magnets/sales-follow-up-playbook.pdf leads.jsonl --output-dir /tmp/stamped
+"""
+
+from reportlab.lib.units import inch
+import argparse
+import json
+import os
+import re
+
+from build_queue import lead_display_name
+from font_metrics import string_width
+from pdf_incremental import IncrementalUpdate, PDFBase, pdf_string, standard_font_object, stream_object
+
+STAMP_FONT = 'Helvetica'
+STAMP_FONT_NAME = 'FStamp'
+
+_CONTENTS = re.compile(rb'/Contents\s*(\d+ 0 R|\[[^\]]*\])')
+_FONT_REF = re.compile(rb'/Font\s+(\d+) 0 R')
+_FONT_INLINE = re.compile(rb'/Font\s*<<([^>]*)>>')
+_MEDIA_BOX = re.compile(rb'/MediaBox\s*\[\s*([\d.\s-]+)\]')
+_STAMP_FONT_ENTRY = re.compile(rb'\s*/' + STAMP_FONT_NAME.encode('ascii') + rb'\s+\d+ 0 R')
+_STREAM = re.compile(rb'stream\r?\n(.*)endstream', re.S)
+
+
+class StampLine:
+    """One line of stamped text: a str.format template placed on some pages
+
+    pages is a list of page indexes (negative counts from the end) or None
+    for every page. x defaults to the page centre; a negative y is
+    measured down from the top of the page.
+    """
+
+    def __init__(self, template, pages=None, x=None, y=0.3 * inch, font_size=7, align='center',
+                 color=(0.5, 0.5, 0.5)):
+        self.template = template
+        self.pages = pages
+        self.x = x
+        self.y = y
+        self.font_size = font_size
+        self.align = align
+        self.color = color
+
+    def on_page(self, index, page_count):
+        return self.pages is None or index in self.pages or index - page_count in self.pages
+
+    def operators(self, fields, media_box):
+        text = self.template.format(**fields)
+        x = self.x
+        if x is None:
+            x = (media_box[0] + media_box[2]) / 2
+        y = self.y if self.y >= 0 else media_box[3] + self.y
+        width = string_width(text, STAMP_FONT, self.font_size)
+        if self.align == 'center':
+            x -= width / 2
+        elif self.align == 'right':
+            x -= width
+        return b'%.3f %.3f %.3f rg BT /%s %s Tf %.2f %.2f Td %s Tj ET\n' % (
+            *self.color, STAMP_FONT_NAME.encode('ascii'), b'%g' % self.font_size, x, y, pdf_string(text)
+        )
+
+
+# "Prepared for ..." under the top margin of the cover page, lead ID in every footer
+PREPARED_FOR_LINE = StampLine("Prepared for {prepared_for}", pages=[0], y=-0.5 * inch, font_size=10,
+                              color=(0.024, 0.839, 0.627))
+LEAD_ID_LINE = StampLine("{lead_id}")
+DEFAULT_LINES = [PREPARED_FOR_LINE, LEAD_ID_LINE]
+
+
+class PDFStamper:
+    """Stamps text lines onto a finished PDF, one incremental update per stamp"""
+
+    def __init__(self, data, lines=DEFAULT_LINES):
+        self.base = base = PDFBase(data)
+        self.lines = lines
+        pages = base.pages()
+        update = IncrementalUpdate(base)
+
+        font = base.fonts().get(STAMP_FONT)
+        if font is None:
+            font = update.add(standard_font_object(STAMP_FONT, STAMP_FONT_NAME))
+        # Pages may leave the graphics state changed, so their content is wrapped in q ... Q
+        save_state = update.add(stream_object(b'', b'q\n', compress=False))
+
+        # Pages carrying the same set of lines share one overlay stream
+        groups = {}
+        for index, page in enumerate(pages):
+            line_set = tuple(number for number, line in enumerate(lines) if line.on_page(index, len(pages)))
+            if line_set:
+                groups.setdefault(line_set, []).append(page)
+
+        self.overlays = []
+        for line_set, group_pages in groups.items():
+            overlay = update.add(None)
+            self.overlays.append((overlay, [lines[number] for number in line_set], self._media_box(group_pages[0])))
+            for page in group_pages:
+                update.replace(page, self._stamped_page(page, font, save_state, overlay))
+
+        # Everything but the overlay streams is the same for every stamp
+        self._fixed = {number: source for number, source in update.objects.items() if source is not None}
+        self._size = update.next_number
+
+    def _media_box(self, page):
+        match = _MEDIA_BOX.search(self.base.object(page))
+        if match is None:
+            raise ValueError(f"page object {page} has no MediaBox of its own")
+        return [float(value) for value in match.group(1).split()]
+
+    def _stamped_page(self, page, font, save_state, overlay):
+        source = self.base.object(page)
+        contents = _CONTENTS.search(source)
+        if contents is None:
+            raise ValueError(f"page object {page} has no content stream")
+        existing = contents.group(1).strip(b'[]').strip()
+        if _STAMP_FONT_ENTRY.search(source):
+            # Stamped before: drop the old stamp so the new one replaces it
+            existing = self._unstamped_contents(page, existing)
+            source = _STAMP_FONT_ENTRY.sub(b'', source)
+        source = (source[:contents.start()]
+                  + b'/Contents [%d 0 R %s %d 0 R]' % (save_state, existing, overlay)
+                  + source[contents.end():])
+
+        stamp_font = b'/%s %d 0 R' % (STAMP_FONT_NAME.encode('ascii'), font)
+        font_ref = _FONT_REF.search(source)
+        if font_ref is not None:
+            entries = self.base.object(int(font_ref.group(1))).strip().strip(b'<>').strip()
+            return source[:font_ref.start()] + b'/Font << ' + entries + b' ' + stamp_font + b' >>' + source[font_ref.end():]
+        font_inline = _FONT_INLINE.search(source)
+        if font_inline is not None:
+            return source[:font_inline.end() - 2] + b' ' + stamp_font + b' ' + source[font_inline.end() - 2:]
+        raise ValueError(f"page object {page} has no font resources of its own")
+
+    def _unstamped_contents(self, page, contents):
+        # A stamped page's contents are [q-stream, original..., overlay starting with Q]
+        refs = re.findall(rb'\d+ 0 R', contents)
+        streams = [_STREAM.search(self.base.object(int(ref.split()[0]))) for ref in (refs[:1] + refs[-1:])]
+        if (len(refs) < 3 or None in streams or streams[0].group(1).strip() != b'q'
+                or not streams[1].group(1).startswith(b'Q\n')):
+            raise ValueError(f"page object {page} uses the /{STAMP_FONT_NAME} font but has no stamp overlay")
+        return b' '.join(refs[1:-1])
+
+    def stamp(self, **fields):
+        """Stamped PDF bytes; fields fill in the lines' templates"""
+        update = IncrementalUpdate(self.base)
+        update.next_number = self._size
+        update.objects = dict(self._fixed)
+        for overlay, lines, media_box in self.overlays:
+            operators = b'Q\n' + b''.join(line.operators(fields, media_box) for line in lines)
+            update.objects[overlay] = stream_object(b'', operators, compress=False)
+        return update.to_bytes()
+
+
+def stamp_leads(source, leads, output_dir, lines=DEFAULT_LINES):
+    """Write one stamped copy of a PDF per lead; returns the paths"""
+    with open(source, 'rb') as f:
+        stamper = PDFStamper(f.read(), lines)
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    paths = []
+    for number, lead in enumerate(leads):
+        lead_id = str(lead.get('lead_id') or lead.get('email') or number)
+        data = stamper.stamp(prepared_for=lead_display_name(lead) or lead.get('email', ''), lead_id=lead_id)
+        path = os.path.join(output_dir, f"{stem}--{re.sub(r'[^A-Za-z0-9._-]+', '_', lead_id)}.pdf")
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stamp lead names and IDs onto a finished lead magnet")
+    parser.add_argument('pdf')
+    parser.add_argument('leads', help="JSONL file, one lead object per line")
+    parser.add_argument('--output-dir', required=True)
+    args = parser.parse_args(argv)
+
+    with open(args.leads) as f:
+        leads = [json.loads(line) for line in f if line.strip()]
+    paths = stamp_leads(args.pdf, leads, args.output_dir)
+    print(f"Stamped {len(paths)} PDFs into {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
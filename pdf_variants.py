@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - A/B Copy Variants
+Renders each guide once with its intro and CTA drawn as fixed-height
+form XObjects (VariantSlot), then produces every copy variant as a PDF
+incremental update that replaces only those forms. A variant costs a
+couple of paragraph layouts and a few hundred appended bytes, not a build.
+
+    python pdf_variants.py variants.json --output-dir /tmp/variants
+
+variants.json is a list of objects with a 'name' and any of 'intro',
+'cta_title' and 'cta_text'; 'guides' optionally limits them to some
+guide keys.
+"""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+import argparse
+import io
+import json
+import os
+import re
+
+from generate_lead_magnets import (
+    BRAND_STYLES, FRAME_WIDTH, GUIDE_SPECS, METRICS_LOG, OUTPUT_DIR,
+    build_guide, create_cta, create_intro, draw_stack, stack_height,
+)
+from pdf_incremental import IncrementalUpdate, PDFBase, standard_font_object, stream_object
+
+SLOT_FIELDS = {
+    'intro': ('intro',),
+    'cta': ('cta_title', 'cta_text'),
+}
+
+
+def slot_flowables(spec, slot, styles=BRAND_STYLES):
+    if slot == 'intro':
+        return create_intro(spec['intro'], styles)
+    return create_cta(spec['cta_title'], spec['cta_text'], styles)
+
+def changed_slots(variant):
+    return [slot for slot, fields in SLOT_FIELDS.items() if any(field in variant for field in fields)]
+
+def applies_to(variant, spec):
+    return 'guides' not in variant or spec['key'] in variant['guides']
+
+def reserve_heights(spec, variants, width=FRAME_WIDTH):
+    """Slot heights that fit the base copy and every variant's copy"""
+    heights = {}
+    for variant in variants:
+        for slot in changed_slots(variant):
+            needed = stack_height(slot_flowables(dict(spec, **variant), slot), width)
+            heights[slot] = max(heights.get(slot, 0), needed)
+    for slot in heights:
+        heights[slot] = max(heights[slot], stack_height(slot_flowables(spec, slot), width))
+    return heights
+
+def render_slot_form(flowables, width, height):
+    """Content stream and {internal font name: font} for flowables drawn as a slot form"""
+    canv = canvas.Canvas(io.BytesIO(), pagesize=letter)
+    canv.beginForm('slot', 0, 0, width, height)
+    draw_stack(canv, flowables, width, height)
+    canv.endForm()
+    form = canv._doc.idToObject[canv._doc.getXObjectName('slot')]
+    if form.XObjects or getattr(form, 'ExtGState', None):
+        raise ValueError("variant copy can only use text and plain colours")
+
+    fonts = {}
+    for font_name, internal_name in canv._doc.fontMapping.items():
+        if re.search(re.escape(internal_name.encode('ascii')) + rb'\s', form.stream):
+            if font_name not in pdfmetrics.standardFonts:
+                raise ValueError(f"variant copy must use the standard fonts, not {font_name}")
+            fonts[internal_name.lstrip('/')] = font_name
+    return form.stream, fonts
+
+def slot_form_object(update, fonts_in_base, content, fonts, width, height):
+    """Form XObject source for a variant, adding any font objects the base doesn't have"""
+    font_entries = []
+    for internal_name, font_name in sorted(fonts.items()):
+        number = fonts_in_base.get(font_name)
+        if number is None:
+            number = fonts_in_base[font_name] = update.add(standard_font_object(font_name, internal_name))
+        font_entries.append(b'/%s %d 0 R' % (internal_name.encode('ascii'), number))
+    dictionary = (
+        b'/Type /XObject /Subtype /Form /FormType 1 /BBox [0 0 %s %s] /Matrix [1 0 0 1 0 0] '
+        b'/Resources << /Font << %s >> /ProcSet [/PDF /Text] >>'
+        % (b'%.4f' % width, b'%.4f' % height, b' '.join(font_entries))
+    )
+    return stream_object(dictionary, content)
+
+def build_variants(spec, variants, output_dir=None, metrics_log=METRICS_LOG, width=FRAME_WIDTH):
+    """Build a guide once and write one incrementally updated PDF per variant; returns the paths"""
+    if output_dir is None:
+        output_dir = os.path.join(OUTPUT_DIR, "variants")
+    os.makedirs(output_dir, exist_ok=True)
+    variants = [variant for variant in variants if applies_to(variant, spec)]
+    stem = os.path.splitext(spec['filename'])[0]
+
+    heights = reserve_heights(spec, variants, width)
+    base_path = os.path.join(output_dir, f"{stem}.pdf")
+    build_guide(spec, base_path, metrics_log=metrics_log, slot_heights=heights)
+    with open(base_path, 'rb') as f:
+        base = PDFBase(f.read())
+    slots = {slot: base.xobject(f"FormXob.slot{slot}") for slot in heights}
+    base_fonts = base.fonts()
+
+    paths = [base_path]
+    for variant in variants:
+        update = IncrementalUpdate(base)
+        fonts_in_base = dict(base_fonts)
+        variant_spec = dict(spec, **variant)
+        for slot in changed_slots(variant):
+            content, fonts = render_slot_form(slot_flowables(variant_spec, slot), width, heights[slot])
+            update.replace(slots[slot], slot_form_object(update, fonts_in_base, content, fonts, width, heights[slot]))
+        path = os.path.join(output_dir, f"{stem}--{variant['name']}.pdf")
+        with open(path, 'wb') as f:
+            f.write(update.to_bytes())
+        paths.append(path)
+    return paths
+
+def build_variant_matrix(variants, specs=None, output_dir=None, metrics_log=METRICS_LOG):
+    """Variants for every guide they apply to"""
+    paths = []
+    for spec in specs or GUIDE_SPECS:
+        paths.extend(build_variants(spec, variants, output_dir, metrics_log))
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render A/B copy variants of the lead magnets")
+    parser.add_argument('variants', help="JSON list of variants")
+    parser.add_argument('--output-dir', default=os.path.join(OUTPUT_DIR, "variants"))
+    args = parser.parse_args(argv)
+
+    with open(args.variants) as f:
+        variants = json.load(f)
+    paths = build_variant_matrix(variants, output_dir=args.output_dir)
+    print(f"Wrote {len(paths)} PDFs to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Quiz-Driven Playbook Assembly
+Builds a personalized playbook from AI Fit Quiz answers by stitching
+together sections from all six lead magnet guides
+"""
+
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate
+from reportlab.lib.pagesizes import letter
+import copy
+import os
+
+from build_metrics import build_with_metrics, count_cache
+from paragraph_cache import cached_paragraph
+from pdf_linearize import linearize_output
+from generate_lead_magnets import (
+    BRAND_STYLES, GUIDE_SPECS, OUTPUT_DIR, METRICS_LOG, LINEARIZE_OUTPUT, NumberedCanvas, get_guide_spec,
+    create_header, create_intro, create_section, create_cta,
+)
+
+# Quiz areas and the questions that belong to them (see ai-fit-quiz.html)
+QUIZ_AREAS = {
+    'businessFoundation': ['q1', 'q2', 'q3', 'q4', 'q5'],
+    'aiKnowledge': ['q6', 'q7', 'q8', 'q9', 'q10'],
+    'technicalReadiness': ['q11', 'q12', 'q13', 'q14', 'q15'],
+    'teamManagement': ['q16', 'q17', 'q18', 'q19', 'q20'],
+}
+
+# How strongly a gap in each quiz area points at each guide
+GUIDE_AFFINITY = {
+    'email-checklist': {'businessFoundation': 2, 'aiKnowledge': 3, 'technicalReadiness': 1, 'teamManagement': 2},
+    'insights-guide': {'businessFoundation': 3, 'aiKnowledge': 1, 'technicalReadiness': 2, 'teamManagement': 1},
+    'scheduling-guide': {'businessFoundation': 1, 'aiKnowledge': 2, 'technicalReadiness': 1, 'teamManagement': 3},
+    'sales-playbook': {'businessFoundation': 3, 'aiKnowledge': 1, 'technicalReadiness': 1, 'teamManagement': 2},
+    'document-blueprint': {'businessFoundation': 1, 'aiKnowledge': 1, 'technicalReadiness': 3, 'teamManagement': 1},
+    'checklist': {'businessFoundation': 1, 'aiKnowledge': 3, 'technicalReadiness': 1, 'teamManagement': 1},
+}
+
+# Bonus for guides the visitor explicitly asked about (PDF_DOWNLOADS keys)
+INTEREST_BONUS = 10
+
+MAX_SECTIONS = 12
+SECTIONS_PER_GUIDE = 4
+
+# SimpleDocTemplate frames pad their content by 6pt on each side
+FRAME_PADDING = 6
+
+
+class Preflowed(Flowable):
+    """Flowable wrapped once at a fixed width and replayed from the cache
+
+    The cached flowable is shared by every build in the process, so it is
+    never wrapped, split or drawn itself; anything that would change it
+    works on a shallow copy.
+    """
+
+    def __init__(self, flowable, width, size):
+        Flowable.__init__(self)
+        self.flowable = flowable
+        self.cached_width = width
+        self.cached_size = size
+
+    def wrap(self, availWidth, availHeight):
+        if abs(availWidth - self.cached_width) > 1e-6 or not hasattr(self.flowable, 'blPara'):
+            # Different frame than the cache was built for, or a failed split
+            # discarded the line breaks; lay out this build's own copy
+            self.flowable = copy.copy(self.flowable)
+            self.cached_width = availWidth
+            self.cached_size = self.flowable.wrap(availWidth, availHeight)
+        self.width, self.height = self.cached_size
+        return self.cached_size
+
+    def split(self, availWidth, availHeight):
+        # Paragraph.split drops the line breaks (del blPara) when it can't split
+        return copy.copy(self.flowable).split(availWidth, availHeight)
+
+    def getSpaceBefore(self):
+        return self.flowable.getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.flowable.getSpaceAfter()
+
+    def draw(self):
+        # drawOn sets canv on the flowable
+        copy.copy(self.flowable).drawOn(self.canv, 0, 0)
+
+
+class SectionLayoutCache:
+    """Pre-flowed section layouts keyed by (guide key, section index, width)"""
+
+    def __init__(self):
+        self.styles = BRAND_STYLES
+        self._sections = {}
+
+    def _flow_section(self, spec, index, width):
+        section_title, items = spec['sections'][index]
+        layout = []
+        for flowable in create_section(section_title, items, self.styles):
+            size = flowable.wrap(width, 1e6) if isinstance(flowable, Paragraph) else None
+            layout.append((flowable, size))
+        return layout
+
+    def get(self, spec, index, width):
+        """Return fresh flowables for a section, laid out from the cache"""
+        key = (spec['key'], index, width)
+        layout = self._sections.get(key)
+        count_cache('section_layouts', layout is not None)
+        if layout is None:
+            layout = self._sections[key] = self._flow_section(spec, index, width)
+
+        # The frame annotates flowables while placing them, so every build
+        # gets its own thin wrappers around the shared, already-wrapped paragraphs
+        return [
+            Preflowed(flowable, width, size) if size is not None else copy.copy(flowable)
+            for flowable, size in layout
+        ]
+
+    def warm(self, width):
+        """Pre-flow every section of every guide at the given frame width"""
+        for spec in GUIDE_SPECS:
+            for index in range(len(spec['sections'])):
+                self.get(spec, index, width)
+
+    def clear(self):
+        self._sections.clear()
+
+
+SECTION_CACHE = SectionLayoutCache()
+
+
+def _answer_value(value):
+    try:
+        return min(max(int(value), 1), 5)
+    except (TypeError, ValueError):
+        return None
+
+def score_areas(answers):
+    """Average gap (0-4) between each quiz area and a perfect score"""
+    gaps = {}
+    for area, questions in QUIZ_AREAS.items():
+        values = [_answer_value(answers.get(q)) for q in questions]
+        values = [v for v in values if v is not None]
+        gaps[area] = (5 - sum(values) / len(values)) if values else 0
+    return gaps
+
+def score_guides(answers):
+    """Rank guide specs by relevance to the quiz answers, best first"""
+    gaps = score_areas(answers)
+    interests = answers.get('interests') or []
+
+    ranked = []
+    for spec in GUIDE_SPECS:
+        affinity = GUIDE_AFFINITY.get(spec['key'], {})
+        score = sum(weight * gaps[area] for area, weight in affinity.items())
+        if spec['key'] in interests:
+            score += INTEREST_BONUS
+        ranked.append((score, spec))
+
+    ranked.sort(key=lambda pair: pair[0], reverse=True)
+    return ranked
+
+def select_sections(answers, max_sections=MAX_SECTIONS, sections_per_guide=SECTIONS_PER_GUIDE):
+    """Pick (spec, section index) pairs for the playbook in reading order"""
+    selected = []
+    for score, spec in score_guides(answers):
+        if len(selected) >= max_sections:
+            break
+        take = min(sections_per_guide, len(spec['sections']), max_sections - len(selected))
+        selected.extend((spec, index) for index in range(take))
+    return selected
+
+def create_playbook_elements(answers, width, max_sections=MAX_SECTIONS, cache=None):
+    """Stitch cached section layouts into a personalized playbook story"""
+    if cache is None:
+        cache = SECTION_CACHE
+    styles = cache.styles
+
+    company = answers.get('company') or answers.get('fullName')
+
+    elements = create_header("Your Personalized AI Playbook", "Built from Your AI Readiness Assessment",
+                             prepared_for=str(company) if company else None)
+    elements.extend(create_intro(
+        "We picked the sections below from our six implementation guides based on your AI Fit Quiz answers. "
+        "They are ordered by where automation will make the biggest difference for your business right now.",
+        styles
+    ))
+
+    selection = select_sections(answers, max_sections)
+    current_guide = None
+    for spec, index in selection:
+        if spec is not current_guide:
+            elements.append(cached_paragraph(spec['title'], styles['GuideTitle']))
+            current_guide = spec
+        elements.extend(cache.get(spec, index, width))
+
+    lead_spec = selection[0][0] if selection else get_guide_spec('email-checklist')
+    elements.extend(create_cta(lead_spec['cta_title'], lead_spec['cta_text'], styles))
+    return elements
+
+def assemble_playbook(answers, filename=None, max_sections=MAX_SECTIONS, cache=None, metrics_log=METRICS_LOG,
+                      linearize=LINEARIZE_OUTPUT):
+    """Build a personalized playbook PDF from quiz answers (a path or file-like object)"""
+    if filename is None:
+        filename = os.path.join(OUTPUT_DIR, "personalized-ai-playbook.pdf")
+    if isinstance(filename, str):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
+    width = doc.width - 2 * FRAME_PADDING
+    build_with_metrics('playbook', doc, lambda: create_playbook_elements(answers, width, max_sections, cache),
+                       NumberedCanvas, filename, metrics_log=metrics_log,
+                       post_process=linearize_output if linearize else None)
+    return filename
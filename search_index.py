@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Guide Search Index
+Prebuilt inverted index of every section title and checklist item in the
+guides, for the static site's search box (js/guide-search.js). Each entry
+carries the PDF page it was laid out on, so results deep-link with #page=N.
+
+Every guide has a record (guides/<key>.json) of its entries, pages and
+terms, refreshed from the page layout of each PDF build
+(generate_lead_magnets), or from a dry-run layout for guides whose copy
+changed since the manifest was written. The browser never loads those:
+the terms of all guides are split by their first two characters into
+small shards (terms/<prefix>.json) holding the entries they point to, so
+a query fetches only the shards for the words typed.
+
+    python search_index.py             stale guides only
+    python search_index.py --force     every guide
+"""
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+import argparse
+import hashlib
+import json
+import os
+import re
+
+INDEX_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+GUIDES_DIR = "guides"
+TERMS_DIR = "terms"
+# Terms are sharded by their first PREFIX_LENGTH characters
+PREFIX_LENGTH = 2
+
+# Spec entries naming image files (see brand_assets.spec_image)
+IMAGE_FIELDS = ('logo', 'cover_image')
+
+# Entry kinds in a shard's 'entries' list
+SECTION, ITEM = 0, 1
+ENTRY_ROLES = {'SectionTitle': SECTION, 'ItemStyle': ITEM}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_CHECKBOX = re.compile(r'^☐\s*')
+_PLAIN_STYLE = ParagraphStyle('SearchPlain')
+
+# Too common in the guides to narrow a search down
+STOP_WORDS = frozenset(
+    "a an and are as at be by can for from how in into is it its of on or that the this to with you your".split()
+)
+
+
+def tokenize(text):
+    """Index terms of a piece of text; js/guide-search.js splits queries the same way"""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+def term_prefix(term):
+    """Shard a term belongs to; js/guide-search.js picks shards the same way"""
+    return term[:PREFIX_LENGTH]
+
+def plain_text(markup):
+    """Text of a paragraph's markup as a reader sees it"""
+    return _CHECKBOX.sub('', Paragraph(markup, _PLAIN_STYLE).getPlainText()).strip()
+
+def spec_entries(spec):
+    """(kind, section number, text) for every section title and checklist item of a guide"""
+    entries = []
+    for number, (section_title, items) in enumerate(spec['sections']):
+        entries.append((SECTION, number, plain_text(section_title)))
+        entries.extend((ITEM, number, plain_text(item)) for item in items if isinstance(item, str))
+    return entries
+
+def spec_digest(spec):
+    """Digest of everything a guide's pages depend on: the whole spec and the image files it names
+
+    Any spec field can move entries to another page (the intro, a cover
+    image, the renderer), so none is left out.
+    """
+    images = {}
+    for name in IMAGE_FIELDS:
+        entry = spec.get(name)
+        path = entry.get('path') if isinstance(entry, dict) else entry
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                images[name] = hashlib.sha1(f.read()).hexdigest()
+    source = json.dumps([INDEX_VERSION, spec, images], sort_keys=True, default=str)
+    return hashlib.sha1(source.encode('utf8')).hexdigest()
+
+
+class PageRecorder:
+    """afterFlowable hook that notes the page each title and item paragraph lands on
+
+    Paragraphs split across pages arrive in parts, so placements are kept
+    as (kind, text, page) and matched to the guide's entries by text.
+    """
+
+    def __init__(self):
+        self.placed = []
+
+    def __call__(self, flowable, page):
+        flowable = getattr(flowable, 'flowable', flowable)
+        if isinstance(flowable, Paragraph) and flowable.style.name in ENTRY_ROLES:
+            text = _CHECKBOX.sub('', flowable.getPlainText()).strip()
+            self.placed.append((ENTRY_ROLES[flowable.style.name], text, page))
+
+def assign_pages(entries, placed):
+    """Page of each entry: the first placement, in order, that starts its text"""
+    pages = []
+    position = 0
+    for kind, _, text in entries:
+        page = None
+        for index in range(position, len(placed)):
+            placed_kind, placed_text, placed_page = placed[index]
+            if placed_kind == kind and placed_text and text.startswith(placed_text):
+                page, position = placed_page, index + 1
+                break
+        pages.append(page)
+    return pages
+
+def guide_shard(spec, placed):
+    """The search record for one guide, from its entries and where they were placed"""
+    entries = spec_entries(spec)
+    pages = assign_pages(entries, placed)
+    terms = {}
+    for number, (_, _, text) in enumerate(entries):
+        for token in set(tokenize(text)):
+            terms.setdefault(token, []).append(number)
+    return {
+        'v': INDEX_VERSION,
+        'guide': spec['key'],
+        'title': spec['title'],
+        'pdf': spec['filename'],
+        # [kind, section number, page, text]; a section title's entry is its section's target
+        'entries': [[kind, section, page, text] for (kind, section, text), page in zip(entries, pages)],
+        # Posting lists are ascending entry numbers
+        'terms': dict(sorted(terms.items())),
+    }
+
+def prefix_shards(records):
+    """{prefix: shard} of every guide record's terms; a shard carries the entries its terms point to
+
+    Entries are "<guide key>:<entry number>", posting lists in guide and
+    reading order.
+    """
+    shards = {}
+    for record in sorted(records, key=lambda record: record['guide']):
+        for term, numbers in record['terms'].items():
+            prefix = term_prefix(term)
+            shard = shards.setdefault(prefix, {'v': INDEX_VERSION, 'prefix': prefix, 'terms': {}, 'entries': {}})
+            postings = shard['terms'].setdefault(term, [])
+            for number in numbers:
+                entry_id = f"{record['guide']}:{number}"
+                postings.append(entry_id)
+                shard['entries'][entry_id] = record['entries'][number]
+    for shard in shards.values():
+        shard['terms'] = dict(sorted(shard['terms'].items()))
+    return shards
+
+
+class SearchIndex:
+    """The index directory: guide records, term shards and the manifest"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = {'v': INDEX_VERSION, 'guides': {}, 'shards': {}}
+        path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get('v') == INDEX_VERSION:
+                self.manifest = manifest
+        self.changed = False
+
+    def is_current(self, spec):
+        entry = self.manifest['guides'].get(spec['key'])
+        return (entry is not None and entry['source'] == spec_digest(spec)
+                and os.path.exists(os.path.join(self.directory, entry['file'])))
+
+    def _shard_path(self, prefix):
+        return os.path.join(self.directory, TERMS_DIR, f"{prefix}.json")
+
+    def update(self, spec, placed):
+        """Refresh a guide's record from its placements; returns True if the record changed"""
+        data = _compact(guide_shard(spec, placed))
+        entry = {'file': f"{GUIDES_DIR}/{spec['key']}.json", 'title': spec['title'], 'pdf': spec['filename'],
+                 'hash': _hash(data), 'source': spec_digest(spec)}
+        if self.manifest['guides'].get(spec['key']) == entry and self.is_current(spec):
+            return False
+        _write_atomic(os.path.join(self.directory, entry['file']), data)
+        self.manifest['guides'][spec['key']] = entry
+        self.changed = True
+        return True
+
+    def save(self):
+        """Rewrite the term shards and the manifest if any guide record changed
+
+        Shards whose content is unchanged keep their file and hash, so
+        browsers keep using their cached copies.
+        """
+        if not self.changed:
+            return
+        records = []
+        for entry in self.manifest['guides'].values():
+            with open(os.path.join(self.directory, entry['file']), encoding='utf8') as f:
+                records.append(json.load(f))
+
+        # {prefix: hash}; a shard's file is terms/<prefix>.json
+        previous = self.manifest['shards']
+        shards = {}
+        for prefix, shard in sorted(prefix_shards(records).items()):
+            data = _compact(shard)
+            shards[prefix] = _hash(data)
+            path = self._shard_path(prefix)
+            if previous.get(prefix) != shards[prefix] or not os.path.exists(path):
+                _write_atomic(path, data)
+        for prefix in set(previous) - set(shards):
+            if os.path.exists(self._shard_path(prefix)):
+                os.remove(self._shard_path(prefix))
+        self.manifest['shards'] = shards
+
+        # The browser loads the manifest first, so it is kept compact
+        data = json.dumps(self.manifest, separators=(',', ':'), sort_keys=True).encode('utf8')
+        _write_atomic(os.path.join(self.directory, MANIFEST_NAME), data)
+        self.changed = False
+
+
+def _compact(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf8')
+
+def _hash(data):
+    return hashlib.sha1(data).hexdigest()[:12]
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def build_search_index(specs, directory, force=False):
+    """Refresh the records of guides whose copy changed, using a dry-run layout; returns the keys rebuilt"""
+    from layout_check import LayoutChecker
+    from generate_lead_magnets import create_guide_elements
+
+    index = SearchIndex(directory)
+    rebuilt = []
+    for spec in specs:
+        if not force and index.is_current(spec):
+            continue
+        recorder = PageRecorder()
+        LayoutChecker(on_flowable=recorder).check(create_guide_elements(spec))
+        if index.update(spec, recorder.placed):
+            rebuilt.append(spec['key'])
+    index.save()
+    return rebuilt
+
+def main(argv=None):
+    from generate_lead_magnets import GUIDE_SPECS, SEARCH_INDEX_DIR
+
+    parser = argparse.ArgumentParser(description="Build the guides' client-side search index")
+    parser.add_argument('--output-dir', default=SEARCH_INDEX_DIR)
+    parser.add_argument('--force', action='store_true', help="rebuild every guide's record")
+    args = parser.parse_args(argv)
+
+    rebuilt = build_search_index(GUIDE_SPECS, args.output_dir, args.force)
+    print(f"Rebuilt {len(rebuilt)} of {len(GUIDE_SPECS)} guides in {args.output_dir}"
+          + (f": {', '.join(rebuilt)}" if rebuilt else ""))
+
+if __name__ == "__main__":
+    main()
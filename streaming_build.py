@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+MindWorth AI - Streaming Document Builder
+Lays out very large generated documents (consolidated "everything"
+editions) from a flowable generator, writing each finished page to the
+output file instead of holding the whole document in memory
+"""
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, PageBreak
+import os
+import time
+
+from build_metrics import FlowableCounter, build_with_metrics
+from generate_lead_magnets import (
+    BRAND_STYLES, GUIDE_SPECS, OUTPUT_DIR, METRICS_LOG, draw_footer,
+    create_header, create_intro, create_section, create_cta,
+)
+
+# Flowables pulled ahead of the layout loop (keepWithNext looks ahead too)
+MAX_BUFFERED_FLOWABLES = 64
+
+
+class StreamingPDFDocument(pdfdoc.PDFDocument):
+    """PDFDocument that writes objects to the output file as soon as they are final"""
+
+    def open_stream(self, filename):
+        self._stream_target = filename
+        self._out = None
+        self._own_out = False
+        self._written = 0
+        self._flushed = set()
+
+    def _write(self, data):
+        if self._out is None:
+            if hasattr(self._stream_target, 'write'):
+                self._out = self._stream_target
+            else:
+                self._out = open(self._stream_target, 'wb')
+                self._own_out = True
+            self.encrypt.prepare(self)
+            # PDFFile only emits the header until something is added to it
+            self._write(pdfdoc.PDFFile(self._pdfVersion).format(self))
+        offset = self._written
+        self._out.write(data)
+        self._written += len(data)
+        return offset
+
+    def flush_object(self, obj):
+        """Register, serialize and write an object, keeping only its offset"""
+        ref = self.Reference(obj)
+        name = ref.name
+        data = pdfdoc.PDFIndirectObject(name, obj).format(self)
+        self.idToOffset[name] = self._write(data)
+        self.idToObject[name] = None
+        self._flushed.add(name)
+        return ref
+
+    def addPage(self, page):
+        # Serialize the page's content stream now; only the small page
+        # dictionary is kept until the page tree is written at save time
+        stream = pdfdoc.PDFStream()
+        if page.compression:
+            stream.filters = [pdfdoc.PDFZCompress]
+        stream.content = page.stream
+        stream.__Comment__ = "page stream"
+        page.Contents = self.flush_object(stream)
+        page.stream = None
+        pdfdoc.PDFDocument.addPage(self, page)
+
+    def format(self):
+        # Same as PDFDocument.format, but writes straight to the output
+        # file and skips the objects that were already flushed
+        cat = self.Catalog
+        info = self.info
+        self.Reference(cat)
+        self.Reference(info)
+        encryptref = None
+        encryptinfo = self.encrypt.info()
+        if encryptinfo:
+            encryptref = self.Reference(encryptinfo)
+
+        counter = 0
+        ids = []
+        while True:
+            counter += 1
+            if counter not in self.numberToId:
+                break
+            oid = self.numberToId[counter]
+            if oid not in self._flushed:
+                data = pdfdoc.PDFIndirectObject(oid, self.idToObject[oid]).format(self)
+                self.idToOffset[oid] = self._write(data)
+            ids.append(oid)
+
+        xref = pdfdoc.PDFCrossReferenceTable()
+        xref.addsection(0, ids)
+        xrefoffset = self._write(xref.format(self))
+        trailer = pdfdoc.PDFTrailer(
+            startxref=xrefoffset,
+            Size=len(self.numberToId) + 1,
+            Root=self.Reference(cat),
+            Info=self.Reference(info),
+            Encrypt=encryptref,
+            ID=self.ID(),
+        )
+        self._write(trailer.format(self))
+        return b''
+
+    def SaveToFile(self, filename, canvas):
+        if getattr(self, '_savedToFile', False):
+            raise RuntimeError("class %s instances can only be saved once" % self.__class__.__name__)
+        self._savedToFile = True
+        self.GetPDFData(canvas)
+        if self._own_out:
+            self._out.close()
+
+
+class StreamingCanvas(canvas.Canvas):
+    """Canvas that streams finished pages and fills in "Page X of Y" at save"""
+
+    def __init__(self, filename, *args, **kwargs):
+        canvas.Canvas.__init__(self, filename, *args, **kwargs)
+        self._doc.__class__ = StreamingPDFDocument
+        self._doc.open_stream(filename)
+
+    def showPage(self):
+        # The page count is unknown until the end, so each page draws a
+        # footer form that is only defined once the document is complete
+        self.doForm(f"footer{self._pageNumber}")
+        canvas.Canvas.showPage(self)
+
+    def save(self):
+        started = time.perf_counter()
+        if len(self._code):
+            self.showPage()
+        page_count = self._pageNumber - 1
+        for page_number in range(1, page_count + 1):
+            self.beginForm(f"footer{page_number}")
+            draw_footer(self, page_number, page_count)
+            self.endForm()
+        canvas.Canvas.save(self)
+        # Read back by build_metrics
+        self.page_count = page_count
+        self.save_seconds = time.perf_counter() - started
+
+
+class FlowableStream(list):
+    """List facade over a flowable iterator that only keeps a small lookahead buffered"""
+
+    def __init__(self, flowables, lookahead=MAX_BUFFERED_FLOWABLES):
+        list.__init__(self)
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def _refill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        # The platypus build loop checks len() before consuming each flowable
+        self._refill()
+        return list.__len__(self)
+
+
+def build_streaming(flowables, filename, max_buffered_flowables=MAX_BUFFERED_FLOWABLES,
+                    document='streamed', metrics_log=METRICS_LOG):
+    """Lay out flowables from any iterable into a PDF (a path or file-like object)"""
+    if isinstance(filename, str):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
+    counter = FlowableCounter()
+    build_with_metrics(document, doc, lambda: FlowableStream(counter.wrap(flowables), max_buffered_flowables),
+                       StreamingCanvas, filename, counter=counter, metrics_log=metrics_log)
+    return filename
+
+def iter_consolidated_elements(specs=None, editions=1, styles=BRAND_STYLES):
+    """Yield the "everything" edition: every section of every guide, in order"""
+    if specs is None:
+        specs = GUIDE_SPECS
+
+    yield from create_header(
+        "The Complete AI Automation Library",
+        "Every MindWorth AI Checklist in One Edition"
+    )
+    yield from create_intro(
+        "This edition collects the checklists from all of our implementation guides. "
+        "Work through the sections that match your business and check off each item as you go.",
+        styles
+    )
+
+    for edition in range(editions):
+        for spec in specs:
+            yield PageBreak()
+            yield from create_header(spec['title'], spec['subtitle'])
+            for section_title, items in spec['sections']:
+                yield from create_section(section_title, items, styles)
+
+    yield from create_cta(
+        "Ready to Automate Your Business?",
+        "Book a free consultation to see which of these automations fit your business best.<br/>"
+        "Visit <b>mindworth.ai</b>",
+        styles
+    )
+
+def build_consolidated_edition(filename=None, editions=1, max_buffered_flowables=MAX_BUFFERED_FLOWABLES):
+    """Stream the consolidated edition to disk"""
+    if filename is None:
+        filename = os.path.join(OUTPUT_DIR, "complete-ai-automation-library.pdf")
+    return build_streaming(iter_consolidated_elements(editions=editions), filename, max_buffered_flowables,
+                           document='consolidated')
@@ -0,0 +1,17 @@
+import io
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def guide_pdf():
+    """A finished guide PDF, as the incremental update tools receive it"""
+    from generate_lead_magnets import SALES_FOLLOWUP_PLAYBOOK, build_guide
+    output = io.BytesIO()
+    build_guide(SALES_FOLLOWUP_PLAYBOOK, output, metrics_log=None)
+    return output.getvalue()
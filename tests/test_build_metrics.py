@@ -0,0 +1,56 @@
+"""Per-build metrics records"""
+
+import threading
+
+from build_metrics import CACHE_STATS, build_with_metrics, count_cache
+
+
+class ScriptedDoc:
+    """Stands in for a doc template; its build makes the given cache lookups"""
+
+    def __init__(self, lookups):
+        self.lookups = lookups
+        self.page = 1
+        self.canv = None
+
+    def build(self, flowables, canvasmaker=None):
+        self.lookups()
+
+
+def test_concurrent_builds_count_only_their_own_lookups():
+    both_building = threading.Barrier(2)
+    b_done = threading.Event()
+    records = {}
+
+    def lookups_a():
+        count_cache('test_cache', True)
+        both_building.wait()
+        b_done.wait()
+        count_cache('test_cache', True)
+
+    def lookups_b():
+        both_building.wait()
+        for _ in range(5):
+            count_cache('test_cache', False)
+        b_done.set()
+
+    def build(name, lookups):
+        records[name] = build_with_metrics(name, ScriptedDoc(lookups), list, None, None)
+
+    totals_before = dict(CACHE_STATS.get('test_cache', {'hits': 0, 'misses': 0}))
+    threads = [threading.Thread(target=build, args=args) for args in [('a', lookups_a), ('b', lookups_b)]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert records['a']['caches'] == {'test_cache': {'hits': 2, 'misses': 0, 'hit_rate': 1.0}}
+    assert records['b']['caches'] == {'test_cache': {'hits': 0, 'misses': 5, 'hit_rate': 0.0}}
+    # The process-wide counters still see everything
+    assert CACHE_STATS['test_cache']['hits'] - totals_before['hits'] == 2
+    assert CACHE_STATS['test_cache']['misses'] - totals_before['misses'] == 5
+
+def test_lookups_outside_builds_are_not_counted_per_build():
+    count_cache('test_cache', False)
+    record = build_with_metrics('c', ScriptedDoc(lambda: count_cache('test_cache', True)), list, None, None)
+    assert record['caches'] == {'test_cache': {'hits': 1, 'misses': 0, 'hit_rate': 1.0}}
@@ -0,0 +1,79 @@
+"""Lease ownership in the build queue backends"""
+
+import time
+
+import pytest
+
+from build_queue import DEFAULT_SHARDS, RedisJobQueue, SQLiteJobQueue, make_job, shard_for
+
+LEASE_SECONDS = 0.2
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def open_job_queue(request, tmp_path):
+    """Opens a queue on the backend under test; redis runs on fakeredis"""
+    if request.param == 'sqlite':
+        return lambda **kwargs: SQLiteJobQueue(str(tmp_path / 'queue.db'), lease_seconds=LEASE_SECONDS, **kwargs)
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')  # fakeredis runs Lua scripts with lupa
+    client = fakeredis.FakeRedis()
+    return lambda **kwargs: RedisJobQueue(client=client, lease_seconds=LEASE_SECONDS, **kwargs)
+
+@pytest.fixture
+def job_queue(open_job_queue):
+    return open_job_queue()
+
+def _expired_and_released(job_queue):
+    """A job leased to w1, whose lease ran out and went to w2"""
+    job_queue.put(make_job('checklist', {'email': 'lead@example.com'}))
+    job_id, _ = job_queue.reserve('w1')
+    time.sleep(LEASE_SECONDS * 1.5)
+    assert job_queue.reserve('w2')[0] == job_id
+    return job_id
+
+
+def test_ack_and_fail_need_the_lease(job_queue):
+    job_id = _expired_and_released(job_queue)
+
+    assert job_queue.fail(job_id, 'w1', "stale") is False
+    assert job_queue.ack(job_id, 'w1', "stale") is False
+    assert job_queue.stats()['leased'] == 1
+
+    assert job_queue.ack(job_id, 'w2', "digest") is True
+    assert job_queue.stats()['done'] == 1
+
+def test_a_job_is_acked_once(job_queue):
+    job_queue.put(make_job('checklist'))
+    job_id, _ = job_queue.reserve('w1')
+    assert job_queue.ack(job_id, 'w1', "digest") is True
+    assert job_queue.ack(job_id, 'w1', "digest") is False
+    assert job_queue.fail(job_id, 'w1', "late") is False
+
+def test_failed_jobs_are_retried(job_queue):
+    job_queue.put(make_job('checklist'))
+    job_id, _ = job_queue.reserve('w1')
+    assert job_queue.fail(job_id, 'w1', "boom") is True
+    assert job_queue.stats()['pending'] == 1
+    assert job_queue.reserve('w2')[0] == job_id
+
+def test_expired_leases_are_reclaimed(job_queue):
+    _expired_and_released(job_queue)
+    stats = job_queue.stats()
+    assert (stats.get('pending', 0), stats['leased']) == (0, 1)
+    assert job_queue.reserve('w3') is None
+
+def test_jobs_are_buried_after_max_attempts(open_job_queue):
+    job_queue = open_job_queue(max_attempts=2)
+    job_id = _expired_and_released(job_queue)
+    assert job_queue.fail(job_id, 'w2', "boom") is True
+    assert job_queue.reserve('w3') is None
+    stats = job_queue.stats()
+    assert (stats.get('pending', 0), stats.get('leased', 0), stats['dead']) == (0, 0, 1)
+    assert job_queue.ack(job_id, 'w2', "late") is False
+
+def test_reserve_only_serves_the_given_shards(job_queue):
+    job_id = job_queue.put(make_job('checklist', {'email': 'lead@example.com'}))
+    shard = shard_for(make_job('checklist', {'email': 'lead@example.com'}), DEFAULT_SHARDS)
+    others = [other for other in range(DEFAULT_SHARDS) if other != shard]
+    assert job_queue.reserve('w1', others) is None
+    assert job_queue.reserve('w1', [shard])[0] == job_id
@@ -0,0 +1,189 @@
+"""email_delivery against a local aiosmtpd server"""
+
+from email import message_from_bytes, policy
+import socket
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+import email_delivery
+from email_delivery import (
+    SMTPConnectionPool, SharedAttachment, TokenBucket, compose_message, deliver, deliver_leads, lead_message,
+)
+
+PDF = b"%PDF-1.4\n.leading dot\n" + bytes(range(256)) * 8 + b"\n%%EOF\n"
+
+
+class RecordingHandler:
+    """Accepts mail and keeps it; scripted RCPT replies simulate failures"""
+
+    def __init__(self, pipelining=False, rcpt_replies=None):
+        self.pipelining = pipelining
+        # address -> replies to give, in order, before accepting it
+        self.rcpt_replies = {address: list(replies) for address, replies in (rcpt_replies or {}).items()}
+        self.messages = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        if self.pipelining:
+            responses.insert(-1, '250-PIPELINING')
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        replies = self.rcpt_replies.get(address)
+        if replies:
+            return replies.pop(0)
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.original_content))
+        return '250 Message accepted'
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+@pytest.fixture
+def smtp_server():
+    """smtp_server(handler) starts a server; returns an SMTPConnectionPool for it"""
+    controllers = []
+    pools = []
+
+    def start(handler):
+        port = _free_port()
+        controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=port)
+        controller.start()
+        controllers.append(controller)
+        pool = SMTPConnectionPool('127.0.0.1', port, size=2)
+        pools.append(pool)
+        return pool
+
+    yield start
+    for pool in pools:
+        pool.close()
+    for controller in controllers:
+        controller.stop()
+
+def _limiter():
+    return TokenBucket(rate=1000, burst=1000)
+
+def _leads(count, form_type='checklist'):
+    return [{'email': f'lead{number}@example.com', 'fullName': f'Lead {number}', 'form_type': form_type}
+            for number in range(count)]
+
+@pytest.fixture
+def pdf_dir(tmp_path):
+    spec = email_delivery.SPECS_BY_KEY['checklist']
+    (tmp_path / spec['filename']).write_bytes(PDF)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('pipelining', [False, True])
+def test_batch_shares_one_attachment(smtp_server, pdf_dir, pipelining):
+    handler = RecordingHandler(pipelining=pipelining)
+    pool = smtp_server(handler)
+
+    results = deliver_leads(_leads(5), pool, _limiter(), pdf_dir)
+
+    assert [result['status'] for result in results] == ['sent'] * 5
+    assert len(handler.messages) == 5
+    for rcpt_tos, content in handler.messages:
+        message = message_from_bytes(content, policy=policy.default)
+        assert message['To'].addresses[0].addr_spec == rcpt_tos[0]
+        attachments = list(message.iter_attachments())
+        assert [part.get_filename() for part in attachments] == ['content-creation-playbook.pdf']
+        assert attachments[0].get_content() == PDF
+
+def test_messages_reuse_the_encoded_attachment():
+    attachment = SharedAttachment('guide.pdf', PDF)
+    spec = email_delivery.SPECS_BY_KEY['checklist']
+    chunks = [lead_message(lead, spec, attachment)[1] for lead in _leads(3)]
+    assert all(message[1] is attachment.encoded for message in chunks)
+
+@pytest.mark.parametrize('pipelining', [False, True])
+def test_pipelining_is_used_only_when_offered(smtp_server, pipelining):
+    pool = smtp_server(RecordingHandler(pipelining=pipelining))
+    with pool.connection() as conn:
+        assert bool(conn.has_extn('pipelining')) == pipelining
+
+def test_temporary_failure_is_retried(smtp_server):
+    handler = RecordingHandler(rcpt_replies={'busy@example.com': ['451 4.3.0 Try again later']})
+    pool = smtp_server(handler)
+    chunks = compose_message(SharedAttachment('guide.pdf', PDF), 'busy@example.com', "Guide", "Attached.")
+
+    [result] = deliver([('busy@example.com', chunks)], pool, _limiter(), retry_delay=0)
+
+    assert result['status'] == 'sent'
+    assert result['attempts'] == 2
+    assert len(handler.messages) == 1
+
+def test_permanent_failure_is_recorded(smtp_server):
+    handler = RecordingHandler(rcpt_replies={'gone@example.com': ['550 5.1.1 No such user']})
+    pool = smtp_server(handler)
+    attachment = SharedAttachment('guide.pdf', PDF)
+    messages = [(address, compose_message(attachment, address, "Guide", "Attached."))
+                for address in ('gone@example.com', 'here@example.com')]
+
+    gone, here = deliver(messages, pool, _limiter(), retry_delay=0)
+
+    assert gone['status'] == 'failed'
+    assert gone['attempts'] == 1
+    assert '550' in gone['error']
+    assert here['status'] == 'sent'
+    assert [rcpt_tos for rcpt_tos, _ in handler.messages] == [['here@example.com']]
+
+def test_lines_starting_with_a_dot_arrive_intact(smtp_server):
+    handler = RecordingHandler()
+    pool = smtp_server(handler)
+    raw = b"Subject: dots\r\n\r\n.leading\r\n.\r\n..two\r\nlast\r\n"
+
+    [result] = deliver([('dots@example.com', [email_delivery._dot_stuff(raw)])], pool, _limiter())
+
+    assert result['status'] == 'sent'
+    # aiosmtpd removes the stuffing, so the server sees the original lines
+    assert handler.messages[0][1] == raw
+
+def test_line_breaks_in_a_name_do_not_add_headers(smtp_server, pdf_dir):
+    handler = RecordingHandler()
+    pool = smtp_server(handler)
+    lead = {'email': 'ann@example.com', 'fullName': "Ann Lee\r\nBcc: victim@evil.com", 'form_type': 'checklist'}
+
+    [result] = deliver_leads([lead], pool, _limiter(), pdf_dir)
+
+    assert result['status'] == 'sent'
+    rcpt_tos, content = handler.messages[0]
+    assert rcpt_tos == ['ann@example.com']
+    message = message_from_bytes(content, policy=policy.default)
+    assert message['Bcc'] is None
+    assert message['To'].addresses[0].addr_spec == 'ann@example.com'
+
+def test_header_values_with_line_breaks_are_rejected():
+    with pytest.raises(ValueError):
+        compose_message(SharedAttachment('guide.pdf', PDF), "Ann <ann@example.com>\r\nBcc: victim@evil.com",
+                        "Guide", "Attached.")
+
+def test_bad_addresses_fail_without_stopping_the_batch(smtp_server, pdf_dir):
+    handler = RecordingHandler()
+    pool = smtp_server(handler)
+    leads = [
+        {'email': 'zoë@exämple.com', 'fullName': 'Zoë', 'form_type': 'checklist'},
+        {'email': 'bad\r\n@example.com', 'form_type': 'checklist'},
+        {'email': 'fine@example.com', 'form_type': 'checklist'},
+    ]
+    attachment = SharedAttachment('guide.pdf', PDF)
+
+    results = deliver_leads(leads, pool, _limiter(), pdf_dir)
+    [unnamed] = deliver([('zoë@exämple.com', compose_message(attachment, 'zoë@exämple.com', "Guide", "Attached."))],
+                        pool, _limiter(), retry_delay=0)
+
+    statuses = {result['recipient']: result['status'] for result in results}
+    assert statuses['fine@example.com'] == 'sent'
+    assert statuses['zoë@exämple.com'] == 'failed'
+    assert statuses['bad\r\n@example.com'] == 'failed'
+    assert unnamed['status'] == 'failed'
+    assert unnamed['attempts'] == 1
+    assert [rcpt_tos for rcpt_tos, _ in handler.messages] == [['fine@example.com']]
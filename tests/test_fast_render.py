@@ -0,0 +1,38 @@
+"""The direct canvas renderer against platypus"""
+
+import io
+
+import pytest
+
+from benchmarks import synthetic_checklist
+from fast_render import fast_layout_supported
+from generate_lead_magnets import GUIDE_SPECS, build_guide, create_guide_elements
+
+pymupdf = pytest.importorskip('pymupdf')
+
+# Glyph positions agree to about 0.02pt; anything past half a point is a layout change
+TOLERANCE = 0.5
+
+
+def page_words(spec, renderer):
+    """Words of each page as (text, x0, baseline) in reading order"""
+    output = io.BytesIO()
+    build_guide(dict(spec, renderer=renderer), output, metrics_log=None)
+    with pymupdf.open(stream=output.getvalue(), filetype='pdf') as pdf:
+        return [[(word[4], word[0], word[3]) for word in page.get_text('words', sort=True)] for page in pdf]
+
+
+@pytest.mark.parametrize('spec', GUIDE_SPECS + [synthetic_checklist(400)], ids=lambda spec: spec['key'])
+def test_fast_renderer_matches_platypus(spec):
+    expected, actual = page_words(spec, 'platypus'), page_words(spec, 'fast')
+    assert len(actual) == len(expected)
+    for number, (expected_words, actual_words) in enumerate(zip(expected, actual), 1):
+        assert [word[0] for word in actual_words] == [word[0] for word in expected_words], f"page {number}"
+        for (text, x, y), (_, expected_x, expected_y) in zip(actual_words, expected_words):
+            assert abs(x - expected_x) <= TOLERANCE and abs(y - expected_y) <= TOLERANCE, \
+                f"'{text}' on page {number} at ({x:.2f}, {y:.2f}), platypus ({expected_x:.2f}, {expected_y:.2f})"
+
+def test_the_guides_use_the_fast_path():
+    # Only the insights guide has tables, which platypus lays out
+    platypus = [spec['key'] for spec in GUIDE_SPECS if not fast_layout_supported(create_guide_elements(spec))]
+    assert platypus == ['insights-guide']
@@ -0,0 +1,37 @@
+"""Dry-run layout against real builds"""
+
+import io
+
+import pytest
+
+from benchmarks import synthetic_checklist
+from generate_lead_magnets import GUIDE_SPECS, build_guide
+from layout_check import check_guide, check_playbook
+from playbook_assembly import assemble_playbook
+
+pypdf = pytest.importorskip('pypdf')
+
+QUIZ_ANSWERS = [
+    {},
+    {**{f"q{n}": 1 for n in range(1, 21)}, 'company': "Acme Plumbing"},
+    {**{f"q{n}": 5 - n % 5 for n in range(1, 21)}, 'interests': ['document-blueprint'], 'fullName': "Ada Lovelace"},
+]
+
+
+def page_count(data):
+    return len(pypdf.PdfReader(io.BytesIO(data)).pages)
+
+
+@pytest.mark.parametrize('prepared_for', [None, "Acme Plumbing"])
+# The synthetic checklist runs to many pages, splitting paragraphs on the way
+@pytest.mark.parametrize('spec', GUIDE_SPECS + [synthetic_checklist(400)], ids=lambda spec: spec['key'])
+def test_guide_page_count(spec, prepared_for):
+    output = io.BytesIO()
+    build_guide(spec, output, prepared_for=prepared_for, metrics_log=None)
+    assert check_guide(spec, prepared_for=prepared_for)['pages'] == page_count(output.getvalue())
+
+@pytest.mark.parametrize('answers', QUIZ_ANSWERS)
+def test_playbook_page_count(answers):
+    output = io.BytesIO()
+    assemble_playbook(answers, output, metrics_log=None)
+    assert check_playbook(answers)['pages'] == page_count(output.getvalue())
@@ -0,0 +1,18 @@
+"""Load test report arithmetic"""
+
+from load_test import percentile
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile(list(range(1, 11)), 0.5) == 5
+    assert percentile(list(range(1, 101)), 0.5) == 50
+    assert percentile(list(range(1, 101)), 0.95) == 95
+    assert percentile(list(range(1, 101)), 0.99) == 99
+    assert percentile(list(range(1, 101)), 0.07) == 7
+    assert percentile([3, 7, 8], 0.5) == 7
+
+def test_percentile_edges():
+    assert percentile([], 0.5) is None
+    assert percentile([42], 0.99) == 42
+    assert percentile(list(range(1, 11)), 0) == 1
+    assert percentile(list(range(1, 11)), 1) == 10
@@ -0,0 +1,37 @@
+"""Per-lead stamps on finished PDFs"""
+
+import io
+import logging
+
+import pytest
+
+from pdf_stamp import PDFStamper
+
+pypdf = pytest.importorskip('pypdf')
+
+
+def _read(data, caplog):
+    with caplog.at_level(logging.WARNING, logger='pypdf'):
+        reader = pypdf.PdfReader(io.BytesIO(data), strict=True)
+        text = "\n".join(page.extract_text() for page in reader.pages)
+    # A font resource added twice shows up as a duplicate dictionary key
+    assert not [record for record in caplog.records if 'Multiple definitions' in record.getMessage()]
+    return reader, text
+
+
+def test_stamp(guide_pdf, caplog):
+    data = PDFStamper(guide_pdf).stamp(prepared_for="Ada Lovelace", lead_id="lead-0001")
+    assert data.startswith(guide_pdf)
+    reader, text = _read(data, caplog)
+    assert "Prepared for Ada Lovelace" in text
+    assert text.count("lead-0001") == len(reader.pages)
+
+def test_restamp_replaces_the_stamp(guide_pdf, caplog):
+    once = PDFStamper(guide_pdf).stamp(prepared_for="Ada Lovelace", lead_id="lead-0001")
+    twice = PDFStamper(once).stamp(prepared_for="Grace Hopper", lead_id="lead-0002")
+    reader, text = _read(twice, caplog)
+    assert "Ada Lovelace" not in text and "lead-0001" not in text
+    assert "Prepared for Grace Hopper" in text
+    assert text.count("lead-0002") == len(reader.pages)
+    assert text.replace("Prepared for Grace Hopper", "").replace("lead-0002", "").split() == \
+        _read(guide_pdf, caplog)[1].split()
@@ -0,0 +1,80 @@
+"""A/B copy variants written as incremental updates"""
+
+import io
+import logging
+
+import pytest
+
+from generate_lead_magnets import FRAME_WIDTH, SALES_FOLLOWUP_PLAYBOOK
+from pdf_incremental import IncrementalUpdate, PDFBase
+from pdf_variants import (
+    build_variants, changed_slots, render_slot_form, reserve_heights, slot_flowables, slot_form_object,
+)
+
+pypdf = pytest.importorskip('pypdf')
+pikepdf = pytest.importorskip('pikepdf')
+
+SPEC = SALES_FOLLOWUP_PLAYBOOK
+VARIANT = {'name': 'short', 'intro': "Seven follow-up emails that turn quiet leads into booked calls.",
+           'cta_title': "Book Your Free Call"}
+SECOND = {'name': 'urgent', 'intro': "Most deals are lost after the second email. Send all seven."}
+
+
+def page_texts(data, caplog):
+    """Page text, read by strict pypdf and checked by qpdf"""
+    with caplog.at_level(logging.WARNING, logger='pypdf'):
+        texts = [page.extract_text() for page in pypdf.PdfReader(io.BytesIO(data), strict=True).pages]
+    assert not [record.getMessage() for record in caplog.records if record.name.startswith('pypdf')]
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        assert pdf.check_pdf_syntax() == []
+        assert pdf.get_warnings() == []
+    return texts
+
+def apply_variant(data, variant, heights):
+    """One more incremental update on top of data, as build_variants writes them"""
+    base = PDFBase(data)
+    update = IncrementalUpdate(base)
+    fonts_in_base = base.fonts()
+    for slot in changed_slots(variant):
+        content, fonts = render_slot_form(slot_flowables(dict(SPEC, **variant), slot), FRAME_WIDTH, heights[slot])
+        form = slot_form_object(update, fonts_in_base, content, fonts, FRAME_WIDTH, heights[slot])
+        update.replace(base.xobject(f"FormXob.slot{slot}"), form)
+    return update.to_bytes()
+
+@pytest.fixture(scope='module')
+def variant_build(tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp('variants')
+    base_path, variant_path = build_variants(SPEC, [VARIANT, SECOND], str(output_dir), metrics_log=None)[:2]
+    with open(base_path, 'rb') as f, open(variant_path, 'rb') as g:
+        return f.read(), g.read()
+
+
+def test_variant_is_an_update_of_the_base(variant_build, caplog):
+    base, variant = variant_build
+    assert variant.startswith(base)
+    base_pages, variant_pages = page_texts(base, caplog), page_texts(variant, caplog)
+
+    assert len(variant_pages) == len(base_pages)
+    assert variant_pages[1:-1] == base_pages[1:-1]
+    assert SPEC['intro'][:40] in base_pages[0] and SPEC['intro'][:40] not in variant_pages[0]
+    assert VARIANT['intro'] in variant_pages[0]
+    assert VARIANT['cta_title'] in variant_pages[-1] and SPEC['cta_title'] not in variant_pages[-1]
+    # Everything outside the slots is drawn from the base's own content streams
+    assert variant_pages[0].split(VARIANT['intro'])[0] == base_pages[0].split(SPEC['intro'][:40])[0]
+
+def test_updates_stack(variant_build, caplog):
+    base, variant = variant_build
+    heights = reserve_heights(SPEC, [VARIANT, SECOND])
+
+    twice = apply_variant(variant, SECOND, heights)
+    assert twice.startswith(variant)
+    assert twice.count(b'startxref') == 3
+    pages = page_texts(twice, caplog)
+    assert SECOND['intro'] in pages[0] and VARIANT['intro'] not in pages[0]
+    # The CTA from the first update is still the newest one
+    assert VARIANT['cta_title'] in pages[-1]
+    assert pages[1:-1] == page_texts(base, caplog)[1:-1]
+
+def test_only_classic_xref_tables_are_updated():
+    with pytest.raises(ValueError):
+        PDFBase(b'%PDF-1.5\n1 0 obj\n<< >>\nendobj\nstartxref\n9\n%%EOF\n')
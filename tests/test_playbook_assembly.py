@@ -0,0 +1,76 @@
+"""Quiz-driven playbook assembly"""
+
+import io
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate
+
+from playbook_assembly import (
+    FRAME_PADDING, SectionLayoutCache, assemble_playbook, create_playbook_elements, score_areas, select_sections,
+)
+
+pypdf = pytest.importorskip('pypdf')
+
+# Weak business foundation, everything else perfect
+FOUNDATION_GAP = {**{f"q{n}": 1 for n in range(1, 6)}, **{f"q{n}": 5 for n in range(6, 21)}}
+
+
+def selected(answers, **kwargs):
+    return [(spec['key'], index) for spec, index in select_sections(answers, **kwargs)]
+
+
+def test_score_areas():
+    gaps = score_areas({'q1': 1, 'q2': '3', 'q3': 9, 'q4': 'often', 'q6': 5})
+    # q3 counts as 5; q4 and the missing answers are left out
+    assert gaps['businessFoundation'] == pytest.approx(5 - 9 / 3)
+    assert gaps['aiKnowledge'] == 0
+    assert gaps['teamManagement'] == 0
+
+def test_sections_follow_the_weakest_areas():
+    # Insights and sales lean hardest on the foundation (ties keep guide order), then email
+    assert selected(FOUNDATION_GAP) == (
+        [('insights-guide', index) for index in range(4)]
+        + [('sales-playbook', index) for index in range(4)]
+        + [('email-checklist', index) for index in range(4)]
+    )
+
+def test_interests_come_first():
+    picks = selected(dict(FOUNDATION_GAP, interests=['checklist']), max_sections=6)
+    assert picks == [('checklist', index) for index in range(4)] + [('insights-guide', 0), ('insights-guide', 1)]
+
+def test_company_name_is_escaped():
+    company = "Ben & Jerry's <b>"
+    elements = create_playbook_elements({'company': company}, 6 * inch)
+    assert f"Prepared for {company}" in [getattr(element, 'getPlainText', str)() for element in elements]
+
+    output = io.BytesIO()
+    assemble_playbook({'company': company}, output, metrics_log=None)
+    first_page = pypdf.PdfReader(io.BytesIO(output.getvalue())).pages[0].extract_text()
+    assert f"Prepared for {company}" in first_page
+
+def test_builds_leave_the_cached_layouts_alone():
+    cache = SectionLayoutCache()
+    answers = dict(FOUNDATION_GAP, company="Acme Plumbing")
+    width = letter[0] - 2 * inch - 2 * FRAME_PADDING
+    create_playbook_elements(answers, width, cache=cache)
+
+    def snapshot():
+        return {key: [(flowable, dict(flowable.__dict__), size,
+                       list(flowable.blPara.lines) if hasattr(flowable, 'blPara') else None)
+                      for flowable, size in layout]
+                for key, layout in cache._sections.items()}
+    before = snapshot()
+
+    # A narrower frame than the cache was flowed for, on short pages so paragraphs split
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=(8 * inch, 5 * inch), topMargin=0.5 * inch, bottomMargin=0.5 * inch)
+    doc.build(create_playbook_elements(answers, width, cache=cache))
+    assert len(pypdf.PdfReader(io.BytesIO(output.getvalue())).pages) > 6
+
+    after = snapshot()
+    assert after.keys() == before.keys()
+    for key in before:
+        for (_, *state), (_, *state_after) in zip(before[key], after[key]):
+            assert state_after == state, key
@@ -0,0 +1,26 @@
+"""Guide search index freshness"""
+
+import pytest
+
+from generate_lead_magnets import SALES_FOLLOWUP_PLAYBOOK
+from search_index import build_search_index, spec_digest
+
+SPEC = SALES_FOLLOWUP_PLAYBOOK
+
+
+@pytest.mark.parametrize('field, value', [
+    ('intro', "A much shorter intro."),
+    ('subtitle', "A new subtitle"),
+    ('cover_image', "images/cover.png"),
+    ('renderer', 'fast'),
+    ('page_break_after', [0]),
+])
+def test_any_layout_field_changes_the_digest(field, value):
+    assert spec_digest(dict(SPEC, **{field: value})) != spec_digest(SPEC)
+
+def test_only_stale_guides_are_rebuilt(tmp_path):
+    directory = str(tmp_path)
+    assert build_search_index([SPEC], directory) == [SPEC['key']]
+    assert build_search_index([SPEC], directory) == []
+    longer = dict(SPEC, intro=SPEC['intro'] + " " + SPEC['intro'])
+    assert build_search_index([longer], directory) == [SPEC['key']]